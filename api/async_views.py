@@ -0,0 +1,172 @@
+"""
+Async variants of the I/O-bound api views, served when ASYNC_API_VIEWS is
+on (the default under ordering_form.asgi; see api.urls).
+
+Each one mirrors its sync counterpart in api.views, including the response
+bodies, but queries through the async ORM and sends mail through
+core.mail, so a slow SMTP server or export does not hold a worker thread.
+"""
+
+import csv
+
+from django.http import HttpResponse
+from rest_framework import status
+
+from company_app.models import Company
+from core.async_views import APIResponse, AsyncAPIView
+from core.idempotency import idempotent
+from order_app.composer import arender_order_email
+from order_app.models import EmailDraft, Order
+from product_app.models import Product
+from user_app.models import EmailTemplate
+from user_app.services import EmailService
+
+
+class AsyncGetCompanyProductsView(AsyncAPIView):
+    """Async variant of views.get_company_products."""
+
+    async def post(self, request, company_id):
+        if company_id == -1:
+            return self.error_response(message="Please select a company.")
+
+        try:
+            company = await Company.objects.only("id", "name").aget(id=company_id)
+        except Company.DoesNotExist:
+            return self.error_response(
+                message="Company not found.", status_code=status.HTTP_404_NOT_FOUND
+            )
+
+        products = [
+            product
+            async for product in Product.objects.catalog(company).values(
+                *Product.objects.CATALOG_FIELDS
+            )
+        ]
+        if not products:
+            return self.error_response(
+                message=f"{company.name} does not have any active products."
+            )
+
+        return APIResponse(
+            {
+                "success": True,
+                "company_id": company.id,
+                "company_name": company.name,
+                "products": products,
+            }
+        )
+
+
+class AsyncExportOrderCSVView(AsyncAPIView):
+    """Async variant of views.export_order_csv."""
+
+    ajax_required = False
+    replica_reads = True
+
+    async def get(self, request, order_id):
+        try:
+            order = await Order.objects.select_related("creator").aget(id=order_id)
+        except Order.DoesNotExist:
+            return APIResponse(
+                {"error": "Order not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        product_orders = [
+            po async for po in order.productorder_set.select_related("product")
+        ]
+
+        response = HttpResponse(content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="order_{order_id}.csv"'
+
+        writer = csv.writer(response)
+        writer.writerow(["Order Details"])
+        writer.writerow(["Order ID", order.id])
+        writer.writerow(["Date", order.date.strftime("%Y-%m-%d %H:%M")])
+        writer.writerow(["Created By", order.creator.username])
+        writer.writerow([])
+        writer.writerow(["Item No", "Product Name", "Type", "Quantity"])
+
+        for po in product_orders:
+            writer.writerow(
+                [
+                    po.product.item_no or "N/A",
+                    po.product.name,
+                    po.product.get_item_type_display_name(),
+                    po.quantity,
+                ]
+            )
+
+        return response
+
+
+class AsyncSendOrderEmailView(AsyncAPIView):
+    """Async variant of views.SendOrderEmailView."""
+
+    throttle_scope = "order_email_send"
+
+    @idempotent("order_email_send")
+    async def post(self, request):
+        to_email = request.data.get("to")
+        subject = request.data.get("subject")
+        content = request.data.get("content")
+        order_id = request.data.get("order_id")
+
+        if not all([to_email, subject, content, order_id]):
+            return self.error_response(message="Missing required fields")
+
+        try:
+            order = await Order.objects.aget(id=order_id)
+
+            await EmailService.asend_order_email(
+                user=request.user, to_email=to_email, subject=subject, content=content
+            )
+
+            await EmailDraft.objects.filter(order=order, user=request.user).adelete()
+
+            return self.success_response(message="Email sent successfully!")
+
+        except Order.DoesNotExist:
+            return self.error_response(
+                message="Order not found", status_code=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            return self.error_response(
+                message=f"Failed to send email: {str(e)}",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class AsyncRenderTemplateView(AsyncAPIView):
+    """Async variant of views.RenderTemplateView."""
+
+    async def post(self, request):
+        template_id = request.data.get("template_id")
+        order_id = request.data.get("order_id")
+
+        if not order_id:
+            return self.error_response(message="Order ID required")
+
+        try:
+            order = await Order.objects.aget(id=order_id)
+        except Order.DoesNotExist:
+            return self.error_response(
+                message="Order not found", status_code=status.HTTP_404_NOT_FOUND
+            )
+
+        template = None
+        if template_id:
+            try:
+                template = await EmailTemplate.objects.aget(
+                    id=template_id, user=request.user
+                )
+            except EmailTemplate.DoesNotExist:
+                return self.error_response(message="Template not found")
+
+        subject, body = await arender_order_email(order, request.user, template)
+
+        return self.success_response(
+            data={
+                "subject": subject,
+                "body": body,
+            }
+        )
@@ -0,0 +1,275 @@
+"""
+Batched API requests.
+
+POST /api/batch/ with a JSON body
+
+    {"requests": [
+        {"id": "info", "method": "GET", "path": "/api/user/email-info/"},
+        {"method": "POST", "path": "/api/orders/create/", "body": {...},
+         "headers": {"Idempotency-Key": "..."}},
+    ]}
+
+runs each sub-request against the api.urls views in-process, reusing the
+batch request's session user instead of authenticating every call. Only
+the headers in SUBREQUEST_HEADERS may be set per sub-request. Runs of
+consecutive GET sub-requests execute concurrently on a thread pool
+(API_BATCH_MAX_WORKERS; 1 runs everything inline); other methods run one
+at a time, in order. The response lists one entry per
+sub-request with its status, body and timing.
+"""
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from core.api_mixins import AjaxRequiredMixin, StandardResponseMixin
+from core.routers import routing_scope
+
+SAFE_METHODS = ("GET", "HEAD")
+ALLOWED_METHODS = ("GET", "HEAD", "POST")
+# Request headers passed through to sub-requests
+FORWARDED_META = (
+    "HTTP_COOKIE",
+    "HTTP_HOST",
+    "HTTP_USER_AGENT",
+    "REMOTE_ADDR",
+    "SERVER_NAME",
+    "SERVER_PORT",
+    "wsgi.url_scheme",
+)
+# Headers a sub-request may set itself, by name
+SUBREQUEST_HEADERS = {"idempotency-key": "HTTP_IDEMPOTENCY_KEY"}
+
+logger = logging.getLogger(__name__)
+
+
+class BatchError(ValueError):
+    """Raised for a malformed batch; the message is user-facing"""
+
+
+def get_max_requests():
+    return getattr(settings, "API_BATCH_MAX_REQUESTS", 20)
+
+
+def get_max_workers():
+    return getattr(settings, "API_BATCH_MAX_WORKERS", 4)
+
+
+class BatchView(AjaxRequiredMixin, StandardResponseMixin, APIView):
+    """Run several api sub-requests in one round trip (see api.batch)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            specs = parse_batch(request.data)
+        except BatchError as e:
+            return self.error_response(message=str(e))
+
+        start = time.perf_counter()
+        results = execute(request._request, specs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        return self.success_response(
+            data={"responses": results, "elapsed_ms": round(elapsed_ms, 3)}
+        )
+
+
+def parse_batch(data):
+    """
+    Validate the batch body.
+
+    Returns:
+        list: dicts with id, method, path, query, body, meta (the
+        sub-request's own headers) and the resolved match
+    """
+    requests = data.get("requests") if isinstance(data, dict) else None
+    if not isinstance(requests, list) or not requests:
+        raise BatchError("requests must be a non-empty list.")
+    if len(requests) > get_max_requests():
+        raise BatchError(f"A batch may contain at most {get_max_requests()} requests.")
+
+    specs = []
+    for index, item in enumerate(requests):
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            raise BatchError(f"requests[{index}] must be an object with a path.")
+
+        method = str(item.get("method", "GET")).upper()
+        if method not in ALLOWED_METHODS:
+            raise BatchError(f"requests[{index}]: method {method} is not supported.")
+
+        url = urlsplit(item["path"])
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            raise BatchError(f"requests[{index}]: {url.path} was not found.")
+        if match.namespace != "api" or getattr(match.func, "view_class", None) is BatchView:
+            raise BatchError(f"requests[{index}]: {url.path} cannot be batched.")
+
+        headers = item.get("headers") or {}
+        if not isinstance(headers, dict):
+            raise BatchError(f"requests[{index}]: headers must be an object.")
+        meta = {}
+        for name, value in headers.items():
+            if str(name).lower() not in SUBREQUEST_HEADERS:
+                raise BatchError(f"requests[{index}]: header {name} cannot be set.")
+            meta[SUBREQUEST_HEADERS[str(name).lower()]] = str(value)
+
+        specs.append(
+            {
+                "id": item.get("id", index),
+                "method": method,
+                "path": url.path,
+                "query": url.query,
+                "body": item.get("body"),
+                "meta": meta,
+                "match": match,
+            }
+        )
+    return specs
+
+
+def execute(parent, specs):
+    """
+    Run the sub-requests, concurrently for runs of consecutive reads.
+
+    Returns:
+        list: one result dict per spec, in order
+    """
+    results = [None] * len(specs)
+    max_workers = get_max_workers()
+    index = 0
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as pool:
+        while index < len(specs):
+            end = index + 1
+            if specs[index]["method"] in SAFE_METHODS:
+                while end < len(specs) and specs[end]["method"] in SAFE_METHODS:
+                    end += 1
+
+            # Writes, lone reads and single-worker setups run inline, which
+            # avoids a worker thread opening its own database connection
+            if end - index == 1 or max_workers <= 1:
+                for i in range(index, end):
+                    results[i] = run_subrequest(parent, specs[i])
+                index = end
+                continue
+
+            # Each task runs in a copy of this context, so the timezone and
+            # database routing state carry over to the worker thread
+            futures = {
+                i: pool.submit(copy_context().run, _run_in_thread, parent, specs[i])
+                for i in range(index, end)
+            }
+            for i, future in futures.items():
+                results[i] = future.result()
+            index = end
+    return results
+
+
+def _run_in_thread(parent, spec):
+    try:
+        return run_subrequest(parent, spec)
+    finally:
+        # Worker threads open their own connections; don't leak them
+        connections.close_all()
+
+
+def run_subrequest(parent, spec):
+    """Call the resolved view with a request sharing the parent's user"""
+    request = build_subrequest(parent, spec)
+    view = spec["match"].func
+    marked = getattr(view, "replica_reads", False) or getattr(
+        getattr(view, "view_class", None), "replica_reads", False
+    )
+
+    start = time.perf_counter()
+    with routing_scope(use_replica=marked):
+        try:
+            if iscoroutinefunction(view):
+                view = async_to_sync(view)
+            response = view(request, *spec["match"].args, **spec["match"].kwargs)
+            if hasattr(response, "render"):
+                response.render()
+        except Exception:
+            logger.exception("Batched %s %s failed", spec["method"], spec["path"])
+            return _result(
+                spec,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"error": "Internal server error."},
+                start,
+            )
+
+    return _result(spec, response.status_code, _decode_body(response), start)
+
+
+def build_subrequest(parent, spec):
+    request = HttpRequest()
+    request.method = spec["method"]
+    request.path = request.path_info = spec["path"]
+    request.META = {key: parent.META[key] for key in FORWARDED_META if key in parent.META}
+    request.META.update(
+        {
+            "REQUEST_METHOD": spec["method"],
+            "PATH_INFO": spec["path"],
+            "QUERY_STRING": spec["query"],
+            "HTTP_X_REQUESTED_WITH": "XMLHttpRequest",
+            **spec["meta"],
+        }
+    )
+    request.GET = QueryDict(spec["query"])
+    request.COOKIES = parent.COOKIES
+
+    body = b""
+    if spec["body"] is not None:
+        body = json.dumps(spec["body"]).encode()
+        request.META["CONTENT_TYPE"] = request.content_type = "application/json"
+        request.META["CONTENT_LENGTH"] = str(len(body))
+    request._body = body
+    request._stream = BytesIO(body)
+    request._read_started = False
+
+    # Shared authentication: the batch request already authenticated the
+    # session user and passed the CSRF check
+    request.user = user = parent.user
+    request.session = parent.session
+    request.auser = lambda: _resolved(user)
+    request._dont_enforce_csrf_checks = True
+    return request
+
+
+async def _resolved(value):
+    return value
+
+
+def _decode_body(response):
+    if getattr(response, "streaming", False):
+        return None
+    content = response.content
+    if response.get("Content-Type", "").startswith("application/json"):
+        try:
+            return json.loads(content)
+        except ValueError:
+            pass
+    return content.decode(response.charset or "utf-8", errors="replace")
+
+
+def _result(spec, status_code, body, start):
+    return {
+        "id": spec["id"],
+        "status": status_code,
+        "body": body,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
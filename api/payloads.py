@@ -0,0 +1,103 @@
+"""
+Order submission payloads.
+
+Clients post order items as JSON:
+
+    {"version": 1, "company_id": 3, "items": [[product_id, quantity], ...]}
+
+Older clients post form fields named product_<id>, which are still accepted.
+Both formats end up as a {product_id: quantity} dict of ints.
+"""
+
+from core.api_mixins import is_json_request
+
+ORDER_PAYLOAD_VERSION = 1
+FORM_PREFIX = "product_"
+
+
+class PayloadError(ValueError):
+    """Raised for a malformed order payload; the message is user-facing"""
+
+
+def parse_order_payload(request):
+    """
+    Read order items from a request in either format.
+
+    Returns:
+        tuple: ({product_id: quantity}, company_id or None)
+
+    Raises:
+        PayloadError: on a malformed payload
+    """
+    if is_json_request(request):
+        return parse_json_payload(request.data)
+    return parse_form_payload(request.data), None
+
+
+def parse_json_payload(data):
+    """Validate a versioned JSON order payload"""
+    if not isinstance(data, dict):
+        raise PayloadError("Order payload must be a JSON object.")
+    if data.get("version") != ORDER_PAYLOAD_VERSION:
+        raise PayloadError(
+            f"Unsupported order payload version (expected {ORDER_PAYLOAD_VERSION})."
+        )
+
+    company_id = data.get("company_id")
+    if company_id is not None and not _is_positive_int(company_id):
+        raise PayloadError("company_id must be a positive integer.")
+
+    return validate_items(data.get("items")), company_id
+
+
+def validate_items(items):
+    """
+    Turn [[product_id, quantity], ...] into {product_id: quantity} in one
+    pass, rejecting non-integer or duplicate ids and negative quantities.
+    """
+    if not isinstance(items, list):
+        raise PayloadError("items must be a list of [product_id, quantity] pairs.")
+
+    result = {}
+    for index, entry in enumerate(items):
+        if not isinstance(entry, list) or len(entry) != 2:
+            raise PayloadError(f"items[{index}] must be a [product_id, quantity] pair.")
+
+        product_id, quantity = entry
+        if not _is_positive_int(product_id):
+            raise PayloadError(f"items[{index}]: product id must be a positive integer.")
+        if type(quantity) is not int or quantity < 0:
+            raise PayloadError(f"items[{index}]: quantity must be a non-negative integer.")
+        if product_id in result:
+            raise PayloadError(f"items[{index}]: duplicate product id {product_id}.")
+
+        result[product_id] = quantity
+    return result
+
+
+def parse_form_payload(data):
+    """
+    Read legacy product_<id> form fields.
+
+    Quantities that are not integers are skipped and negative ones count
+    as 0, as before; a product id that is not an integer is rejected.
+    """
+    result = {}
+    for key, value in data.items():
+        if not key.startswith(FORM_PREFIX):
+            continue
+
+        product_id = key[len(FORM_PREFIX):]
+        if not product_id.isdigit() or int(product_id) == 0:
+            raise PayloadError(f"Invalid product field {key!r}.")
+        try:
+            quantity = int(value)
+        except (TypeError, ValueError):
+            continue
+        result[int(product_id)] = max(quantity, 0)
+    return result
+
+
+def _is_positive_int(value):
+    # bool is an int subclass; true/false are not ids
+    return type(value) is int and value > 0
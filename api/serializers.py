@@ -1,15 +1,26 @@
+from django.db import models
 from rest_framework import serializers
 from product_app.models import Product
 from order_app.models import Order, ProductOrder, EmailDraft
 from company_app.models import Company
 from user_app.models import User
+from core.models import AuditEvent
 
 
 class CompanySerializer(serializers.ModelSerializer):
-    """Serializer for Company model"""
+    """
+    Serializer for Company model.
+
+    Counts are read from the annotations added by
+    CompanyManager.with_product_counts() / with_catalog_summary() and only
+    fall back to per-company COUNT queries when the annotations are absent.
+    Pass include_catalog=True in the context to embed the active catalog
+    summary.
+    """
 
     product_count = serializers.SerializerMethodField()
     active_product_count = serializers.SerializerMethodField()
+    active_catalog = serializers.SerializerMethodField()
 
     class Meta:
         model = Company
@@ -17,16 +28,49 @@ class CompanySerializer(serializers.ModelSerializer):
             "id",
             "name",
             "email",
+            "is_active",
             "product_count",
             "active_product_count",
+            "active_catalog",
             "created_at",
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get("include_catalog"):
+            self.fields.pop("active_catalog")
+
     def get_product_count(self, obj):
-        return obj.company_products.count()
+        return obj.get_product_count()
 
     def get_active_product_count(self, obj):
-        return obj.company_products.filter(active=True).count()
+        return obj.get_active_product_count()
+
+    def get_active_catalog(self, obj):
+        if not hasattr(obj, "active_case_count"):
+            active = obj.company_products.filter(active=True)
+            summary = active.aggregate(
+                case_count=models.Count("id", filter=models.Q(item_type="C")),
+                weight_count=models.Count("id", filter=models.Q(item_type="W")),
+                updated_at=models.Max("updated_at"),
+            )
+        else:
+            summary = {
+                "case_count": obj.active_case_count,
+                "weight_count": obj.active_weight_count,
+                "updated_at": obj.catalog_updated_at,
+            }
+
+        updated_at = summary["updated_at"]
+        return {
+            "case_count": summary["case_count"],
+            "weight_count": summary["weight_count"],
+            "updated_at": (
+                serializers.DateTimeField().to_representation(updated_at)
+                if updated_at
+                else None
+            ),
+        }
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -90,10 +134,7 @@ class ProductCreateSerializer(serializers.Serializer):
 
         # Check for duplicate name within company
         if name and company_id:
-            existing_name = Product.objects.filter(
-                company_id=company_id,
-                name__iexact=name
-            ).exists()
+            existing_name = Product.objects.named(company_id, name).exists()
 
             if existing_name:
                 raise serializers.ValidationError({
@@ -177,21 +218,6 @@ class OrderSerializer(serializers.ModelSerializer):
         return company.name if company else None
 
 
-class OrderCreateSerializer(serializers.Serializer):
-    """Serializer for creating orders"""
-
-    items = serializers.DictField(child=serializers.IntegerField(min_value=0))
-
-    def validate_items(self, value):
-        # Filter out zero quantities
-        filtered_items = {k: v for k, v in value.items() if v > 0}
-        if not filtered_items:
-            raise serializers.ValidationError(
-                "Please select at least one product with quantity greater than 0."
-            )
-        return filtered_items
-
-
 class EmailDraftSerializer(serializers.ModelSerializer):
     """Serializer for EmailDraft model"""
 
@@ -204,9 +230,10 @@ class EmailDraftSerializer(serializers.ModelSerializer):
             "from_email",
             "subject",
             "content",
+            "version",
             "updated_at",
         ]
-        read_only_fields = ["id", "updated_at"]
+        read_only_fields = ["id", "version", "updated_at"]
 
 
 class SendEmailSerializer(serializers.Serializer):
@@ -222,3 +249,19 @@ class SendEmailSerializer(serializers.Serializer):
         if not Order.objects.filter(id=value).exists():
             raise serializers.ValidationError("Order not found.")
         return value
+
+
+class AuditEventSerializer(serializers.ModelSerializer):
+    """Serializer for AuditEvent model"""
+
+    class Meta:
+        model = AuditEvent
+        fields = [
+            "id",
+            "event_type",
+            "entity_type",
+            "entity_id",
+            "message",
+            "data",
+            "created_at",
+        ]
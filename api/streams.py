@@ -0,0 +1,151 @@
+"""
+Server-Sent Events stream of live order and catalog events (see core.events).
+
+GET /api/events/ answers with text/event-stream:
+
+    retry: 3000
+
+    id: 812
+    event: order.created
+    data: {"id": 97}
+
+The stream starts after the Last-Event-ID header (EventSource sends it when
+it reconnects), else after ?after=<id> (the event id a page was rendered
+at), else at the newest event.
+
+It stays open for EVENT_STREAM_SECONDS, then ends and the browser
+reconnects. With 0, the default unless the async views are on, the
+response carries the pending events and ends right away. An open stream
+would hold a sync worker, so EventSource polls instead, reconnecting every
+EVENT_STREAM_RETRY_MS.
+"""
+
+import time
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from core import events
+
+HEARTBEAT_SECONDS = 15
+
+
+def get_stream_seconds():
+    return getattr(settings, "EVENT_STREAM_SECONDS", 0)
+
+
+def get_retry_ms():
+    return getattr(settings, "EVENT_STREAM_RETRY_MS", 3000)
+
+
+@require_GET
+def event_stream(request):
+    """Live events for a WSGI worker"""
+    if not request.user.is_authenticated:
+        return _forbidden()
+
+    after = _start_id(request)
+    if after is None:
+        after = events.latest_event_id()
+    return _stream_response(_stream(after))
+
+
+@require_GET
+async def aevent_stream(request):
+    """Live events on the event loop (ASGI), see api.async_views"""
+    user = await request.auser()
+    if not user.is_authenticated:
+        return _forbidden()
+
+    after = _start_id(request)
+    if after is None:
+        after = await events.alatest_event_id()
+    return _stream_response(_astream(after))
+
+
+def _stream(after):
+    yield f"retry: {get_retry_ms()}\n\n"
+    clock = _Clock()
+
+    while True:
+        rows = list(events.events_queryset(after))
+        for event in events.coalesce(rows):
+            yield events.format_event(*event)
+        if rows:
+            after = rows[-1][0]
+        if len(rows) == events.BATCH_SIZE:
+            continue
+
+        timeout = clock.next_wait()
+        if timeout is None:
+            return
+        if timeout == 0:
+            yield ": ping\n\n"
+            continue
+        events.broker.wait(timeout)
+
+
+async def _astream(after):
+    yield f"retry: {get_retry_ms()}\n\n"
+    clock = _Clock()
+
+    while True:
+        rows = [row async for row in events.events_queryset(after)]
+        for event in events.coalesce(rows):
+            yield events.format_event(*event)
+        if rows:
+            after = rows[-1][0]
+        if len(rows) == events.BATCH_SIZE:
+            continue
+
+        timeout = clock.next_wait()
+        if timeout is None:
+            return
+        if timeout == 0:
+            yield ": ping\n\n"
+            continue
+        await events.broker.await_notify(timeout)
+
+
+class _Clock:
+    """Stream deadline, heartbeat and poll timing"""
+
+    def __init__(self):
+        now = time.monotonic()
+        self.deadline = now + get_stream_seconds()
+        self.heartbeat = now + HEARTBEAT_SECONDS
+
+    def next_wait(self):
+        """
+        Seconds to wait for events: None when the stream should end, 0 when
+        a heartbeat comment is due (keeps proxies from closing the stream).
+        """
+        now = time.monotonic()
+        if now >= self.deadline:
+            return None
+        if now >= self.heartbeat:
+            self.heartbeat = now + HEARTBEAT_SECONDS
+            return 0
+        return min(events.get_poll_seconds(), self.deadline - now, self.heartbeat - now)
+
+
+def _start_id(request):
+    for value in (request.headers.get("Last-Event-ID"), request.GET.get("after")):
+        if value and value.isdigit():
+            return int(value)
+    return None
+
+
+def _stream_response(stream):
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Don't let nginx buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _forbidden():
+    return JsonResponse(
+        {"detail": "Authentication credentials were not provided."}, status=403
+    )
@@ -0,0 +1,323 @@
+import json
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from company_app.models import Company
+from core.async_views import AsyncAPIView
+from core.idempotency import fingerprint
+from core.models import IdempotencyKey
+from order_app.models import EmailDraft, Order
+from product_app.models import Product
+from user_app.models import User
+from . import batch
+from .async_views import AsyncRenderTemplateView
+
+AJAX = {"X-Requested-With": "XMLHttpRequest"}
+
+
+class CreateOrderPayloadTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(self.user)
+        self.company = Company.objects.create(name="Acme")
+        self.product = Product.objects.create(
+            company=self.company, name="Ham", item_type="C"
+        )
+        self.payload = json.dumps(
+            {"version": 1, "company_id": self.company.pk, "items": [[self.product.pk, 2]]}
+        )
+
+    def post(self, content_type):
+        return self.client.post(
+            reverse("api:create_order"),
+            self.payload,
+            content_type=content_type,
+            headers=AJAX,
+        )
+
+    def test_json_payload(self):
+        response = self.post("application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Order.objects.filter(creator=self.user).count(), 1)
+
+    def test_json_payload_with_charset(self):
+        response = self.post("application/json; charset=utf-8")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Order.objects.filter(creator=self.user).count(), 1)
+
+    def test_legacy_form_fields(self):
+        response = self.client.post(
+            reverse("api:create_order"),
+            {f"product_{self.product.pk}": "3"},
+            headers=AJAX,
+        )
+        self.assertEqual(response.status_code, 201)
+        order = Order.objects.get(creator=self.user)
+        self.assertEqual(order.productorder_set.get().quantity, 3)
+
+
+@override_settings(IDEMPOTENCY_CLAIM_SECONDS=60)
+class CompanyProductsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(self.user)
+        self.company = Company.objects.create(name="Acme")
+        for i in range(5):
+            Product.objects.create(
+                company=self.company, name=f"Product {i}", item_no=f"{i:03}", item_type="C"
+            )
+        Product.objects.create(company=self.company, name="Retired", item_type="C", active=False)
+
+    def test_catalog_reads_only_catalog_fields(self):
+        # Session user, company and products; the session comes from the cache
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                reverse("api:get_company_products", args=[self.company.pk]), headers=AJAX
+            )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["company_name"], "Acme")
+        self.assertEqual(len(data["products"]), 5)
+        for product in data["products"]:
+            self.assertEqual(set(product), set(Product.objects.CATALOG_FIELDS))
+
+
+class EmailDraftViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(self.user)
+        self.order = Order.objects.create(creator=self.user)
+
+    def save(self, version, content):
+        return self.client.post(
+            reverse("api:save_email_draft"),
+            json.dumps({
+                "order_id": self.order.pk,
+                "version": version,
+                "to": "orders@example.com",
+                "subject": f"Order #{self.order.pk}",
+                "content": content,
+            }),
+            content_type="application/json",
+            headers=AJAX,
+        )
+
+    def test_save_bumps_version(self):
+        response = self.save(0, "First")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()["status"], response.json()["version"]), ("saved", 1))
+
+        response = self.save(1, "Second")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()["status"], response.json()["version"]), ("saved", 2))
+
+        response = self.save(2, "Second")
+        self.assertEqual((response.json()["status"], response.json()["version"]), ("unchanged", 2))
+
+        draft = EmailDraft.objects.get(order=self.order, user=self.user)
+        self.assertEqual((draft.version, draft.content), (2, "Second"))
+
+    def test_stale_version_conflicts(self):
+        self.save(0, "First")
+        self.save(1, "From the newer tab")
+
+        response = self.save(1, "From the older tab")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["draft"]["content"], "From the newer tab")
+        self.assertEqual(response.json()["draft"]["version"], 2)
+        draft = EmailDraft.objects.get(order=self.order, user=self.user)
+        self.assertEqual((draft.version, draft.content), (2, "From the newer tab"))
+
+
+class IdempotencyClaimTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(self.user)
+        self.company = Company.objects.create(name="Acme")
+        product = Product.objects.create(company=self.company, name="Ham", item_type="C")
+        self.data = {"version": 1, "items": [[product.pk, 1]]}
+
+    def claim(self, age):
+        # An in-progress claim, as left behind by a request that died
+        claimed_at = timezone.now() - timedelta(seconds=age)
+        IdempotencyKey.objects.create(
+            user=self.user,
+            scope="order_create",
+            key="retry-1",
+            request_hash=fingerprint(SimpleNamespace(data=self.data)),
+            created_at=claimed_at,
+            expires_at=claimed_at + timedelta(days=1),
+        )
+
+    def post(self):
+        return self.client.post(
+            reverse("api:create_order"),
+            self.data,
+            content_type="application/json",
+            headers={**AJAX, "Idempotency-Key": "retry-1"},
+        )
+
+    def test_request_in_progress_gets_conflict(self):
+        self.claim(age=5)
+        self.assertEqual(self.post().status_code, 409)
+        self.assertFalse(Order.objects.exists())
+
+    def test_abandoned_claim_is_taken_over(self):
+        self.claim(age=120)
+
+        response = self.post()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Order.objects.count(), 1)
+        row = IdempotencyKey.objects.get(user=self.user, key="retry-1")
+        self.assertEqual(row.status_code, 201)
+
+        replay = self.post()
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+
+class AsyncAPIViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.order = Order.objects.create(creator=self.user)
+
+    def test_parse_data_ignores_content_type_parameters(self):
+        request = AsyncRequestFactory().post(
+            "/", {"order_id": 5}, content_type="application/json"
+        )
+        for content_type in ("application/json", "application/json; charset=utf-8"):
+            request.content_type = content_type
+            self.assertEqual(AsyncAPIView.parse_data(request), {"order_id": 5})
+
+    async def test_render_template_with_charset(self):
+        request = AsyncRequestFactory().post(
+            "/",
+            json.dumps({"order_id": self.order.pk}),
+            content_type="application/json; charset=utf-8",
+            headers=AJAX,
+        )
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        response = await AsyncRenderTemplateView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("subject", response.data)
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(self.user)
+        self.company = Company.objects.create(name="Acme")
+        self.product = Product.objects.create(
+            company=self.company, name="Ham", item_type="C"
+        )
+
+    def post_batch(self, requests):
+        return self.client.post(
+            reverse("api:batch"),
+            json.dumps({"requests": requests}),
+            content_type="application/json",
+            headers=AJAX,
+        )
+
+    def create_order(self, key):
+        return {
+            "method": "POST",
+            "path": reverse("api:create_order"),
+            "body": {"version": 1, "company_id": self.company.pk, "items": [[self.product.pk, 2]]},
+            "headers": {"Idempotency-Key": key},
+        }
+
+    def test_subrequest_idempotency_key(self):
+        for _ in range(2):
+            response = self.post_batch([self.create_order("order-1")])
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["responses"][0]["status"], 201)
+
+        self.assertEqual(Order.objects.filter(creator=self.user).count(), 1)
+        self.assertEqual(IdempotencyKey.objects.filter(user=self.user).count(), 1)
+
+    def test_other_subrequest_headers_are_rejected(self):
+        request = self.create_order("order-1")
+        request["headers"]["Cookie"] = "sessionid=other"
+
+        response = self.post_batch([request])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
+
+    def test_failed_subrequest_hides_the_exception(self):
+        failing = mock.Mock(side_effect=RuntimeError("secret detail"))
+        match = SimpleNamespace(func=failing, args=(), kwargs={})
+        spec = {"id": 0, "method": "GET", "path": "/api/companies/", "query": "",
+                "body": None, "meta": {}, "match": match}
+        parent = self.client.get(reverse("api:company_list"), headers=AJAX).wsgi_request
+
+        with self.assertLogs("api.batch", "ERROR"):
+            result = batch.run_subrequest(parent, spec)
+
+        self.assertEqual(result["status"], 500)
+        self.assertEqual(result["body"], {"error": "Internal server error."})
+
+
+@override_settings(API_BATCH_MAX_WORKERS=4)
+class BatchThreadTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(self.user)
+        Company.objects.create(name="Acme")
+
+    def test_reads_run_on_worker_threads(self):
+        threads = []
+        run_in_thread = batch._run_in_thread
+
+        def record(parent, spec):
+            threads.append(threading.get_ident())
+            return run_in_thread(parent, spec)
+
+        paths = [reverse("api:company_list"), reverse("api:user_email_info")] * 2
+        with mock.patch.object(batch, "_run_in_thread", side_effect=record):
+            response = self.client.post(
+                reverse("api:batch"),
+                json.dumps({"requests": [{"path": path} for path in paths]}),
+                content_type="application/json",
+                headers=AJAX,
+            )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["responses"]
+        self.assertEqual([result["id"] for result in results], [0, 1, 2, 3])
+        self.assertEqual({result["status"] for result in results}, {200})
+        self.assertEqual(results[0]["body"], results[2]["body"])
+        self.assertEqual(len(threads), 4)
+        self.assertNotIn(threading.get_ident(), threads)
+
+
+class AuditEventListTests(TestCase):
+    def test_staff_only(self):
+        user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(reverse("api:audit_events")).status_code, 403)
+
+        user.is_staff = True
+        user.save(update_fields=["is_staff"])
+        self.assertEqual(self.client.get(reverse("api:audit_events")).status_code, 200)
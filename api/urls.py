@@ -1,13 +1,36 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, streams, views
+from .batch import BatchView
 
 app_name = "api"
 
+# The I/O-bound endpoints have async variants for ASGI deployments
+if settings.ASYNC_API_VIEWS:
+    company_products_view = async_views.AsyncGetCompanyProductsView.as_view()
+    export_order_csv_view = async_views.AsyncExportOrderCSVView.as_view()
+    send_order_email_view = async_views.AsyncSendOrderEmailView.as_view()
+    render_template_view = async_views.AsyncRenderTemplateView.as_view()
+    event_stream_view = streams.aevent_stream
+else:
+    company_products_view = views.get_company_products
+    export_order_csv_view = views.export_order_csv
+    send_order_email_view = views.SendOrderEmailView.as_view()
+    render_template_view = views.RenderTemplateView.as_view()
+    event_stream_view = streams.event_stream
+
 urlpatterns = [
+    # Company endpoints
+    path("companies/", views.CompanyListView.as_view(), name="company_list"),
+    path(
+        "companies/<int:company_id>/products/",
+        views.CompanyProductsView.as_view(),
+        name="company_products",
+    ),
     # Product endpoints
     path(
         "products/company/<int:company_id>/",
-        views.get_company_products,
+        company_products_view,
         name="get_company_products",
     ),
     path("products/create/", views.CreateProductView.as_view(), name="create_product"),
@@ -20,7 +43,7 @@ urlpatterns = [
     ),
     path(
         "orders/send-email/",
-        views.SendOrderEmailView.as_view(),
+        send_order_email_view,
         name="send_order_email",
     ),
     path(
@@ -28,17 +51,29 @@ urlpatterns = [
         views.EmailDraftView.as_view(),
         name="get_email_draft",
     ),
+    path(
+        "orders/<int:order_id>/composer/",
+        views.ComposerBootstrapView.as_view(),
+        name="composer_bootstrap",
+    ),
     path("orders/save-draft/", views.EmailDraftView.as_view(), name="save_email_draft"),
     path(
         "orders/<int:order_id>/export-csv/",
-        views.export_order_csv,
+        export_order_csv_view,
         name="export_order_csv",
     ),
+    # Several of the endpoints above in one request
+    path("batch/", BatchView.as_view(), name="batch"),
+    # Live order and catalog events (Server-Sent Events)
+    path("events/", event_stream_view, name="event_stream"),
+    # Audit trail
+    path("audit/", views.AuditEventListView.as_view(), name="audit_events"),
+    path("metrics/db/", views.DatabaseMetricsView.as_view(), name="db_metrics"),
     # User/Email endpoints
     path("user/email-info/", views.UserEmailInfoView.as_view(), name="user_email_info"),
     path(
         "email/render-template/",
-        views.RenderTemplateView.as_view(),
+        render_template_view,
         name="render_template",
     ),
 ]
@@ -1,26 +1,102 @@
 from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db import transaction, IntegrityError
-from django.conf import settings
 from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 import csv
+from datetime import datetime, time
 
 from company_app.models import Company
+from company_app.tables import get_product_page
 from product_app.models import Product
+from order_app.composer import (
+    draft_data, get_user_email_info, render_order_email, user_email_info_etag
+)
 from order_app.models import Order, ProductOrder, EmailDraft
 from user_app.models import User, EmailTemplate
 from user_app.services import EmailService
 from core.api_mixins import AjaxRequiredMixin, StandardResponseMixin
+from core.decorators import replica_reads
+from core.idempotency import idempotent
+from core.routers import query_counts, replica_alias
+from core.models import AuditEvent
+from .payloads import PayloadError, parse_order_payload
 from .serializers import (
-    ProductSerializer, ProductCreateSerializer, OrderSerializer,
-    OrderCreateSerializer
+    AuditEventSerializer, CompanySerializer, ProductSerializer, ProductCreateSerializer, OrderSerializer
 )
 
 
+class CompanyListView(AjaxRequiredMixin, StandardResponseMixin, APIView):
+    """
+    List companies with product counts.
+
+    Query params:
+        active: "1" to return only active companies
+        include: "catalog" to embed each company's active catalog summary
+
+    Counts come from a single annotated query, so the listing costs the
+    same number of queries regardless of how many companies there are.
+    """
+
+    permission_classes = [IsAuthenticated]
+    replica_reads = True
+
+    def get(self, request):
+        include_catalog = "catalog" in request.query_params.get("include", "").split(",")
+
+        if include_catalog:
+            companies = Company.objects.with_catalog_summary()
+        else:
+            companies = Company.objects.with_product_counts()
+
+        if request.query_params.get("active") == "1":
+            companies = companies.filter(is_active=True)
+
+        serializer = CompanySerializer(
+            companies.order_by("name"),
+            many=True,
+            context={"request": request, "include_catalog": include_catalog},
+        )
+        return self.success_response(data={"companies": serializer.data})
+
+
+class CompanyProductsView(AjaxRequiredMixin, StandardResponseMixin, APIView):
+    """
+    One page of a company's product table.
+
+    Query params:
+        page, page_size: 1-based page number and rows per page
+        sort: item_no, name, item_type or active (prefix "-" for descending)
+        q: search term matched against name and item number
+        status: all, active or inactive
+    """
+
+    permission_classes = [IsAuthenticated]
+    replica_reads = True
+
+    def get(self, request, company_id):
+        if not Company.objects.filter(id=company_id).exists():
+            return self.error_response(
+                message="Company not found.", status_code=status.HTTP_404_NOT_FOUND
+            )
+
+        params = request.query_params
+        return self.success_response(
+            data=get_product_page(
+                company_id,
+                page=params.get("page"),
+                page_size=params.get("page_size"),
+                sort=params.get("sort"),
+                search=params.get("q"),
+                status=params.get("status"),
+            )
+        )
+
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def get_company_products(request, company_id):
@@ -37,12 +113,12 @@ def get_company_products(request, company_id):
         )
 
     try:
-        company = Company.objects.prefetch_related("company_products").get(
-            id=company_id
+        company = Company.objects.only("id", "name").get(id=company_id)
+        products = list(
+            Product.objects.catalog(company).values(*Product.objects.CATALOG_FIELDS)
         )
-        products = company.company_products.filter(active=True)
 
-        if not products.exists():
+        if not products:
             return Response(
                 {
                     "success": False,
@@ -51,14 +127,12 @@ def get_company_products(request, company_id):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer = ProductSerializer(products, many=True)
-
         return Response(
             {
                 "success": True,
                 "company_id": company.id,
                 "company_name": company.name,
-                "products": serializer.data,
+                "products": products,
             }
         )
 
@@ -69,6 +143,7 @@ def get_company_products(request, company_id):
         )
 
 
+@replica_reads
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def export_order_csv(request, order_id):
@@ -104,55 +179,71 @@ def export_order_csv(request, order_id):
         return Response({"error": "Order not found"}, status=status.HTTP_404_NOT_FOUND)
 
 
+def _unknown_product_ids(product_ids, company_id=None):
+    """Ids (of `product_ids`) that do not exist or belong to another company"""
+    products = Product.objects.filter(pk__in=product_ids)
+    if company_id is not None:
+        products = products.filter(company_id=company_id)
+    return set(product_ids) - set(products.values_list("pk", flat=True))
+
+
 class CreateOrderView(AjaxRequiredMixin, StandardResponseMixin, APIView):
-    """Class-based view for creating orders."""
+    """
+    Class-based view for creating orders.
+
+    Accepts the JSON order payload or legacy product_<id> form fields
+    (see api.payloads). Retries carrying the same Idempotency-Key get the
+    original response instead of a second order.
+    """
 
     permission_classes = [IsAuthenticated]
 
+    @idempotent("order_create")
     @transaction.atomic
     def post(self, request):
-        order_items = {}
-        for key, value in request.data.items():
-            if key.startswith("product_"):
-                product_id = key.replace("product_", "")
-                try:
-                    quantity = int(value)
-                    if quantity > 0:
-                        order_items[product_id] = quantity
-                except (ValueError, TypeError):
-                    pass
-
-        serializer = OrderCreateSerializer(data={"items": order_items})
-        if not serializer.is_valid():
-            return self.error_response(
-                message="Validation failed", errors=serializer.errors
-            )
-
         try:
-            order = Order.objects.create(creator=request.user)
-
-            for product_id, quantity in serializer.validated_data["items"].items():
-                product = Product.objects.select_related("company").get(id=product_id)
-                ProductOrder.objects.create(
-                    order=order, product=product, quantity=quantity
-                )
+            items, company_id = parse_order_payload(request)
+        except PayloadError as e:
+            return self.error_response(message=str(e))
 
-            order_serializer = OrderSerializer(order)
-            return self.success_response(
-                data={"order": order_serializer.data},
-                message="Order created successfully!",
-                status_code=status.HTTP_201_CREATED,
+        order_items = {pk: qty for pk, qty in items.items() if qty > 0}
+        if not order_items:
+            return self.error_response(
+                message="Validation failed",
+                errors={
+                    "items": [
+                        "Please select at least one product with quantity greater than 0."
+                    ]
+                },
             )
 
-        except Product.DoesNotExist:
+        if _unknown_product_ids(order_items, company_id):
             return self.error_response(
                 message="One or more products not found.",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
 
+        order = Order.objects.create(creator=request.user)
+        for product_id, quantity in order_items.items():
+            ProductOrder.objects.create(
+                order=order, product_id=product_id, quantity=quantity
+            )
+
+        order_serializer = OrderSerializer(order)
+        return self.success_response(
+            data={"order": order_serializer.data},
+            message="Order created successfully!",
+            status_code=status.HTTP_201_CREATED,
+        )
+
 
 class UpdateOrderView(AjaxRequiredMixin, StandardResponseMixin, APIView):
-    """View for updating existing orders."""
+    """
+    View for updating existing orders.
+
+    Accepts the same payloads as CreateOrderView; a quantity of 0 removes
+    the product from the order.
+    """
 
     permission_classes = [IsAuthenticated]
 
@@ -165,16 +256,10 @@ class UpdateOrderView(AjaxRequiredMixin, StandardResponseMixin, APIView):
                 message="Order not found.", status_code=status.HTTP_404_NOT_FOUND
             )
 
-        # Parse order items
-        order_items = {}
-        for key, value in request.data.items():
-            if key.startswith("product_"):
-                product_id = key.replace("product_", "")
-                try:
-                    quantity = int(value)
-                    order_items[product_id] = quantity
-                except (ValueError, TypeError):
-                    pass
+        try:
+            order_items, company_id = parse_order_payload(request)
+        except PayloadError as e:
+            return self.error_response(message=str(e))
 
         # Check if at least one item has quantity > 0
         if not any(qty > 0 for qty in order_items.values()):
@@ -182,6 +267,13 @@ class UpdateOrderView(AjaxRequiredMixin, StandardResponseMixin, APIView):
                 message="Order must have at least one item with quantity greater than 0."
             )
 
+        added = [pk for pk, qty in order_items.items() if qty > 0]
+        if _unknown_product_ids(added, company_id):
+            return self.error_response(
+                message="One or more products not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
         try:
             order.update_items(order_items)
 
@@ -256,10 +348,16 @@ class CreateProductView(AjaxRequiredMixin, StandardResponseMixin, generics.Creat
 
 
 class SendOrderEmailView(AjaxRequiredMixin, StandardResponseMixin, APIView):
-    """View for sending order emails using server email with user's name."""
+    """
+    View for sending order emails using server email with user's name.
+
+    Retries carrying the same Idempotency-Key do not send the email again.
+    """
 
     permission_classes = [IsAuthenticated]
+    throttle_scope = "order_email_send"
 
+    @idempotent("order_email_send")
     def post(self, request):
         to_email = request.data.get("to")
         subject = request.data.get("subject")
@@ -303,18 +401,7 @@ class EmailDraftView(AjaxRequiredMixin, StandardResponseMixin, APIView):
             draft = EmailDraft.objects.filter(order=order, user=request.user).first()
 
             if draft:
-                return self.success_response(
-                    data={
-                        "draft": {
-                            "to": draft.to_email,
-                            "subject": draft.subject,
-                            "content": draft.content,
-                            "updated_at": draft.updated_at.strftime(
-                                "%Y-%m-%d %H:%M:%S"
-                            ),
-                        }
-                    }
-                )
+                return self.success_response(data={"draft": draft_data(draft)})
             else:
                 return self.error_response(message="No draft found")
 
@@ -324,10 +411,20 @@ class EmailDraftView(AjaxRequiredMixin, StandardResponseMixin, APIView):
             )
 
     def post(self, request):
-        """Save email draft"""
+        """
+        Save email draft.
+
+        Autosaves send `version`, the draft version they last saw (0 for a
+        new draft). A save against an outdated version is rejected with 409
+        and the current draft, so an old tab never overwrites newer text.
+        Saves without `version` overwrite the current draft.
+        """
         order_id = request.data.get("order_id")
+        version = request.data.get("version")
 
-        required_fields = ["order_id", "to", "subject", "content"]
+        required_fields = ["order_id"]
+        if version is None:
+            required_fields += ["to", "subject", "content"]
         missing = [f for f in required_fields if not request.data.get(f)]
 
         if missing:
@@ -336,63 +433,114 @@ class EmailDraftView(AjaxRequiredMixin, StandardResponseMixin, APIView):
             )
 
         try:
-            order = Order.objects.get(id=order_id)
-
-            draft, created = EmailDraft.objects.update_or_create(
-                order=order,
-                user=request.user,
-                defaults={
-                    "to_email": request.data.get("to"),
-                    "from_email": settings.DEFAULT_FROM_EMAIL,
-                    "subject": request.data.get("subject"),
-                    "content": request.data.get("content"),
-                },
+            order_id = int(order_id)
+            if version is not None:
+                version = int(version)
+                if version < 0:
+                    raise ValueError
+        except (TypeError, ValueError):
+            return self.error_response(
+                message="order_id and version must be non-negative integers"
             )
 
-            return self.success_response(
-                data={
-                    "draft_id": draft.id,
-                    "updated_at": draft.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-                },
-                message="Draft saved successfully!",
-            )
+        drafts = EmailDraft.objects.filter(order_id=order_id, user=request.user)
+        if version is None:
+            version = drafts.values_list("version", flat=True).first() or 0
 
-        except Order.DoesNotExist:
+        # Only creating a draft needs the order; updates match on order_id
+        if version == 0 and not Order.objects.filter(id=order_id).exists():
             return self.error_response(
                 message="Order not found", status_code=status.HTTP_404_NOT_FOUND
             )
 
+        result, draft = EmailDraft.objects.autosave(
+            order_id,
+            request.user,
+            to_email=request.data.get("to", ""),
+            subject=request.data.get("subject", ""),
+            content=request.data.get("content", ""),
+            version=version,
+        )
+
+        if result == "conflict":
+            response = self.error_response(
+                message="This draft was changed in another window.",
+                status_code=status.HTTP_409_CONFLICT,
+            )
+            response.data["draft"] = draft_data(draft) if draft else None
+            return response
+
+        return self.success_response(
+            data={
+                "status": result,
+                "version": draft.version,
+                "updated_at": draft.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+            },
+            message="Draft saved successfully!",
+        )
+
 
 class UserEmailInfoView(AjaxRequiredMixin, StandardResponseMixin, APIView):
-    """Get user's email info and templates for the composer."""
+    """
+    Get user's email info and templates for the composer.
+
+    The response carries an ETag; a request sending it back in
+    If-None-Match gets an empty 304 when nothing changed.
+    """
 
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         """Return user's display name, email info, and templates for composer"""
+        etag = user_email_info_etag(request.user)
+        if request.headers.get("If-None-Match") == f'"{etag}"':
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = self.success_response(
+                data=get_user_email_info(request.user, etag)
+            )
+
+        response["ETag"] = f'"{etag}"'
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class ComposerBootstrapView(AjaxRequiredMixin, StandardResponseMixin, APIView):
+    """
+    Everything the email composer needs to open for an order, in one response.
+
+    Query params:
+        user_info: the user_info_etag the client has cached; user_info is
+            left out of the response when it still matches
+
+    Returns user_info_etag, user_info (unless cached), draft (or null) and,
+    when there is no draft, the email rendered with the default template.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, order_id):
+        try:
+            order = Order.objects.get(id=order_id)
+        except Order.DoesNotExist:
+            return self.error_response(
+                message="Order not found", status_code=status.HTTP_404_NOT_FOUND
+            )
+
         user = request.user
+        etag = user_email_info_etag(user)
+        data = {"user_info_etag": etag}
+        if request.query_params.get("user_info") != etag:
+            data["user_info"] = get_user_email_info(user, etag)
 
-        # Get user's email templates
-        templates = [
-            {
-                "id": t.id,
-                "name": t.name,
-                "subject": t.subject_template,
-                "body": t.body_template,
-                "is_default": t.is_default,
-            }
-            for t in user.email_templates.all()
-        ]
+        draft = EmailDraft.objects.filter(order=order, user=user).first()
+        data["draft"] = draft_data(draft) if draft else None
+        data["rendered"] = None
+        if draft is None:
+            subject, body = render_order_email(order, user)
+            data["rendered"] = {"subject": subject, "body": body}
 
-        return self.success_response(
-            data={
-                "display_name": user.get_display_name(),
-                "sender_name": user.get_email_sender_name(),
-                "reply_to_email": user.email,
-                "signature": user.email_signature or "",
-                "templates": templates,
-            }
-        )
+        return self.success_response(data=data)
 
 
 class RenderTemplateView(AjaxRequiredMixin, StandardResponseMixin, APIView):
@@ -408,61 +556,20 @@ class RenderTemplateView(AjaxRequiredMixin, StandardResponseMixin, APIView):
             return self.error_response(message="Order ID required")
 
         try:
-            order = (
-                Order.objects.select_related("creator")
-                .prefetch_related("productorder_set__product__company")
-                .get(id=order_id)
-            )
+            order = Order.objects.get(id=order_id)
         except Order.DoesNotExist:
             return self.error_response(
                 message="Order not found", status_code=status.HTTP_404_NOT_FOUND
             )
 
-        user = request.user
-        company = order.get_company()
-
-        # Build order items text
-        order_items_lines = []
-        for po in order.productorder_set.select_related("product").all():
-            quantity = po.quantity
-            if po.product.item_type == "C":
-                unit = "case" if quantity == 1 else "cases"
-            else:
-                unit = "lb." if quantity == 1 else "lbs."
-
-            item_no = po.product.item_no or "N/A"
-            order_items_lines.append(f"{quantity} {unit} - {item_no} {po.product.name}")
-
-        order_items_text = "\n".join(order_items_lines)
-
-        # Build context
-        context = {
-            "company_name": company.name if company else "Unknown Company",
-            "order_id": str(order.id),
-            "order_date": order.date.strftime("%B %d, %Y"),
-            "order_items": order_items_text,
-            "total_items": str(order.get_total_items()),
-            "item_count": str(order.get_item_count()),
-            "user_name": user.get_display_name(),
-            "user_email": user.email,
-            "signature": user.email_signature or "",
-        }
-
+        template = None
         if template_id:
             try:
-                template = EmailTemplate.objects.get(id=template_id, user=user)
-                subject, body = template.render(context)
+                template = EmailTemplate.objects.get(id=template_id, user=request.user)
             except EmailTemplate.DoesNotExist:
                 return self.error_response(message="Template not found")
-        else:
-            # Use default template or fallback
-            default_template = user.get_default_template()
-            if default_template:
-                subject, body = default_template.render(context)
-            else:
-                # Fallback
-                subject = f"Order Request for {context['company_name']}"
-                body = f"Hello,\n\nHere is my order:\n\n{order_items_text}\n\n{context['signature']}"
+
+        subject, body = render_order_email(order, request.user, template)
 
         return self.success_response(
             data={
@@ -470,3 +577,91 @@ class RenderTemplateView(AjaxRequiredMixin, StandardResponseMixin, APIView):
                 "body": body,
             }
         )
+
+
+class AuditEventListView(StandardResponseMixin, APIView):
+    """
+    Query the audit trail, newest first (staff only).
+
+    Query params:
+        entity: entity type such as "product" or "company"
+        entity_id: id of the entity (requires entity)
+        event_type: exact event type such as "product.deactivated"
+        since, until: ISO date or datetime bounds on created_at
+        page, page_size: 1-based page number and rows per page (max 200)
+    """
+
+    permission_classes = [IsAdminUser]
+    replica_reads = True
+    page_size = 50
+    max_page_size = 200
+
+    def get(self, request):
+        params = request.query_params
+        events = AuditEvent.objects.all()
+
+        if params.get("entity"):
+            events = events.filter(entity_type=params["entity"])
+            if params.get("entity_id"):
+                if not params["entity_id"].isdigit():
+                    return self.error_response(message="entity_id must be an integer")
+                events = events.filter(entity_id=int(params["entity_id"]))
+
+        if params.get("event_type"):
+            events = events.filter(event_type=params["event_type"])
+
+        for param, lookup in (("since", "created_at__gte"), ("until", "created_at__lte")):
+            if not params.get(param):
+                continue
+            value = self._parse_when(params[param], end_of_day=(param == "until"))
+            if value is None:
+                return self.error_response(
+                    message=f"{param} must be an ISO date or datetime"
+                )
+            events = events.filter(**{lookup: value})
+
+        try:
+            page = max(int(params.get("page", 1)), 1)
+            page_size = min(max(int(params.get("page_size", self.page_size)), 1), self.max_page_size)
+        except ValueError:
+            return self.error_response(message="page and page_size must be integers")
+
+        # Fetch one extra row instead of running a COUNT over the audit table
+        offset = (page - 1) * page_size
+        rows = list(events[offset:offset + page_size + 1])
+
+        return self.success_response(
+            data={
+                "events": AuditEventSerializer(rows[:page_size], many=True).data,
+                "page": page,
+                "page_size": page_size,
+                "has_more": len(rows) > page_size,
+            }
+        )
+
+    @staticmethod
+    def _parse_when(value, end_of_day=False):
+        try:
+            when = parse_datetime(value)
+            if when is None:
+                day = parse_date(value)
+                if day is None:
+                    return None
+                when = datetime.combine(day, time.max if end_of_day else time.min)
+        except ValueError:
+            return None
+
+        if timezone.is_naive(when):
+            when = timezone.make_aware(when)
+        return when
+
+
+class DatabaseMetricsView(StandardResponseMixin, APIView):
+    """Queries served per database alias by this process (staff only)."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return self.success_response(
+            data={"queries": query_counts(), "replica": replica_alias()}
+        )
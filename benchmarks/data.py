@@ -0,0 +1,172 @@
+"""
+Synthetic data generator for benchmarks.
+
+Everything created here is tagged with BENCH_EMAIL_DOMAIN so it can be found
+(and flushed) again without touching real data.
+"""
+
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from company_app.models import Company
+from order_app.models import Order, ProductOrder
+from product_app.models import Product
+from user_app.models import EmailTemplate, User
+
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+BENCH_PASSWORD = "bench-password-123"
+
+COMPANIES_PER_SCALE = 5
+PRODUCTS_PER_COMPANY = 200
+USERS_PER_SCALE = 10
+ORDERS_PER_SCALE = 50
+
+COMPANY_WORDS = [
+    "Acme", "Blue Ridge", "Cedar", "Delta", "Evergreen", "Frontier", "Golden",
+    "Harbor", "Iron Creek", "Juniper", "Keystone", "Lakeside", "Maple", "North Star",
+    "Oakwood", "Pioneer", "Quarry", "Riverside", "Summit", "Twin Oaks",
+]
+COMPANY_SUFFIXES = ["Foods", "Provisions", "Meats", "Farms", "Distributors", "Supply"]
+PRODUCT_ADJECTIVES = [
+    "Oven Roasted", "Smoked", "Peppered", "Honey Glazed", "Buffalo", "Mesquite",
+    "Low Sodium", "Cajun", "Maple", "Hickory", "Garlic", "Italian Style",
+]
+PRODUCT_NOUNS = [
+    "Turkey Breast", "Ham", "Roast Beef", "Chicken Breast", "Salami", "Pastrami",
+    "Bologna", "Provolone", "Swiss Cheese", "Cheddar", "Pepperoni", "Capicola",
+]
+
+
+def bench_companies():
+    return Company.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}")
+
+
+def bench_users():
+    return User.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}")
+
+
+def flush_bench_data():
+    """Remove all previously generated benchmark data"""
+    with transaction.atomic():
+        # Orders go first so the company deletion guard lets companies through.
+        Order.objects.filter(creator__in=bench_users()).delete()
+        bench_users().delete()
+        bench_companies().delete()
+
+
+@transaction.atomic
+def generate(scale=1, seed=0):
+    """
+    Generate a reproducible data set proportional to `scale`.
+
+    bulk_create is used throughout, so model signals do not fire and the
+    generator does not pay for per-row logging or password hashing.
+
+    Returns:
+        dict: counts of the generated rows
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    # Users (one shared hash keeps seeding fast)
+    password_hash = make_password(BENCH_PASSWORD)
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"bench_user_{i}",
+                email=f"bench_user_{i}@{BENCH_EMAIL_DOMAIN}",
+                password=password_hash,
+                first_name=f"Bench{i}",
+                last_name="User",
+                email_signature=f"Thanks,\nBench User {i}",
+                is_activated=True,
+            )
+            for i in range(USERS_PER_SCALE * scale)
+        ]
+    )
+    EmailTemplate.objects.bulk_create(
+        [
+            EmailTemplate(
+                user=user,
+                name="Default Template",
+                subject_template="Order Request for %company_name%",
+                body_template="Hello,\n\nHere is my order:\n\n%order_items%\n\n%signature%",
+                is_default=True,
+            )
+            for user in users
+        ]
+    )
+
+    # Companies
+    companies = Company.objects.bulk_create(
+        [
+            Company(
+                name=(
+                    f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} "
+                    f"#{i}"
+                ),
+                email=f"orders{i}@{BENCH_EMAIL_DOMAIN}",
+                is_active=rng.random() > 0.1,
+            )
+            for i in range(COMPANIES_PER_SCALE * scale)
+        ]
+    )
+
+    # Products (names and item numbers unique per company)
+    products = []
+    for company in companies:
+        for i in range(PRODUCTS_PER_COMPANY):
+            products.append(
+                Product(
+                    company=company,
+                    name=(
+                        f"{rng.choice(PRODUCT_ADJECTIVES)} "
+                        f"{rng.choice(PRODUCT_NOUNS)} {i}"
+                    ),
+                    item_no=f"{company.pk % 100:02d}{i:05d}" if rng.random() > 0.05 else "",
+                    item_type="W" if rng.random() < 0.3 else "C",
+                    active=rng.random() > 0.15,
+                )
+            )
+    products = Product.objects.bulk_create(products, batch_size=500)
+
+    active_by_company = {}
+    for product in products:
+        if product.active:
+            active_by_company.setdefault(product.company_id, []).append(product.pk)
+    orderable_companies = [
+        c.pk for c in companies if c.is_active and active_by_company.get(c.pk)
+    ]
+
+    # Orders with 5-30 line items from a single company
+    orders = Order.objects.bulk_create(
+        [
+            Order(
+                creator=rng.choice(users),
+                date=now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+            )
+            for _ in range(ORDERS_PER_SCALE * scale)
+        ]
+    )
+    line_items = []
+    for order in orders:
+        catalog = active_by_company[rng.choice(orderable_companies)]
+        for product_id in rng.sample(catalog, min(len(catalog), rng.randint(5, 30))):
+            line_items.append(
+                ProductOrder(
+                    order=order, product_id=product_id, quantity=rng.randint(1, 20)
+                )
+            )
+    ProductOrder.objects.bulk_create(line_items, batch_size=500)
+
+    return {
+        "users": len(users),
+        "companies": len(companies),
+        "products": len(products),
+        "orders": len(orders),
+        "line_items": len(line_items),
+    }
@@ -0,0 +1,299 @@
+"""
+Concurrent-request load test of the WSGI and ASGI deployments.
+
+Starts the project under a real server (gunicorn with sync workers for
+WSGI, uvicorn for ASGI) with email going to a local SMTP sink that answers
+after a configurable delay, like a remote mail server would. Client
+threads then keep `concurrency` requests in flight against one endpoint
+and the run reports throughput, latency and how many emails arrived.
+
+gunicorn, uvicorn and (for AsyncSMTPBackend) aiosmtplib are only needed
+here and in deployment, not by the app itself.
+"""
+
+import asyncio
+import http.client
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+from django.test import Client
+
+from order_app.models import Order
+from .data import bench_companies, bench_users
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    "wsgi": {
+        "module": "gunicorn",
+        "args": [
+            "ordering_form.wsgi:application",
+            "--worker-class", "sync",
+            "--log-level", "warning",
+        ],
+        "bind": lambda port: ["--bind", f"127.0.0.1:{port}"],
+    },
+    "asgi": {
+        "module": "uvicorn",
+        "args": [
+            "ordering_form.asgi:application",
+            "--log-level", "warning",
+            "--no-access-log",
+        ],
+        "bind": lambda port: ["--host", "127.0.0.1", "--port", str(port)],
+    },
+}
+
+ENDPOINTS = ("send_email", "render", "catalog", "export")
+
+
+class SMTPSink:
+    """
+    Minimal SMTP server that accepts and discards every message, waiting
+    `delay` seconds before acknowledging each one.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.received = 0
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _serve(self):
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._session, "127.0.0.1", 0)
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        server.close()
+
+    async def _session(self, reader, writer):
+        writer.write(b"220 sink ESMTP\r\n")
+        try:
+            while line := await reader.readline():
+                command = line[:4].upper()
+                if command == b"EHLO":
+                    writer.write(b"250-sink\r\n250 8BITMIME\r\n")
+                elif command == b"DATA":
+                    writer.write(b"354 end with <CRLF>.<CRLF>\r\n")
+                    await writer.drain()
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    await asyncio.sleep(self.delay)
+                    self.received += 1
+                    writer.write(b"250 queued\r\n")
+                elif command == b"QUIT":
+                    writer.write(b"221 bye\r\n")
+                    break
+                else:
+                    writer.write(b"250 ok\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}.")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Server did not start listening in time.")
+
+
+def start_server(kind, smtp_port, workers=1):
+    """
+    Launch the project under the server for `kind` ("wsgi" or "asgi").
+
+    Returns:
+        tuple: (process, port)
+    """
+    server = SERVERS[kind]
+    if importlib.util.find_spec(server["module"]) is None:
+        raise LookupError(f"{server['module']} is not installed; it is needed for {kind}.")
+
+    async_smtp = importlib.util.find_spec("aiosmtplib") is not None
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "ordering_form.settings",
+        "DJANGO_ASGI": "1" if kind == "asgi" else "0",
+        # Every request comes from one user and address
+        "RATELIMIT_ENABLED": "0",
+        "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+        "EMAIL_HOST": "127.0.0.1",
+        "EMAIL_PORT": str(smtp_port),
+        "EMAIL_USE_TLS": "False",
+        "EMAIL_HOST_USER": "",
+        "EMAIL_HOST_PASSWORD": "",
+        "DEFAULT_FROM_EMAIL": "loadtest@example.com",
+        "ASYNC_EMAIL_BACKEND": (
+            "core.mail.AsyncSMTPBackend" if async_smtp else "core.mail.ThreadedEmailBackend"
+        ),
+    }
+    port = _free_port()
+    args = [
+        sys.executable, "-m", server["module"],
+        *server["args"],
+        *server["bind"](port),
+        "--workers", str(workers),
+    ]
+    process = subprocess.Popen(args, env=env, cwd=PROJECT_DIR)
+    try:
+        _wait_for_port(port, process)
+    except Exception:
+        process.terminate()
+        process.wait()
+        raise
+    return process, port
+
+
+def _credentials():
+    """Session cookie and CSRF token for a benchmark user"""
+    user = bench_users().order_by("pk").first()
+    if user is None:
+        raise LookupError("No benchmark data found. Run `manage.py seed_bench_data` first.")
+
+    client = Client()
+    client.force_login(user)
+    session = client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    request = HttpRequest()
+    token = get_token(request)
+    cookie = (
+        f"{settings.SESSION_COOKIE_NAME}={session}; "
+        f"{settings.CSRF_COOKIE_NAME}={request.META['CSRF_COOKIE']}"
+    )
+    return user, {
+        "Cookie": cookie,
+        "X-CSRFToken": token,
+        "X-Requested-With": "XMLHttpRequest",
+        "Host": "127.0.0.1",
+    }
+
+
+def build_request(endpoint, user):
+    """(method, path, form data) for one request to `endpoint`"""
+    order = Order.objects.filter(creator__in=bench_users()).order_by("pk").first()
+    company = bench_companies().filter(is_active=True).order_by("pk").first()
+
+    if endpoint == "send_email":
+        return "POST", "/api/orders/send-email/", {
+            "order_id": order.pk,
+            "to": f"buyer@{uuid.uuid4().hex[:8]}.example.com",
+            "subject": "Load test order",
+            "content": "Load test body",
+        }
+    if endpoint == "render":
+        return "POST", "/api/email/render-template/", {"order_id": order.pk}
+    if endpoint == "catalog":
+        return "POST", f"/api/products/company/{company.pk}/", {}
+    return "GET", f"/api/orders/{order.pk}/export-csv/", None
+
+
+def _client(port, headers, method, path, data, count, results, lock):
+    body = urlencode(data) if data is not None else None
+    request_headers = dict(headers)
+    if body is not None:
+        request_headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers=request_headers)
+            response = connection.getresponse()
+            response.read()
+            ok = response.status == 200
+            if response.getheader("Connection", "").lower() == "close":
+                connection.close()
+        except (OSError, http.client.HTTPException):
+            ok = False
+            connection.close()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        with lock:
+            results["latencies"].append(elapsed)
+            results["ok" if ok else "failed"] += 1
+    connection.close()
+
+
+def run(kind, endpoint="send_email", concurrency=20, requests=200, workers=1, smtp_delay=0.2):
+    """
+    Load one endpoint of the `kind` deployment.
+
+    Returns:
+        dict: counts, throughput, latency percentiles and emails received
+    """
+    from .runner import percentile
+
+    user, headers = _credentials()
+    method, path, data = build_request(endpoint, user)
+
+    results = {"ok": 0, "failed": 0, "latencies": []}
+    lock = threading.Lock()
+    per_client = [
+        requests // concurrency + (1 if i < requests % concurrency else 0)
+        for i in range(concurrency)
+    ]
+
+    with SMTPSink(delay=smtp_delay) as sink:
+        process, port = start_server(kind, sink.port, workers=workers)
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                for count in per_client:
+                    pool.submit(
+                        _client, port, headers, method, path, data, count, results, lock
+                    )
+            elapsed = time.perf_counter() - start
+        finally:
+            process.terminate()
+            process.wait()
+        received = sink.received
+
+    latencies = results["latencies"]
+    return {
+        "server": kind,
+        "endpoint": endpoint,
+        "ok": results["ok"],
+        "failed": results["failed"],
+        "emails": received,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(results["ok"] / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+    }
@@ -0,0 +1,37 @@
+from subprocess import CalledProcessError
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.startup import DEFAULT_PATHS, measure_profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares startup and request latency of settings profiles, each "
+        "measured in a fresh process"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="*", help=f"Paths to request (default: {' '.join(DEFAULT_PATHS)})"
+        )
+        parser.add_argument("--profiles", nargs="+", default=["dev", "prod"])
+        parser.add_argument("--requests", type=int, default=50)
+
+    def handle(self, *args, **options):
+        reports = {}
+        for profile in options["profiles"]:
+            try:
+                reports[profile] = measure_profile(
+                    profile, options["paths"], options["requests"]
+                )
+            except CalledProcessError as e:
+                raise CommandError(f"Profile {profile!r} failed (exit {e.returncode})")
+
+        for profile, report in reports.items():
+            self.stdout.write(f"{profile}: django.setup() {report['setup_ms']:.1f}ms")
+            for path, result in report["paths"].items():
+                self.stdout.write(
+                    f"  {path:<20} status={result['status']} "
+                    f"first={result['first_ms']:>8.2f}ms p50={result['p50_ms']:>8.2f}ms"
+                )
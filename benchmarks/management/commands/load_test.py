@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the project under gunicorn (WSGI) and uvicorn (ASGI) with a local "
+        "SMTP sink and reports concurrent-request throughput for one endpoint"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--server", choices=["wsgi", "asgi", "both"], default="both"
+        )
+        parser.add_argument(
+            "--endpoint", choices=loadtest.ENDPOINTS, default="send_email"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=20, help="Requests kept in flight"
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Total requests")
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Server worker processes"
+        )
+        parser.add_argument(
+            "--smtp-delay",
+            type=float,
+            default=0.2,
+            help="Seconds the SMTP sink takes to accept each message",
+        )
+
+    def handle(self, *args, **options):
+        kinds = ["wsgi", "asgi"] if options["server"] == "both" else [options["server"]]
+
+        for kind in kinds:
+            try:
+                result = loadtest.run(
+                    kind,
+                    endpoint=options["endpoint"],
+                    concurrency=options["concurrency"],
+                    requests=options["requests"],
+                    workers=options["workers"],
+                    smtp_delay=options["smtp_delay"],
+                )
+            except (LookupError, RuntimeError) as e:
+                raise CommandError(e.args[0])
+
+            self.stdout.write(
+                f"{kind:<5} {result['endpoint']:<11} ok={result['ok']} "
+                f"failed={result['failed']} emails={result['emails']} "
+                f"{result['requests_per_second']:>7.1f} req/s "
+                f"p50={result['p50_ms']:.1f}ms p95={result['p95_ms']:.1f}ms"
+            )
@@ -0,0 +1,85 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import runner
+from benchmarks.scenarios import SCENARIOS, UnexpectedResponse
+
+
+class Command(BaseCommand):
+    help = "Times hot paths and compares the results against a saved baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "scenarios",
+            nargs="*",
+            help=f"Scenarios to run (default: all). Available: {', '.join(SCENARIOS)}",
+        )
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--output", help="Write the JSON report to this path"
+        )
+        parser.add_argument(
+            "--baseline", help="Compare the run against this JSON report"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.20,
+            help="Allowed p50/p95 slowdown before flagging a regression (0.20 = 20%%)",
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help=(
+                "Fail when a scenario gets an unexpected response status or "
+                "lazily loads a deferred field"
+            ),
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with status 1 when any scenario regresses",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            report = runner.run(
+                names=options["scenarios"],
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                stdout=self.stdout,
+                strict=options["strict"],
+            )
+        except (KeyError, LookupError, UnexpectedResponse) as e:
+            raise CommandError(e.args[0])
+
+        if options["output"]:
+            runner.save_report(report, options["output"])
+            self.stdout.write(self.style.SUCCESS(f"Report saved to {options['output']}"))
+
+        if not options["baseline"]:
+            return
+
+        comparisons = runner.compare(
+            report, runner.load_report(options["baseline"]), options["threshold"]
+        )
+        regressed = False
+        for entry in comparisons:
+            line = (
+                f"{entry['scenario']:<20} "
+                f"p50 {entry['p50_ms']['change']:+.1%}  "
+                f"p95 {entry['p95_ms']['change']:+.1%}  "
+                f"queries {entry['queries']['baseline']:g} -> {entry['queries']['current']:g}"
+            )
+            if entry["regressions"]:
+                regressed = True
+                self.stdout.write(
+                    self.style.ERROR(f"{line}  REGRESSED ({', '.join(entry['regressions'])})")
+                )
+            else:
+                self.stdout.write(line)
+
+        if regressed and options["fail_on_regression"]:
+            sys.exit(1)
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks import data
+
+
+class Command(BaseCommand):
+    help = "Generates synthetic companies, products, users and orders for benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=1,
+            help=(
+                f"Size multiplier: each step adds {data.COMPANIES_PER_SCALE} companies "
+                f"x {data.PRODUCTS_PER_COMPANY} products, {data.USERS_PER_SCALE} users "
+                f"and {data.ORDERS_PER_SCALE} orders"
+            ),
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed for reproducible data"
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep previously generated benchmark data instead of replacing it",
+        )
+
+    def handle(self, *args, **options):
+        if options["scale"] < 1:
+            self.stderr.write(self.style.ERROR("--scale must be at least 1"))
+            return
+
+        if not options["keep"]:
+            data.flush_bench_data()
+
+        counts = data.generate(scale=options["scale"], seed=options["seed"])
+
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Generated {summary}"))
+        self.stdout.write(
+            f'Benchmark users log in with password "{data.BENCH_PASSWORD}"'
+        )
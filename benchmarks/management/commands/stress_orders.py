@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import stress
+
+
+class Command(BaseCommand):
+    help = (
+        "Submits orders from concurrent threads and reports lock errors and "
+        "throughput with and without the SQLite tuning"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--orders", type=int, default=20, help="Orders per thread")
+        parser.add_argument("--items", type=int, default=20, help="Line items per order")
+        parser.add_argument(
+            "--profile",
+            choices=["baseline", "tuned", "both"],
+            default="both",
+            help="baseline = SQLite defaults, tuned = configured pragmas",
+        )
+
+    def handle(self, *args, **options):
+        profiles = {"baseline": stress.BASELINE, "tuned": stress.tuned_profile()}
+        names = list(profiles) if options["profile"] == "both" else [options["profile"]]
+
+        for name in names:
+            try:
+                result = stress.run(
+                    profiles[name],
+                    threads=options["threads"],
+                    orders=options["orders"],
+                    items=options["items"],
+                )
+            except LookupError as e:
+                raise CommandError(e.args[0])
+
+            self.stdout.write(
+                f"{name:<9} created={result['created']}/{result['submitted']} "
+                f"locked={result['locked']} failed={result['failed']} "
+                f"{result['orders_per_second']:>7.1f} orders/s "
+                f"p50={result['p50_ms']:.1f}ms p95={result['p95_ms']:.1f}ms"
+            )
@@ -0,0 +1,214 @@
+"""
+Benchmark runner: times registered scenarios, records latency percentiles and
+query counts, and compares a run against a saved baseline.
+"""
+
+import json
+import platform
+import subprocess
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone as dt_timezone
+
+import django
+from django.conf import settings
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.deferred import forbid_deferred_loads
+from .scenarios import SCENARIOS, BenchContext, UnexpectedResponse
+
+
+class _Rollback(Exception):
+    """Raised to discard the writes of a single iteration"""
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(timings_ms, query_counts):
+    return {
+        "iterations": len(timings_ms),
+        "p50_ms": round(percentile(timings_ms, 50), 3),
+        "p95_ms": round(percentile(timings_ms, 95), 3),
+        "p99_ms": round(percentile(timings_ms, 99), 3),
+        "mean_ms": round(sum(timings_ms) / len(timings_ms), 3),
+        "min_ms": round(min(timings_ms), 3),
+        "max_ms": round(max(timings_ms), 3),
+        "queries": {
+            "p50": percentile(query_counts, 50),
+            "max": max(query_counts),
+        },
+    }
+
+
+def run_iteration(bench, ctx):
+    """Run one iteration, returning (elapsed_ms, query_count)"""
+    # The query log is a bounded deque; once full, captured counts read 0
+    reset_queries()
+    with CaptureQueriesContext(connection) as captured:
+        if bench.writes:
+            try:
+                with transaction.atomic():
+                    start = time.perf_counter()
+                    bench.func(ctx)
+                    elapsed = time.perf_counter() - start
+                    raise _Rollback
+            except _Rollback:
+                pass
+        else:
+            start = time.perf_counter()
+            bench.func(ctx)
+            elapsed = time.perf_counter() - start
+    return elapsed * 1000, len(captured)
+
+
+def run(names=None, iterations=50, warmup=5, stdout=None, strict=False):
+    """
+    Run the selected scenarios (all of them by default).
+
+    A scenario that got an unexpected response status is flagged with a
+    warning and an "unexpected_responses" count in its summary. With
+    strict=True it raises UnexpectedResponse instead, and lazily loading a
+    deferred field raises DeferredFieldAccess instead of silently adding
+    queries.
+
+    Returns:
+        dict: report with run metadata and per-scenario summaries
+    """
+    names = names or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise KeyError(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    # The test client talks to "testserver", emails must never leave the box
+    # and repeated logins must not hit the rate limits
+    with override_settings(
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+        EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        RATELIMIT_ENABLED=False,
+    ), (forbid_deferred_loads() if strict else nullcontext()):
+        ctx = BenchContext.build()
+        results = {}
+
+        for name in names:
+            bench = SCENARIOS[name]
+            ctx.unexpected = []
+            for _ in range(warmup):
+                run_iteration(bench, ctx)
+
+            timings, queries = [], []
+            for _ in range(iterations):
+                elapsed_ms, query_count = run_iteration(bench, ctx)
+                timings.append(elapsed_ms)
+                queries.append(query_count)
+
+            results[name] = summarize(timings, queries)
+            if stdout:
+                stdout.write(format_result(name, results[name]))
+
+            if ctx.unexpected:
+                message = (
+                    f"{name}: {ctx.unexpected[0]} "
+                    f"({len(ctx.unexpected)} unexpected response(s))"
+                )
+                if strict:
+                    raise UnexpectedResponse(message)
+                results[name]["unexpected_responses"] = len(ctx.unexpected)
+                if stdout:
+                    stdout.write(f"WARNING {message}")
+
+    return {"meta": run_metadata(iterations, warmup), "scenarios": results}
+
+
+def run_metadata(iterations, warmup):
+    return {
+        "timestamp": datetime.now(dt_timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "debug": settings.DEBUG,
+        "iterations": iterations,
+        "warmup": warmup,
+    }
+
+
+def _git_commit():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_result(name, summary):
+    return (
+        f"{name:<20} p50={summary['p50_ms']:>9.2f}ms "
+        f"p95={summary['p95_ms']:>9.2f}ms p99={summary['p99_ms']:>9.2f}ms "
+        f"queries={summary['queries']['p50']:g}"
+    )
+
+
+def compare(report, baseline, threshold=0.20):
+    """
+    Compare a report against a baseline report.
+
+    A scenario regresses when its p50 or p95 grows by more than `threshold`
+    (a fraction) or when it issues more queries than the baseline did.
+
+    Returns:
+        list: one dict per scenario present in both reports
+    """
+    comparisons = []
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+
+        entry = {"scenario": name, "regressions": []}
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = previous[metric], current[metric]
+            change = (after - before) / before if before else 0.0
+            entry[metric] = {
+                "baseline": before,
+                "current": after,
+                "change": round(change, 4),
+            }
+            if change > threshold:
+                entry["regressions"].append(metric)
+
+        before_q = previous["queries"]["p50"]
+        after_q = current["queries"]["p50"]
+        entry["queries"] = {"baseline": before_q, "current": after_q}
+        if after_q > before_q:
+            entry["regressions"].append("queries")
+
+        comparisons.append(entry)
+    return comparisons
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_report(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
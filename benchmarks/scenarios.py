@@ -0,0 +1,311 @@
+"""
+Hot-path scenarios timed by the benchmark runner.
+
+Each scenario is a function taking a BenchContext and performing exactly one
+operation. Register new scenarios with the @scenario decorator; scenarios
+that write are run inside a transaction that is rolled back after every
+iteration so repeated runs see the same data.
+
+Scenarios pass their responses through expect(), so a run that times error
+pages (a 403 from a lost session, a 400 from a changed payload) is
+reported instead of passing as a speedup.
+"""
+
+import io
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.template import Context, Template
+from django.test import Client
+from django.utils import timezone
+
+from core.timezones import get_user_timezone
+from order_app.models import Order
+from .data import BENCH_PASSWORD, bench_companies, bench_users
+
+AJAX = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+
+
+@dataclass
+class Scenario:
+    name: str
+    func: callable
+    writes: bool = False
+    description: str = ""
+
+
+SCENARIOS = {}
+
+
+class UnexpectedResponse(Exception):
+    """A scenario got a response status it did not expect"""
+
+
+def scenario(name, writes=False):
+    """Register a function as a benchmark scenario"""
+
+    def register(func):
+        SCENARIOS[name] = Scenario(
+            name=name,
+            func=func,
+            writes=writes,
+            description=(func.__doc__ or "").strip(),
+        )
+        return func
+
+    return register
+
+
+@dataclass
+class BenchContext:
+    """Fixtures shared by all scenarios, looked up once per run"""
+
+    user: object
+    company: object
+    product_ids: list
+    order: object
+    order_items: dict
+    client: Client = field(default=None)
+    user_info_etag: str = None
+    # Responses that failed expect() since the runner last collected them
+    unexpected: list = field(default_factory=list)
+
+    @classmethod
+    def build(cls):
+        user = bench_users().order_by("pk").first()
+        if user is None:
+            raise LookupError(
+                "No benchmark data found. Run `manage.py seed_bench_data` first."
+            )
+
+        # The busiest active catalog makes for the most representative fetch
+        company = (
+            bench_companies()
+            .filter(is_active=True)
+            .annotate(
+                active_count=Count(
+                    "company_products", filter=Q(company_products__active=True)
+                )
+            )
+            .order_by("-active_count")
+            .first()
+        )
+        product_ids = list(
+            company.company_products.filter(active=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        order = (
+            Order.objects.filter(creator__in=bench_users())
+            .annotate(item_count=Count("productorder"))
+            .order_by("-item_count")
+            .first()
+        )
+
+        order_items = order.get_products_dict()
+
+        client = Client()
+        client.force_login(user)
+
+        return cls(
+            user=user,
+            company=company,
+            product_ids=product_ids,
+            order=order,
+            order_items=order_items,
+            client=client,
+        )
+
+
+def expect(ctx, response, status_code=200):
+    """Note `response` on ctx.unexpected unless it has `status_code`"""
+    if response.status_code != status_code:
+        request = response.request
+        ctx.unexpected.append(
+            f"{request['REQUEST_METHOD']} {request['PATH_INFO']} returned "
+            f"{response.status_code}, expected {status_code}"
+        )
+    return response
+
+
+@scenario("catalog_fetch")
+def catalog_fetch(ctx):
+    """Fetch the active catalog for the largest company"""
+    expect(ctx, ctx.client.post(f"/api/products/company/{ctx.company.pk}/", **AJAX))
+
+
+@scenario("order_create", writes=True)
+def order_create(ctx):
+    """Create a 20 line-item order"""
+    data = {f"product_{pk}": 2 for pk in ctx.product_ids[:20]}
+    expect(ctx, ctx.client.post("/api/orders/create/", data, **AJAX), 201)
+
+
+@scenario("order_update", writes=True)
+def order_update(ctx):
+    """Change, add and remove line items on an existing order"""
+    data = {f"product_{pk}": qty for pk, qty in ctx.order_items.items()}
+    for i, key in enumerate(data):
+        data[key] = 0 if i % 3 == 0 else data[key] + 1
+    if not any(data.values()):
+        data[next(iter(data))] = 1
+    expect(ctx, ctx.client.post(f"/api/orders/{ctx.order.pk}/update/", data, **AJAX))
+
+
+@scenario("order_create_json", writes=True)
+def order_create_json(ctx):
+    """Create a 20 line-item order with the JSON payload"""
+    payload = {
+        "version": 1,
+        "company_id": ctx.company.pk,
+        "items": [[pk, 2] for pk in ctx.product_ids[:20]],
+    }
+    response = ctx.client.post(
+        "/api/orders/create/", payload, content_type="application/json", **AJAX
+    )
+    expect(ctx, response, 201)
+
+
+@scenario("order_update_json", writes=True)
+def order_update_json(ctx):
+    """Change, add and remove line items with the JSON payload"""
+    items = [
+        [pk, 0 if i % 3 == 0 else qty + 1]
+        for i, (pk, qty) in enumerate(ctx.order_items.items())
+    ]
+    if not any(qty for _, qty in items):
+        items[0][1] = 1
+    response = ctx.client.post(
+        f"/api/orders/{ctx.order.pk}/update/",
+        {"version": 1, "items": items},
+        content_type="application/json",
+        **AJAX,
+    )
+    expect(ctx, response)
+
+
+@scenario("order_list")
+def order_list(ctx):
+    """Render the first page of the order list"""
+    expect(ctx, ctx.client.get("/orders/"))
+
+
+@scenario("csv_export")
+def csv_export(ctx):
+    """Export the largest order as CSV"""
+    expect(ctx, ctx.client.get(f"/api/orders/{ctx.order.pk}/export-csv/"))
+
+
+@scenario("bulk_upload", writes=True)
+def bulk_upload(ctx):
+    """Upload a 200 row product CSV"""
+    rows = ["Item No.,Name,Type"]
+    rows.extend(f"BU{i:05d},Bulk Upload Product {i},C" for i in range(200))
+    upload = io.BytesIO("\n".join(rows).encode())
+    upload.name = "products.csv"
+    response = ctx.client.post(
+        f"/companies/{ctx.company.pk}/bulk-upload/", {"csv_file": upload}
+    )
+    expect(ctx, response, 302)
+
+
+@scenario("template_render")
+def template_render(ctx):
+    """Render the default email template for an order"""
+    response = ctx.client.post(
+        "/api/email/render-template/", {"order_id": ctx.order.pk}, **AJAX
+    )
+    expect(ctx, response)
+
+
+TIMESTAMPS = [timezone.now() - timedelta(hours=i) for i in range(500)]
+
+TIMESTAMP_TEMPLATE = Template(
+    "{% load timezone_tags %}"
+    "{% for value in timestamps %}"
+    '{% user_datetime value user "M d, Y g:i A" %}'
+    "{% endfor %}"
+)
+BULK_TIMESTAMP_TEMPLATE = Template(
+    "{% load timezone_tags %}"
+    '{% for label in timestamps|user_datetimes:"M d, Y g:i A" %}'
+    "{{ label }}"
+    "{% endfor %}"
+)
+
+
+@scenario("timestamp_render")
+def timestamp_render(ctx):
+    """Render 500 timestamps with the per-value user_datetime tag"""
+    TIMESTAMP_TEMPLATE.render(Context({"timestamps": TIMESTAMPS, "user": ctx.user}))
+
+
+@scenario("timestamp_render_bulk")
+def timestamp_render_bulk(ctx):
+    """Render 500 timestamps with the bulk user_datetimes filter"""
+    with timezone.override(get_user_timezone(ctx.user)):
+        BULK_TIMESTAMP_TEMPLATE.render(Context({"timestamps": TIMESTAMPS}))
+
+
+@scenario("login")
+def login(ctx):
+    """Log in through the login form (includes password hashing)"""
+    client = Client()
+    response = client.post(
+        "/login/", {"username": ctx.user.username, "password": BENCH_PASSWORD}
+    )
+    # A failed login renders the form again with a 200
+    expect(ctx, response, 302)
+
+
+@scenario("authenticated_request")
+def authenticated_request(ctx):
+    """Fetch the small company list API as a logged-in user (session + user load)"""
+    expect(ctx, ctx.client.get("/api/companies/", **AJAX))
+
+
+@scenario("composer_bootstrap")
+def composer_bootstrap(ctx):
+    """Open the email composer for an order (user info already cached)"""
+    if ctx.user_info_etag is None:
+        response = ctx.client.get(f"/api/orders/{ctx.order.pk}/composer/", **AJAX)
+        expect(ctx, response)
+        ctx.user_info_etag = response.json()["user_info_etag"]
+    response = ctx.client.get(
+        f"/api/orders/{ctx.order.pk}/composer/",
+        {"user_info": ctx.user_info_etag},
+        **AJAX,
+    )
+    expect(ctx, response)
+
+
+DASHBOARD_REQUESTS = [
+    "/api/user/email-info/",
+    "/api/companies/?active=1",
+    "/api/audit/",
+]
+
+
+@scenario("dashboard_separate")
+def dashboard_separate(ctx):
+    """Load the dashboard data with one API round trip per resource"""
+    for path in DASHBOARD_REQUESTS:
+        expect(ctx, ctx.client.get(path, **AJAX))
+
+
+@scenario("dashboard_batch")
+def dashboard_batch(ctx):
+    """Load the same dashboard data with a single /api/batch/ request"""
+    response = ctx.client.post(
+        "/api/batch/",
+        {"requests": [{"path": path} for path in DASHBOARD_REQUESTS]},
+        content_type="application/json",
+        **AJAX,
+    )
+    if expect(ctx, response).status_code == 200:
+        for path, result in zip(DASHBOARD_REQUESTS, response.json()["responses"]):
+            if result["status"] != 200:
+                ctx.unexpected.append(
+                    f"batched GET {path} returned {result['status']}, expected 200"
+                )
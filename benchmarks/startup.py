@@ -0,0 +1,133 @@
+"""
+Cold-start and per-request latency probe for a settings profile.
+
+Run in a fresh process so the first request pays for template compilation
+and connection setup:
+
+    DJANGO_SETTINGS_PROFILE=prod python -m benchmarks.startup
+
+Requests go through the real WSGI handler (not the test client), so
+request_finished closes or keeps database connections exactly as it would
+under a server. Prints a JSON report to stdout.
+
+The prod profile serves hashed static file names, so run collectstatic
+(optionally into a scratch STATIC_ROOT) before probing it.
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+DEFAULT_PATHS = ["/dashboard/", "/orders/", "/companies/"]
+
+
+def _environ(path, cookie):
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "testserver",
+        "HTTP_COOKIE": cookie,
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+    }
+
+
+def probe(paths=None, requests=50):
+    """
+    Time the first and subsequent requests to each path.
+
+    Returns:
+        dict: {path: {"status", "first_ms", "p50_ms"}}
+    """
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from .data import bench_users
+    from .runner import percentile
+
+    user = bench_users().order_by("pk").first()
+    if user is None:
+        raise LookupError("No benchmark data found. Run `manage.py seed_bench_data` first.")
+
+    client = Client()
+    client.force_login(user)
+    session_cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+    cookie = f"{settings.SESSION_COOKIE_NAME}={session_cookie.value}"
+
+    handler = WSGIHandler()
+    results = {}
+
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for path in paths or DEFAULT_PATHS:
+            timings = []
+            status = None
+            for _ in range(requests + 1):
+                start = time.perf_counter()
+                response = handler(_environ(path, cookie), lambda s, h: None)
+                b"".join(response)
+                response.close()
+                timings.append((time.perf_counter() - start) * 1000)
+                status = response.status_code
+
+            results[path] = {
+                "status": status,
+                "first_ms": round(timings[0], 3),
+                "p50_ms": round(percentile(timings[1:], 50), 3),
+            }
+
+    client.logout()
+    return results
+
+
+def measure_profile(profile, paths=None, requests=50):
+    """Run the probe for `profile` in a fresh interpreter and return its report"""
+    env = {**os.environ, "DJANGO_SETTINGS_PROFILE": profile}
+    env.setdefault("DJANGO_SETTINGS_MODULE", "ordering_form.settings")
+    args = [sys.executable, "-m", "benchmarks.startup", "--requests", str(requests)]
+    args.extend(paths or DEFAULT_PATHS)
+
+    output = subprocess.check_output(
+        args, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    return json.loads(output)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--requests", type=int, default=50)
+    options = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ordering_form.settings")
+
+    start = time.perf_counter()
+    import django
+
+    django.setup()
+    setup_ms = (time.perf_counter() - start) * 1000
+
+    from django.conf import settings
+
+    report = {
+        "profile": os.environ.get("DJANGO_SETTINGS_PROFILE", "dev"),
+        "debug": settings.DEBUG,
+        "setup_ms": round(setup_ms, 3),
+        "paths": probe(options.paths, options.requests),
+    }
+    json.dump(report, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
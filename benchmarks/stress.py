@@ -0,0 +1,170 @@
+"""
+Concurrent order submission stress test.
+
+Worker threads post orders to CreateOrderView through their own test client
+(and so their own database connection) while the run counts successes,
+"database is locked" failures and throughput. Each run can use a different
+SQLite tuning profile, so untuned and tuned behaviour can be compared on the
+same database. Orders created by a run are deleted afterwards.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+
+from core.db import get_sqlite_pragmas
+from order_app.models import Order
+from .data import bench_companies, bench_users
+
+AJAX = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+
+# The untuned setup: rollback journal, deferred transactions and the
+# driver's default 5 second lock timeout
+BASELINE = {
+    "pragmas": {
+        "journal_mode": "DELETE",
+        "busy_timeout": None,
+        "mmap_size": None,
+        "cache_size": None,
+        "synchronous": "FULL",
+        "temp_store": None,
+    },
+    "transaction_mode": None,
+}
+
+
+def tuned_profile():
+    return {
+        "pragmas": get_sqlite_pragmas(),
+        "transaction_mode": settings.DATABASES["default"]
+        .get("OPTIONS", {})
+        .get("transaction_mode"),
+    }
+
+
+@contextmanager
+def sqlite_profile(profile):
+    """
+    Apply a tuning profile to connections opened inside the block.
+
+    The journal mode is switched up front on a single connection, since
+    SQLite needs exclusive access to change it.
+    """
+    db_settings = connections.settings["default"]
+    options = db_settings.setdefault("OPTIONS", {})
+    previous_mode = options.get("transaction_mode")
+
+    connections.close_all()
+    options["transaction_mode"] = profile["transaction_mode"]
+    pragmas = {**profile["pragmas"]}
+    journal_mode = pragmas.pop("journal_mode", None)
+
+    try:
+        with override_settings(SQLITE_PRAGMAS={**pragmas, "journal_mode": None}):
+            if journal_mode:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+            yield
+    finally:
+        connections.close_all()
+        options["transaction_mode"] = previous_mode
+
+
+def _worker(client, payload, orders, results, lock, barrier):
+    barrier.wait()
+
+    for _ in range(orders):
+        start = time.perf_counter()
+        try:
+            response = client.post("/api/orders/create/", payload, **AJAX)
+            ok = response.status_code == 201
+            locked = not ok and b"database is locked" in response.content
+            order_id = response.json()["order"]["id"] if ok else None
+        except OperationalError as e:
+            ok, order_id = False, None
+            locked = "locked" in str(e)
+        except Exception:
+            ok, order_id, locked = False, None, False
+        elapsed = (time.perf_counter() - start) * 1000
+
+        with lock:
+            results["latencies"].append(elapsed)
+            if ok:
+                results["created"].append(order_id)
+            elif locked:
+                results["locked"] += 1
+            else:
+                results["failed"] += 1
+
+    connection.close()
+
+
+def run(profile, threads=8, orders=20, items=20):
+    """
+    Submit `threads * orders` orders concurrently under a tuning profile.
+
+    Returns:
+        dict: counts, lock errors, throughput and latency percentiles
+    """
+    from .runner import percentile
+
+    users = list(bench_users().order_by("pk")[:threads])
+    company = bench_companies().filter(is_active=True).order_by("pk").first()
+    if not users or company is None:
+        raise LookupError("No benchmark data found. Run `manage.py seed_bench_data` first.")
+
+    product_ids = list(
+        company.company_products.filter(active=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:items]
+    )
+    payload = {f"product_{pk}": 1 for pk in product_ids}
+
+    results = {"created": [], "locked": 0, "failed": 0, "latencies": []}
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    with sqlite_profile(profile), override_settings(
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+    ):
+        # Log in up front so session writes are not part of the measurement
+        clients = []
+        for i in range(threads):
+            client = Client(raise_request_exception=False)
+            client.force_login(users[i % len(users)])
+            clients.append(client)
+        connection.close()
+
+        workers = [
+            threading.Thread(
+                target=_worker,
+                args=(client, payload, orders, results, lock, barrier),
+            )
+            for client in clients
+        ]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+    Order.objects.filter(pk__in=results["created"]).delete()
+
+    latencies = results["latencies"]
+    return {
+        "submitted": len(latencies),
+        "created": len(results["created"]),
+        "locked": results["locked"],
+        "failed": results["failed"],
+        "seconds": round(elapsed, 3),
+        "orders_per_second": round(len(results["created"]) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+    }
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def compute_order_counts(apps, schema_editor):
+    Company = apps.get_model("company_app", "Company")
+    ProductOrder = apps.get_model("order_app", "ProductOrder")
+
+    counts = (
+        ProductOrder.objects.filter(product__company=OuterRef("pk"))
+        .order_by()
+        .values("product__company")
+        .annotate(count=Count("order", distinct=True))
+        .values("count")
+    )
+    Company.objects.update(order_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("company_app", "0005_company_is_active"),
+        ("order_app", "0006_emaildraft"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="company",
+            name="order_count",
+            field=models.PositiveIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Number of orders containing this company's products. Maintained on order writes; empty until first computed.",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(compute_order_counts, migrations.RunPython.noop),
+    ]
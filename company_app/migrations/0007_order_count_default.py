@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def compute_order_counts(apps, schema_editor):
+    # Every count, including those left empty or gone stale while they
+    # were refreshed on commit
+    Company = apps.get_model("company_app", "Company")
+    ProductOrder = apps.get_model("order_app", "ProductOrder")
+
+    counts = (
+        ProductOrder.objects.filter(product__company=OuterRef("pk"))
+        .order_by()
+        .values("product__company")
+        .annotate(count=Count("order", distinct=True))
+        .values("count")
+    )
+    Company.objects.update(order_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("company_app", "0006_company_order_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(compute_order_counts, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="company",
+            name="order_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of orders containing this company's products. Maintained on order writes.",
+            ),
+        ),
+    ]
@@ -1,7 +1,8 @@
 from django.db import models
+from core.tracking import FieldTrackerMixin
 
 
-class CompanyManager(models.Manager):
+class CompanyQuerySet(models.QuerySet):
     def active(self):
         """Return only active companies"""
         return self.filter(is_active=True)
@@ -15,8 +16,39 @@ class CompanyManager(models.Manager):
             ),
         )
 
+    def with_catalog_summary(self):
+        """Return companies with product counts and an active catalog summary annotated"""
+        active = models.Q(company_products__active=True)
+        return self.with_product_counts().annotate(
+            active_case_count=models.Count(
+                "company_products",
+                filter=active & models.Q(company_products__item_type="C"),
+            ),
+            active_weight_count=models.Count(
+                "company_products",
+                filter=active & models.Q(company_products__item_type="W"),
+            ),
+            catalog_updated_at=models.Max(
+                "company_products__updated_at", filter=active
+            ),
+        )
+
+    def with_order_flags(self):
+        """Return companies with `orders_exist` annotated from order_count"""
+        return self.annotate(
+            orders_exist=models.ExpressionWrapper(
+                models.Q(order_count__gt=0), output_field=models.BooleanField()
+            )
+        )
+
+
+class CompanyManager(models.Manager.from_queryset(CompanyQuerySet)):
+    pass
+
+
+class Company(FieldTrackerMixin, models.Model):
+    tracked_fields = ("is_active",)
 
-class Company(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField(max_length=255, blank=True, null=True)
     is_active = models.BooleanField(
@@ -24,6 +56,12 @@ class Company(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    order_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of orders containing this company's products. "
+        "Maintained on order writes.",
+    )
 
     objects = CompanyManager()
 
@@ -39,9 +77,19 @@ class Company(models.Model):
         return self.company_products.filter(active=True)
 
     def get_product_count(self):
-        """Return total product count"""
+        """Return total product count, using the annotation when present"""
+        if hasattr(self, "product_count"):
+            return self.product_count
         return self.company_products.count()
 
     def get_active_product_count(self):
-        """Return active product count"""
+        """Return active product count, using the annotation when present"""
+        if hasattr(self, "active_product_count"):
+            return self.active_product_count
         return self.company_products.filter(active=True).count()
+
+    def has_orders(self):
+        """Whether any order contains this company's products"""
+        if hasattr(self, "orders_exist"):
+            return self.orders_exist
+        return self.order_count > 0
@@ -1,5 +1,8 @@
 from django.db.models.signals import post_save, pre_save, pre_delete
 from django.dispatch import receiver
+from core import audit
+from core.signals import tracked_fields_changed
+from .stats import bump_catalog_version
 from .models import Company
 
 
@@ -9,19 +12,32 @@ def log_company_status_changes(sender, instance, **kwargs):
     Track when a company is activated or deactivated.
     Useful for notifying admins or logging changes.
     """
-    if instance.pk:
-        try:
-            old_instance = Company.objects.get(pk=instance.pk)
-            if old_instance.is_active != instance.is_active:
-                # Status changed
-                if instance.is_active:
-                    print(f"Company '{instance.name}' was activated")
-                    # Could send notification to admins
-                else:
-                    print(f"Company '{instance.name}' was deactivated")
-                    # Could send notification to users with pending orders
-        except Company.DoesNotExist:
-            pass
+    if instance.has_saved_change("is_active", kwargs.get("update_fields")):
+        _log_status_change(instance)
+
+
+@receiver(tracked_fields_changed, sender=Company)
+def log_bulk_company_status_changes(sender, changes, **kwargs):
+    """
+    Same as above for companies changed via bulk_update_tracked().
+    """
+    for instance, fields in changes:
+        if "is_active" in fields:
+            _log_status_change(instance)
+
+
+def _log_status_change(instance):
+    # Status changed
+    if instance.is_active:
+        audit.record(
+            "company.activated", instance, f"Company '{instance.name}' was activated"
+        )
+        # Could send notification to admins
+    else:
+        audit.record(
+            "company.deactivated", instance, f"Company '{instance.name}' was deactivated"
+        )
+        # Could send notification to users with pending orders
 
 
 @receiver(post_save, sender=Company)
@@ -33,8 +49,25 @@ def create_company_welcome_data(sender, instance, created, **kwargs):
     - Create default categories
     """
     if created:
-        # Example: Log company creation
-        print(f"New company created: {instance.name}")
+        audit.record(
+            "company.created", instance, f"New company created: {instance.name}"
+        )
+
+
+@receiver(post_save, sender=Company)
+def bump_company_catalog_version(sender, instance, created, **kwargs):
+    """
+    Company details are rendered inside cached order cards and product
+    tables; move them to a new version when the company changes.
+    """
+    if not created:
+        bump_catalog_version(instance.pk)
+
+
+@receiver(tracked_fields_changed, sender=Company)
+def bump_bulk_company_catalog_versions(sender, changes, **kwargs):
+    for instance, fields in changes:
+        bump_catalog_version(instance.pk)
 
 
 @receiver(pre_delete, sender=Company)
@@ -43,15 +76,12 @@ def prevent_company_deletion_with_orders(sender, instance, **kwargs):
     Prevent deletion of companies that have associated orders.
     Or alternatively, mark them as inactive instead.
     """
-    from order_app.models import Order
-
-    # Check if company has any orders
-    order_count = Order.objects.filter(
-        productorder__product__company=instance
-    ).distinct().count()
+    # order_count is kept exact in the writing transaction, but this
+    # instance may have been loaded before orders were added or deleted
+    instance.refresh_from_db(fields=["order_count"])
 
-    if order_count > 0:
+    if instance.has_orders():
         raise Exception(
-            f"Cannot delete company '{instance.name}' - it has {order_count} associated order(s). "
-            f"Consider marking it as inactive instead."
-        )
\ No newline at end of file
+            f"Cannot delete company '{instance.name}' - it has {instance.order_count} "
+            f"associated order(s). Consider marking it as inactive instead."
+        )
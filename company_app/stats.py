@@ -0,0 +1,197 @@
+"""
+Per-company statistics.
+
+Product counters are computed with one aggregate query on a cache miss and
+kept in the configured cache until a product signal invalidates them, when
+the transaction that changed the products commits.
+
+Catalog versions are opaque cache-held numbers bumped, on commit, whenever
+a company or one of its products changes; template fragments that render a
+company's catalog include the version in their cache key. Each bump also
+publishes a catalog.changed live event (see core.events).
+
+Order counts are stored on Company.order_count and kept exact in the
+transaction that writes the line items: adding or removing a line item
+adjusts its company's count with one conditional UPDATE, deleting an order
+decrements each of its companies once, and moving or deleting products
+recomputes the affected counts.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core import events
+from core.transactions import collect_on_commit
+
+PRODUCT_COUNTS_KEY = "company:{company_id}:product_counts"
+CATALOG_VERSION_KEY = "company:{company_id}:catalog_version"
+
+
+def get_product_counts(company_id):
+    """
+    Return {"total": int, "active": int} product counts for a company.
+    """
+    key = PRODUCT_COUNTS_KEY.format(company_id=company_id)
+    counts = cache.get(key)
+
+    if counts is None:
+        from product_app.models import Product
+
+        counts = Product.objects.filter(company_id=company_id).aggregate(
+            total=Count("id"), active=Count("id", filter=Q(active=True))
+        )
+        cache.set(key, counts, timeout=None)
+
+    return counts
+
+
+def invalidate_product_counts(company_id):
+    """
+    Drop a company's cached product counts when the current transaction
+    commits. Dropping them earlier would let a concurrent request cache
+    the counts from before the commit again, with no timeout.
+    """
+    collect_on_commit("product_counts", company_id, _delete_product_counts)
+
+
+def _delete_product_counts(company_ids):
+    cache.delete_many(
+        [PRODUCT_COUNTS_KEY.format(company_id=pk) for pk in company_ids]
+    )
+
+
+def get_catalog_versions(company_ids):
+    """
+    Return {company_id: version} for the given companies with one cache
+    round trip, initialising missing versions.
+    """
+    keys = {CATALOG_VERSION_KEY.format(company_id=pk): pk for pk in company_ids}
+    found = cache.get_many(list(keys))
+
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+
+    return {pk: found[key] for key, pk in keys.items()}
+
+
+def get_catalog_version(company_id):
+    return get_catalog_versions([company_id])[company_id]
+
+
+def bump_catalog_version(company_id):
+    """
+    Move a company's catalog to a new version when the current transaction
+    commits, orphaning cached fragments. Bumping earlier would let a
+    concurrent request cache a fragment of the old data under the new
+    version.
+
+    A fresh timestamp (rather than +1) keeps versions from repeating after
+    the key is evicted.
+    """
+    collect_on_commit("catalog_versions", company_id, _bump_catalog_versions)
+
+
+def _bump_catalog_versions(company_ids):
+    version = time.time_ns()
+    cache.set_many(
+        {CATALOG_VERSION_KEY.format(company_id=pk): version for pk in company_ids},
+        timeout=None,
+    )
+    # One transaction, so the live events are written with one insert
+    with transaction.atomic():
+        for pk in company_ids:
+            events.publish(events.CATALOG_CHANGED, pk)
+
+
+def refresh_order_counts(company_ids):
+    """
+    Recompute Company.order_count for the given companies with one UPDATE.
+    """
+    from order_app.models import ProductOrder
+    from .models import Company
+
+    if not company_ids:
+        return
+
+    counts = (
+        ProductOrder.objects.filter(product__company=OuterRef("pk"))
+        .order_by()
+        .values("product__company")
+        .annotate(count=Count("order", distinct=True))
+        .values("count")
+    )
+    Company.objects.filter(pk__in=company_ids).update(
+        order_count=Coalesce(Subquery(counts), Value(0))
+    )
+
+
+def refresh_order_counts_for_products(product_ids):
+    """Recompute the order counts of the companies owning the given products"""
+    from product_app.models import Product
+
+    refresh_order_counts(
+        list(
+            Product.objects.filter(pk__in=product_ids)
+            .values_list("company_id", flat=True)
+            .distinct()
+        )
+    )
+
+
+def _line_item_company(line_item):
+    """The company id of a line item's product, as a value or a subquery"""
+    from order_app.models import ProductOrder
+    from product_app.models import Product
+
+    if ProductOrder.product.is_cached(line_item):
+        return line_item.product.company_id
+    return Subquery(Product.objects.filter(pk=line_item.product_id).values("company_id"))
+
+
+def _order_company_items(order_id):
+    """An order's line items from the company in the outer query"""
+    from order_app.models import ProductOrder
+
+    return ProductOrder.objects.filter(order_id=order_id, product__company=OuterRef("pk"))
+
+
+def count_line_item(line_item):
+    """
+    Count a new line item's order towards its company, unless the order
+    already had a line item from that company.
+    """
+    from .models import Company
+
+    others = _order_company_items(line_item.order_id).exclude(pk=line_item.pk)
+    Company.objects.filter(pk=_line_item_company(line_item)).filter(~Exists(others)).update(
+        order_count=F("order_count") + 1
+    )
+
+
+def uncount_line_item(line_item):
+    """
+    Stop counting a deleted line item's order towards its company, unless
+    the order still has another line item from that company.
+    """
+    from .models import Company
+
+    remaining = _order_company_items(line_item.order_id)
+    Company.objects.filter(pk=_line_item_company(line_item), order_count__gt=0).filter(
+        ~Exists(remaining)
+    ).update(order_count=F("order_count") - 1)
+
+
+def uncount_order(company_ids):
+    """Decrement the counts of the companies a deleted order counted towards"""
+    from .models import Company
+
+    if company_ids:
+        Company.objects.filter(pk__in=company_ids, order_count__gt=0).update(
+            order_count=F("order_count") - 1
+        )
@@ -0,0 +1,85 @@
+"""
+Server-side paging, sorting and filtering for the company product table.
+"""
+
+from django.db.models import Q
+
+from core.constants import get_item_type_display
+from product_app.models import Product
+from .stats import get_product_counts
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+SORT_FIELDS = {"item_no", "name", "item_type", "active"}
+STATUS_CHOICES = {"all", "active", "inactive"}
+
+
+def _to_int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def get_product_page(company_id, page=1, page_size=PAGE_SIZE, sort="item_no",
+                     search="", status="all"):
+    """
+    Return one page of a company's products.
+
+    No COUNT query is issued: one extra row is fetched to tell whether more
+    pages follow, and the total comes from the cached company counters
+    (only available when no search term narrows the table).
+
+    Returns:
+        dict: products (list of dicts), page, page_size, has_more, total
+    """
+    page = max(_to_int(page, 1), 1)
+    page_size = min(max(_to_int(page_size, PAGE_SIZE), 1), MAX_PAGE_SIZE)
+    status = status if status in STATUS_CHOICES else "all"
+    search = (search or "").strip()
+
+    field = (sort or "").lstrip("-")
+    if field not in SORT_FIELDS:
+        sort, field = "item_no", "item_no"
+    descending = sort.startswith("-")
+    ordering = [f"-{field}" if descending else field, "-id" if descending else "id"]
+
+    products = Product.objects.filter(company_id=company_id)
+    if status == "active":
+        products = products.filter(active=True)
+    elif status == "inactive":
+        products = products.filter(active=False)
+    if search:
+        products = products.filter(
+            Q(name__icontains=search) | Q(item_no__icontains=search)
+        )
+
+    offset = (page - 1) * page_size
+    rows = list(
+        products.order_by(*ordering).values(
+            "id", "item_no", "name", "item_type", "active"
+        )[offset:offset + page_size + 1]
+    )
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    for row in rows:
+        row["item_type_display"] = get_item_type_display(row["item_type"])
+
+    total = None
+    if not search:
+        counts = get_product_counts(company_id)
+        total = {
+            "all": counts["total"],
+            "active": counts["active"],
+            "inactive": counts["total"] - counts["active"],
+        }[status]
+
+    return {
+        "products": rows,
+        "page": page,
+        "page_size": page_size,
+        "has_more": has_more,
+        "total": total,
+    }
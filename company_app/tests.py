@@ -1,3 +1,131 @@
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from core.models import AuditEvent
+from order_app.models import Order, ProductOrder
+from product_app.models import Product
+from user_app.models import User
+from .models import Company
+from .stats import PRODUCT_COUNTS_KEY, get_catalog_version, get_product_counts
+
+
+class CompanyDeletionGuardTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.company = Company.objects.create(name="Acme")
+        self.product = Product.objects.create(
+            company=self.company, name="Ham", item_type="C"
+        )
+        self.order = Order.objects.create(creator=self.user)
+        ProductOrder.objects.create(order=self.order, product=self.product)
+
+    def test_company_with_orders_cannot_be_deleted(self):
+        # Loaded before the order was added; the guard reads the current count
+        self.assertEqual(self.company.order_count, 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.assertRaisesMessage(Exception, "it has 1 associated order(s)"):
+                with transaction.atomic():
+                    self.company.delete()
+
+        # The count is read from order_count, not recounted
+        self.assertFalse(any("DISTINCT" in query["sql"] for query in queries))
+        self.assertTrue(Company.objects.filter(pk=self.company.pk).exists())
+
+    def test_orders_and_company_deleted_in_one_transaction(self):
+        with transaction.atomic():
+            Order.objects.filter(pk=self.order.pk).delete()
+            self.company.delete()
+
+        self.assertFalse(Company.objects.filter(pk=self.company.pk).exists())
+
+
+class ProductCountCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.company = Company.objects.create(name="Acme")
+        self.key = PRODUCT_COUNTS_KEY.format(company_id=self.company.pk)
+
+    def add_product(self):
+        return Product.objects.create(company=self.company, name="Ham", item_type="C")
+
+    def test_counts_are_invalidated_on_commit(self):
+        self.assertEqual(get_product_counts(self.company.pk)["total"], 0)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.add_product()
+            # Still cached until the transaction commits
+            self.assertIsNotNone(cache.get(self.key))
+
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(self.key))
+        self.assertEqual(get_product_counts(self.company.pk)["total"], 1)
+
+    def test_rollback_leaves_cached_counts_alone(self):
+        get_product_counts(self.company.pk)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.add_product()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(cache.get(self.key)["total"], 0)
+
+
+class CatalogVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.company = Company.objects.create(name="Acme")
+
+    def test_version_is_bumped_on_commit(self):
+        version = get_catalog_version(self.company.pk)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Product.objects.create(company=self.company, name="Ham", item_type="C")
+            self.assertEqual(get_catalog_version(self.company.pk), version)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_catalog_version(self.company.pk), version)
+
+
+class CompanyStatusTrackingTests(TestCase):
+    def setUp(self):
+        # Flush the company.created event, so later events get their own batch
+        with self.captureOnCommitCallbacks(execute=True):
+            Company.objects.create(name="Acme")
+        self.company = Company.objects.get(name="Acme")
+
+    def test_status_change_is_detected_without_refetching(self):
+        self.company.is_active = False
+        self.assertTrue(self.company.has_changed("is_active"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # Only the UPDATE; the audit event is written on commit
+            with self.assertNumQueries(1):
+                self.company.save()
+
+        self.assertFalse(self.company.has_changed("is_active"))
+        self.assertTrue(
+            AuditEvent.objects.filter(
+                event_type="company.deactivated", entity_id=self.company.pk
+            ).exists()
+        )
+
+    def test_unchanged_status_is_not_logged(self):
+        self.company.name = "Acme Corp"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.save()
+
+        self.assertFalse(
+            AuditEvent.objects.filter(event_type__startswith="company.").exclude(
+                event_type="company.created"
+            ).exists()
+        )
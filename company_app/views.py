@@ -3,11 +3,14 @@ from django.views.generic import ListView, DetailView, UpdateView, CreateView, V
 from django.urls import reverse_lazy
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db import IntegrityError, models, transaction
+from django.utils.functional import SimpleLazyObject
+from django.db import IntegrityError, transaction
 from core.mixins import LoginRequiredMixin, PageTitleMixin
 from product_app.models import Product
 from .models import Company
 from .forms import CompanyForm, BulkProductUploadForm
+from .stats import get_catalog_version, get_product_counts
+from .tables import PAGE_SIZE, get_product_page
 
 
 class CompanyListView(LoginRequiredMixin, PageTitleMixin, ListView):
@@ -15,15 +18,10 @@ class CompanyListView(LoginRequiredMixin, PageTitleMixin, ListView):
     template_name = 'company_app/company_list.html'
     context_object_name = 'companies'
     page_title = 'All Companies'
+    replica_reads = True
 
     def get_queryset(self):
-        return Company.objects.annotate(
-            product_count=models.Count('company_products'),
-            active_product_count=models.Count(
-                'company_products',
-                filter=models.Q(company_products__active=True)
-            )
-        ).order_by('name')
+        return Company.objects.with_product_counts().with_order_flags().order_by('name')
 
 
 class CompanyDetailView(LoginRequiredMixin, PageTitleMixin, DetailView):
@@ -31,10 +29,20 @@ class CompanyDetailView(LoginRequiredMixin, PageTitleMixin, DetailView):
     template_name = 'company_app/company_detail.html'
     context_object_name = 'company'
 
+    def get_queryset(self):
+        return Company.objects.with_order_flags()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['page_title'] = f"{self.object.name} - Details"
-        context['products'] = self.object.company_products.all().order_by('item_no')
+
+        # Only the first screen is rendered; the rest is fetched on scroll.
+        # The page is loaded lazily so a cached product table skips the query.
+        pk = self.object.pk
+        context['product_table'] = SimpleLazyObject(lambda: get_product_page(pk))
+        context['product_page_size'] = PAGE_SIZE
+        context['product_counts'] = get_product_counts(pk)
+        context['catalog_version'] = get_catalog_version(pk)
         return context
 
 
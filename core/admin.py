@@ -0,0 +1,22 @@
+from django.contrib import admin
+from .models import AuditEvent, IdempotencyKey
+
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(admin.ModelAdmin):
+    list_display = ["created_at", "event_type", "entity_type", "entity_id", "message"]
+    list_filter = ["entity_type", "event_type"]
+    search_fields = ["message"]
+    ordering = ["-created_at"]
+    readonly_fields = ["event_type", "entity_type", "entity_id", "message", "data", "created_at"]
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ["created_at", "scope", "user", "key", "status_code", "expires_at"]
+    list_filter = ["scope", "status_code"]
+    search_fields = ["key"]
+    ordering = ["-created_at"]
+    readonly_fields = [
+        "user", "scope", "key", "request_hash", "status_code", "response", "created_at", "expires_at"
+    ]
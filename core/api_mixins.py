@@ -3,6 +3,15 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 
+def is_json_request(request):
+    """
+    Whether the request body is JSON. Works for Django and DRF requests
+    alike; DRF's content_type keeps parameters such as "; charset=utf-8".
+    """
+    media_type = (request.content_type or "").split(";")[0].strip().lower()
+    return media_type == "application/json"
+
+
 class IsAuthenticatedAjax(permissions.BasePermission):
     """
     Custom permission for AJAX requests requiring authentication.
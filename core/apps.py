@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self):
+        from . import audit, checks, db  # noqa: F401 (checks registers itself)
+
+        audit.configure_logging()
+        db.connect_signals()
@@ -0,0 +1,98 @@
+"""
+Base class for async API views.
+
+DRF views are sync-only: under ASGI each one occupies a thread for its
+whole run, including time spent waiting on SMTP or the database. Views
+built on AsyncAPIView run on the event loop and reproduce what the api
+views get from DRF and core.api_mixins: the AJAX check, session
+authentication, `request.data` and the StandardResponseMixin response
+shape.
+
+CSRF is checked by CsrfViewMiddleware as for any non-DRF view.
+"""
+
+import json
+
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import status
+
+from . import ratelimit
+from .api_mixins import is_json_request
+
+
+class APIResponse(JsonResponse):
+    """JsonResponse that keeps its payload as `.data`, like a DRF Response"""
+
+    def __init__(self, data, status=status.HTTP_200_OK, **kwargs):
+        # Compact separators, as DRF's JSONRenderer writes them
+        kwargs.setdefault("json_dumps_params", {"separators": (",", ":")})
+        super().__init__(data, status=status, **kwargs)
+        self.data = data
+
+
+class AsyncAPIView(View):
+    """
+    Async counterpart of AjaxRequiredMixin + StandardResponseMixin + APIView
+    with the IsAuthenticated permission. Views that set `throttle_scope` are
+    rate limited like DRF's RateLimitThrottle does it.
+    """
+
+    ajax_required = True
+    throttle_scope = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.ajax_required and request.headers.get("X-Requested-With") != "XMLHttpRequest":
+            return APIResponse(
+                {"error": "AJAX request required"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Resolve the session user without a sync database call
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return APIResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        if self.throttle_scope:
+            retry_after = await ratelimit.acheck(self.throttle_scope, request)
+            if retry_after:
+                detail = f"Request was throttled. Expected available in {retry_after} seconds."
+                response = APIResponse(
+                    {"detail": detail}, status=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+                response["Retry-After"] = str(retry_after)
+                return response
+
+        try:
+            request.data = self.parse_data(request)
+        except ValueError as e:
+            return APIResponse(
+                {"detail": f"JSON parse error - {e}"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return await super().dispatch(request, *args, **kwargs)
+
+    @staticmethod
+    def parse_data(request):
+        """The JSON body, or the form data for other content types"""
+        if is_json_request(request):
+            return json.loads(request.body or b"{}")
+        return request.POST
+
+    def success_response(self, data=None, message=None, status_code=status.HTTP_200_OK):
+        response_data = {"success": True}
+        if message:
+            response_data["message"] = message
+        if data:
+            response_data.update(data)
+        return APIResponse(response_data, status=status_code)
+
+    def error_response(
+        self, message, errors=None, status_code=status.HTTP_400_BAD_REQUEST
+    ):
+        response_data = {"success": False, "message": message}
+        if errors:
+            response_data["errors"] = errors
+        return APIResponse(response_data, status=status_code)
@@ -0,0 +1,122 @@
+"""
+Audit trail: buffered AuditEvent inserts plus non-blocking text logging.
+
+How record() writes the AuditEvent row depends on the caller:
+- Inside a transaction, events are buffered and inserted with one
+  bulk_create when the transaction commits. Events recorded in a
+  rolled-back transaction (or savepoint) are discarded with it.
+- Outside a transaction (autocommit), the row is inserted right away with
+  a single INSERT; there is nothing to wait for.
+
+The text line never touches stdout from the request thread: it goes to the
+"audit" logger, whose QueueHandler hands it to a background QueueListener
+thread, so request threads never block on stream I/O. Only the log line
+goes through that queue, not the database row.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger("audit")
+
+BATCH_SIZE = 500
+
+_state = threading.local()
+_listener = None
+
+
+def configure_logging():
+    """
+    Route the "audit" logger through a queue to a background stream handler.
+
+    Skipped when the logger already has handlers (e.g. configured via the
+    LOGGING setting).
+    """
+    global _listener
+    if _listener is not None or logger.handlers:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s [audit] %(message)s"))
+
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def record(event_type, instance=None, message="", using=DEFAULT_DB_ALIAS, **data):
+    """
+    Record an audit event.
+
+    Args:
+        event_type: dotted name such as "product.created"
+        instance: the model instance the event is about (optional)
+        message: human readable description, also sent to the audit logger
+        **data: extra JSON-serializable details
+    """
+    from .models import AuditEvent
+
+    event = AuditEvent(
+        event_type=event_type,
+        entity_type=instance._meta.model_name if instance is not None else "",
+        entity_id=instance.pk if instance is not None else None,
+        message=message,
+        data=data,
+    )
+
+    if message:
+        logger.info(message)
+
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        event.save(using=using)
+        return
+
+    _current_batch(connection, using).append(event)
+
+
+def _current_batch(connection, using):
+    """
+    Return the buffer for the current transaction/savepoint level.
+
+    One buffer is kept per savepoint level, each flushed by its own
+    on_commit callback, so rolling back a savepoint drops exactly the
+    events recorded inside it.
+    """
+    batches = getattr(_state, "batches", None)
+    if batches is None:
+        batches = _state.batches = {}
+
+    level = (using, tuple(connection.savepoint_ids))
+    registered = {func for _, func, _ in connection.run_on_commit}
+
+    entry = batches.get(level)
+    if entry is not None and entry[1] in registered:
+        return entry[0]
+
+    batch = []
+
+    def flush():
+        batches.pop(level, None)
+        flush_events(batch, using)
+
+    transaction.on_commit(flush, using=using)
+    batches[level] = (batch, flush)
+    return batch
+
+
+def flush_events(events, using=DEFAULT_DB_ALIAS):
+    from .models import AuditEvent
+
+    if events:
+        AuditEvent.objects.using(using).bulk_create(events, batch_size=BATCH_SIZE)
@@ -0,0 +1,38 @@
+"""
+System checks for deployment settings the app relies on.
+"""
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Caches shared between worker processes whose incr is a get followed by a
+# set, so concurrent requests can overwrite each other's counts
+NON_ATOMIC_CACHE_BACKENDS = {
+    "django.core.cache.backends.filebased.FileBasedCache",
+    "django.core.cache.backends.db.DatabaseCache",
+}
+
+
+@register()
+def check_ratelimit_cache(app_configs, **kwargs):
+    """
+    Rate limits take tokens with cache.incr (see core.ratelimit), which is
+    only atomic for every worker process with Redis or memcached. Other
+    caches still limit, but concurrent requests can lose each other's
+    counts, so this is a warning rather than an error.
+    """
+    if not getattr(settings, "RATELIMIT_ENABLED", True):
+        return []
+
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend not in NON_ATOMIC_CACHE_BACKENDS:
+        return []
+
+    return [
+        Warning(
+            f"Rate limits can undercount concurrent requests with {backend}, "
+            f"which has no atomic increment.",
+            hint="Set REDIS_URL for exact limits, or RATELIMIT_ENABLED=0 to turn them off.",
+            id="core.W001",
+        )
+    ]
@@ -0,0 +1,69 @@
+"""
+Per-connection database tuning.
+
+SQLite pragmas are applied to every new connection through the
+connection_created signal. DEFAULT_SQLITE_PRAGMAS is merged with the
+SQLITE_PRAGMAS setting; set a pragma to None there to leave SQLite's own
+default in place, e.g.
+
+    SQLITE_PRAGMAS = {"busy_timeout": 10000, "mmap_size": None}
+
+Every connection also counts the queries it runs per alias, see
+core.routers.query_counts().
+"""
+
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+
+from .routers import count_query
+
+DEFAULT_SQLITE_PRAGMAS = {
+    # Readers no longer block the writer (and vice versa)
+    "journal_mode": "WAL",
+    # Wait up to this many ms for a lock instead of failing straight away
+    "busy_timeout": 5000,
+    # Bytes of the database file to memory-map
+    "mmap_size": 128 * 1024 * 1024,
+    # Page cache; negative values are KiB
+    "cache_size": -16000,
+    # Safe with WAL: a power loss can only drop the last commits
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+}
+
+_PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+
+def get_sqlite_pragmas():
+    """Return the pragmas to apply, defaults merged with settings.SQLITE_PRAGMAS"""
+    pragmas = {**DEFAULT_SQLITE_PRAGMAS, **getattr(settings, "SQLITE_PRAGMAS", {})}
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in get_sqlite_pragmas().items():
+            if not (_PRAGMA_VALUE.match(name) and _PRAGMA_VALUE.match(str(value))):
+                raise ImproperlyConfigured(f"Invalid SQLite pragma {name}={value!r}")
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def _count_queries(execute, sql, params, many, context):
+    count_query(context["connection"].alias)
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    if _count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_queries)
+
+
+def connect_signals():
+    connection_created.connect(apply_sqlite_pragmas, dispatch_uid="core.db.pragmas")
+    connection_created.connect(install_query_counter, dispatch_uid="core.db.metrics")
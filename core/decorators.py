@@ -25,3 +25,13 @@ def session_auth_required(f):
         return f(request, *args, **kwargs)
 
     return wrap
+
+
+def replica_reads(view):
+    """
+    Mark a read-only view so its queries may be served by the read replica
+    (see core.routers). Class-based views set `replica_reads = True` instead.
+    Apply it outermost so the mark survives other decorators.
+    """
+    view.replica_reads = True
+    return view
@@ -0,0 +1,40 @@
+"""
+Guard against lazy loading of deferred fields.
+
+Querysets built with .only()/.defer() silently issue one extra query per
+instance when code (usually a template) reads a column that was not
+loaded. Wrapping code in forbid_deferred_loads() turns that into an error.
+"""
+
+from contextlib import contextmanager
+
+from django.db.models import Model
+
+
+class DeferredFieldAccess(Exception):
+    pass
+
+
+@contextmanager
+def forbid_deferred_loads():
+    """
+    Raise DeferredFieldAccess whenever a deferred field is lazily loaded.
+
+    Django loads a deferred field through refresh_from_db(fields=[name]);
+    explicit refresh_from_db() calls without fields keep working.
+    """
+    original = Model.refresh_from_db
+
+    def guarded(self, using=None, fields=None, **kwargs):
+        if fields and any(f in self.get_deferred_fields() for f in fields):
+            raise DeferredFieldAccess(
+                f"{self.__class__.__name__}.{', '.join(fields)} was deferred "
+                f"but accessed (pk={self.pk})"
+            )
+        return original(self, using=using, fields=fields, **kwargs)
+
+    Model.refresh_from_db = guarded
+    try:
+        yield
+    finally:
+        Model.refresh_from_db = original
@@ -0,0 +1,167 @@
+"""
+Live events for the order list and new-order pages (see api.events).
+
+publish() is called from model signals. Events are compact, an event type
+plus the id of the order or company, and are written to the LiveEvent
+table when the transaction commits, once per (type, id) per transaction.
+The table is the event log: streams read events newer than the last id
+they sent, so a client can resume with Last-Event-ID and every worker
+process sees every event. It is separate from the audit trail and is
+trimmed by the purge_live_events command.
+
+After writing, publish wakes the streams waiting in this process (the
+in-process pub/sub). Streams in other worker processes find the events on
+their next poll, every EVENT_STREAM_POLL_SECONDS.
+"""
+
+import asyncio
+import threading
+
+from django.conf import settings
+
+from .transactions import collect_on_commit
+
+ORDER_CREATED = "order.created"
+ORDER_UPDATED = "order.updated"
+ORDER_DELETED = "order.deleted"
+CATALOG_CHANGED = "catalog.changed"
+
+EVENT_TYPES = (ORDER_CREATED, ORDER_UPDATED, ORDER_DELETED, CATALOG_CHANGED)
+
+# Entity each event type is about; coalesce() folds events per entity
+ENTITY_TYPES = {
+    ORDER_CREATED: "order",
+    ORDER_UPDATED: "order",
+    ORDER_DELETED: "order",
+    CATALOG_CHANGED: "company",
+}
+
+BATCH_SIZE = 100
+
+
+def get_poll_seconds():
+    return getattr(settings, "EVENT_STREAM_POLL_SECONDS", 2)
+
+
+class Broker:
+    """
+    Wakes the event streams of this process when events were written.
+
+    Subscribers are callables; sync streams register a threading.Event's
+    set, async streams set an asyncio.Event on their own loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.add(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers.discard(callback)
+
+    def notify(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback()
+
+    def wait(self, timeout):
+        """Block until notified or `timeout` seconds passed"""
+        event = threading.Event()
+        self.subscribe(event.set)
+        try:
+            event.wait(timeout)
+        finally:
+            self.unsubscribe(event.set)
+
+    async def await_notify(self, timeout):
+        """Async version of wait()"""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The loop was closed under us
+                pass
+
+        self.subscribe(wake)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.unsubscribe(wake)
+
+
+broker = Broker()
+
+
+def publish(event_type, entity_id, using=None):
+    """
+    Publish a live event when the current transaction commits (right away
+    outside one). Repeats within a transaction are dropped.
+    """
+    collect_on_commit("live_events", (event_type, entity_id), _flush, using=using)
+
+
+def _flush(items):
+    from .models import LiveEvent
+
+    LiveEvent.objects.bulk_create(
+        [LiveEvent(event_type=event_type, entity_id=entity_id) for event_type, entity_id in items]
+    )
+    broker.notify()
+
+
+def events_queryset(after_id):
+    from .models import LiveEvent
+
+    return (
+        LiveEvent.objects.filter(pk__gt=after_id)
+        .order_by("pk")
+        .values_list("pk", "event_type", "entity_id")[:BATCH_SIZE]
+    )
+
+
+def latest_event_id():
+    """Id to start a stream from so it only sends events from now on"""
+    from .models import LiveEvent
+
+    return LiveEvent.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+
+async def alatest_event_id():
+    from .models import LiveEvent
+
+    return await LiveEvent.objects.order_by("-pk").values_list("pk", flat=True).afirst() or 0
+
+
+def coalesce(rows):
+    """
+    Collapse a batch of (pk, event_type, entity_id) rows to one event per
+    entity: a deletion wins, and a creation absorbs later updates.
+
+    Returns:
+        list: (pk, event_type, entity_id) ordered by pk, where pk is the
+        last row folded into the event
+    """
+    events = {}
+    for pk, event_type, entity_id in rows:
+        key = (ENTITY_TYPES[event_type], entity_id)
+        previous = events.get(key)
+        if previous is not None and event_type == ORDER_UPDATED:
+            if previous[1] in (ORDER_CREATED, ORDER_DELETED):
+                event_type = previous[1]
+        events[key] = (pk, event_type, entity_id)
+    return sorted(events.values())
+
+
+def format_event(pk, event_type, entity_id):
+    """One event in text/event-stream format"""
+    return f'id: {pk}\nevent: {event_type}\ndata: {{"id": {entity_id}}}\n\n'
@@ -0,0 +1,253 @@
+"""
+Idempotency-Key support for unsafe API endpoints.
+
+A client sends the same `Idempotency-Key` header when it retries a request
+(double-click, timeout, flaky network). The first request runs the view
+and stores its response; repeats get the stored response back without the
+view running again.
+
+Keys are scoped per user and endpoint and live in the IdempotencyKey table
+for IDEMPOTENCY_KEY_TTL seconds, with completed responses also kept in the
+cache so repeats normally cost no query. Expired rows are removed by the
+purge_idempotency_keys command.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .async_views import APIResponse
+
+HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def get_ttl():
+    return getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 60 * 60)
+
+
+def get_claim_seconds():
+    return getattr(settings, "IDEMPOTENCY_CLAIM_SECONDS", 60)
+
+
+def idempotent(scope):
+    """
+    Honor the Idempotency-Key header on an APIView handler method.
+
+    Only responses below 500 are stored; after a server error (or an
+    exception) the key is released so the client can retry. Reusing a key
+    with a different request body is rejected with 422, and a repeat that
+    arrives while the first request is still running gets 409. A claim
+    left unfinished for IDEMPOTENCY_CLAIM_SECONDS (its worker was killed)
+    is dropped, and the next repeat runs the view again.
+
+    Apply it outside @transaction.atomic, so the key is claimed before and
+    the response stored after the view's transaction. Async handlers (see
+    core.async_views) are supported too.
+    """
+
+    def decorator(method):
+        if iscoroutinefunction(method):
+            return _async_wrapper(scope, method)
+
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key:
+                return method(self, request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return _error(
+                    f"{HEADER} must be at most {MAX_KEY_LENGTH} characters.",
+                    status.HTTP_400_BAD_REQUEST,
+                )
+
+            request_hash = fingerprint(request, kwargs)
+            cache_key = _cache_key(scope, request.user.pk, key)
+
+            stored = cache.get(cache_key)
+            if stored is None:
+                claimed, stored = _claim(scope, request.user, key, request_hash)
+                if claimed:
+                    return _run(method, self, request, args, kwargs, claimed, cache_key)
+
+            return _replay(stored, request_hash)
+
+        return wrapper
+
+    return decorator
+
+
+def _async_wrapper(scope, method):
+    """idempotent() for an async handler (see core.async_views)"""
+
+    @wraps(method)
+    async def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return await method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(
+                f"{HEADER} must be at most {MAX_KEY_LENGTH} characters.",
+                status.HTTP_400_BAD_REQUEST,
+                APIResponse,
+            )
+
+        request_hash = fingerprint(request, kwargs)
+        cache_key = _cache_key(scope, request.user.pk, key)
+
+        stored = await cache.aget(cache_key)
+        if stored is None:
+            claimed, stored = await sync_to_async(_claim)(
+                scope, request.user, key, request_hash
+            )
+            if claimed:
+                return await _arun(method, self, request, args, kwargs, claimed, cache_key)
+
+        return _replay(stored, request_hash, APIResponse)
+
+    return wrapper
+
+
+def fingerprint(request, view_kwargs=None):
+    """SHA-256 of the request path arguments and parsed body"""
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    raw = json.dumps([view_kwargs or {}, data], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _claim(scope, user, key, request_hash):
+    """
+    Insert the key as in progress.
+
+    Returns:
+        tuple: (row, None) when this request claimed the key, otherwise
+        (None, stored) with the existing entry as a dict
+    """
+    from .models import IdempotencyKey
+
+    now = timezone.now()
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                row = IdempotencyKey.objects.create(
+                    user=user,
+                    scope=scope,
+                    key=key,
+                    request_hash=request_hash,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=get_ttl()),
+                )
+            return row, None
+        except IntegrityError:
+            existing = IdempotencyKey.objects.filter(
+                user=user, scope=scope, key=key
+            ).first()
+            if existing is None:
+                continue
+            if existing.expires_at <= now or _is_abandoned(existing, now):
+                # Only delete the row as it was read, not a newer claim
+                IdempotencyKey.objects.filter(
+                    pk=existing.pk,
+                    status_code=existing.status_code,
+                    created_at=existing.created_at,
+                ).delete()
+                continue
+            return None, _as_dict(existing)
+
+    return None, {"request_hash": request_hash, "status_code": None}
+
+
+def _is_abandoned(row, now):
+    """
+    An in-progress claim older than IDEMPOTENCY_CLAIM_SECONDS: its request
+    died (worker timeout, crash, deploy) before it could store a response
+    or release the key.
+    """
+    return row.status_code is None and row.created_at <= now - timedelta(
+        seconds=get_claim_seconds()
+    )
+
+
+def _run(method, view, request, args, kwargs, row, cache_key):
+    try:
+        response = method(view, request, *args, **kwargs)
+    except Exception:
+        row.delete()
+        raise
+
+    if response.status_code >= 500 or not hasattr(response, "data"):
+        row.delete()
+        return response
+
+    row.status_code = response.status_code
+    row.response = response.data
+    row.save(update_fields=["status_code", "response"])
+    cache.set(cache_key, _as_dict(row), get_ttl())
+    return response
+
+
+async def _arun(method, view, request, args, kwargs, row, cache_key):
+    try:
+        response = await method(view, request, *args, **kwargs)
+    except Exception:
+        await row.adelete()
+        raise
+
+    if response.status_code >= 500 or not hasattr(response, "data"):
+        await row.adelete()
+        return response
+
+    row.status_code = response.status_code
+    row.response = response.data
+    await row.asave(update_fields=["status_code", "response"])
+    await cache.aset(cache_key, _as_dict(row), get_ttl())
+    return response
+
+
+def _replay(stored, request_hash, response_class=Response):
+    """The response for a key that was already claimed"""
+    if stored["request_hash"] != request_hash:
+        return _error(
+            f"This {HEADER} was already used for a different request.",
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            response_class,
+        )
+    if stored["status_code"] is None:
+        return _error(
+            "A request with this key is still being processed.",
+            status.HTTP_409_CONFLICT,
+            response_class,
+        )
+
+    response = response_class(stored["response"], status=stored["status_code"])
+    response[REPLAY_HEADER] = "true"
+    return response
+
+
+def _as_dict(row):
+    return {
+        "request_hash": row.request_hash,
+        "status_code": row.status_code,
+        "response": row.response,
+    }
+
+
+def _cache_key(scope, user_id, key):
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"idempotency:{scope}:{user_id}:{digest}"
+
+
+def _error(message, status_code, response_class=Response):
+    return response_class({"success": False, "message": message}, status=status_code)
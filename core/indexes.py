@@ -0,0 +1,256 @@
+"""
+Index audit: EXPLAIN the application's hot queries and flag the ones that
+scan tables or sort without an index, plus indexes made redundant by
+another index on the same leading columns.
+
+HOT_QUERIES lists representative querysets. Each entry is a function taking
+a Sample of existing ids, so the plans reflect real data distribution.
+Register new hot paths with @hot_query.
+"""
+
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.db import connections
+
+HOT_QUERIES = {}
+
+
+def hot_query(name):
+    def register(func):
+        HOT_QUERIES[name] = func
+        return func
+
+    return register
+
+
+@dataclass
+class Sample:
+    company_id: int
+    order_id: int
+    user_id: int
+    product_name: str
+    item_no: str
+
+    @classmethod
+    def load(cls):
+        Product = apps.get_model("product_app", "Product")
+        ProductOrder = apps.get_model("order_app", "ProductOrder")
+
+        product = Product.objects.exclude(item_no="").order_by("pk").first()
+        line = ProductOrder.objects.select_related("order").order_by("pk").first()
+        return cls(
+            company_id=product.company_id if product else 1,
+            order_id=line.order_id if line else 1,
+            user_id=line.order.creator_id if line else 1,
+            product_name=product.name if product else "Sample",
+            item_no=product.item_no if product else "00001",
+        )
+
+
+@hot_query("product_name_lookup")
+def _product_name_lookup(sample):
+    Product = apps.get_model("product_app", "Product")
+    # exists() drops the default ordering
+    return (
+        Product.objects.named(sample.company_id, sample.product_name)
+        .order_by()
+        .values("pk")[:1]
+    )
+
+
+@hot_query("product_item_no_lookup")
+def _product_item_no_lookup(sample):
+    Product = apps.get_model("product_app", "Product")
+    return (
+        Product.objects.filter(company_id=sample.company_id, item_no=sample.item_no)
+        .order_by()
+        .values("pk")[:1]
+    )
+
+
+@hot_query("active_catalog")
+def _active_catalog(sample):
+    Product = apps.get_model("product_app", "Product")
+    return Product.objects.catalog(sample.company_id).values(
+        *Product.objects.CATALOG_FIELDS
+    )
+
+
+@hot_query("company_product_table")
+def _company_product_table(sample):
+    Product = apps.get_model("product_app", "Product")
+    return (
+        Product.objects.filter(company_id=sample.company_id)
+        .order_by("item_no", "name")
+        .values("id", "name", "item_no", "item_type", "active")[:51]
+    )
+
+
+@hot_query("company_product_counts")
+def _company_product_counts(sample):
+    from django.db.models import Count, Q
+
+    Product = apps.get_model("product_app", "Product")
+    return Product.objects.filter(company_id=sample.company_id).values(
+        "company"
+    ).annotate(total=Count("id"), active=Count("id", filter=Q(active=True)))
+
+
+@hot_query("order_list_page")
+def _order_list_page(sample):
+    Order = apps.get_model("order_app", "Order")
+    return Order.objects.order_by("-date").values("id", "date", "creator")[:20]
+
+
+@hot_query("order_line_items")
+def _order_line_items(sample):
+    ProductOrder = apps.get_model("order_app", "ProductOrder")
+    return ProductOrder.objects.filter(order_id__in=[sample.order_id]).values(
+        "id", "product", "quantity"
+    )
+
+
+@hot_query("order_company_line_items")
+def _order_company_line_items(sample):
+    # The EXISTS that keeps Company.order_count current on line item writes
+    ProductOrder = apps.get_model("order_app", "ProductOrder")
+    return (
+        ProductOrder.objects.filter(
+            order_id=sample.order_id, product__company_id=sample.company_id
+        )
+        .order_by()
+        .values("pk")[:1]
+    )
+
+
+@hot_query("email_draft_lookup")
+def _email_draft_lookup(sample):
+    EmailDraft = apps.get_model("order_app", "EmailDraft")
+    return EmailDraft.objects.filter(
+        order_id=sample.order_id, user_id=sample.user_id
+    ).order_by()[:1]
+
+
+@hot_query("audit_events_for_entity")
+def _audit_events_for_entity(sample):
+    AuditEvent = apps.get_model("core", "AuditEvent")
+    return AuditEvent.objects.filter(
+        entity_type="product", entity_id=sample.company_id
+    ).order_by("-created_at")[:50]
+
+
+def explain(queryset):
+    """
+    Return the query plan as a list of detail strings.
+
+    SQLite plans come from EXPLAIN QUERY PLAN; other backends fall back to
+    QuerySet.explain() split into lines.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "sqlite":
+        return queryset.explain().splitlines()
+
+    sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(plan):
+    """Plan lines that read a whole table or sort without an index"""
+    problems = []
+    for line in plan:
+        upper = line.upper()
+        if upper.startswith("SCAN") and "USING" not in upper:
+            problems.append(line)
+        elif "TEMP B-TREE" in upper:
+            problems.append(line)
+        elif "SEQ SCAN" in upper:
+            problems.append(line)
+    return problems
+
+
+def audit_queries(names=None, sample=None):
+    """
+    EXPLAIN the selected hot queries (all by default).
+
+    Returns:
+        list: {"name", "plan", "problems"} per query
+    """
+    sample = sample or Sample.load()
+    results = []
+    for name in names or HOT_QUERIES:
+        plan = explain(HOT_QUERIES[name](sample))
+        results.append({"name": name, "plan": plan, "problems": plan_problems(plan)})
+    return results
+
+
+def redundant_indexes(app_labels=None, using="default"):
+    """
+    Find indexes (of the project's apps, or of `app_labels`) whose columns duplicate, or are a leading prefix of, another
+    index on the same table. Unique and partial indexes are never reported
+    as redundant, since they enforce or narrow something the other does not.
+
+    Returns:
+        list: {"table", "index", "columns", "covered_by", "exact"}
+    """
+    connection = connections[using]
+    tables = {
+        model._meta.db_table
+        for model in apps.get_models()
+        if (app_labels is None and not model.__module__.startswith("django."))
+        or (app_labels is not None and model._meta.app_label in app_labels)
+    }
+
+    found = []
+    with connection.cursor() as cursor:
+        existing = set(connection.introspection.table_names(cursor))
+        for table in sorted(tables & existing):
+            constraints = connection.introspection.get_constraints(cursor, table)
+            indexes = {
+                name: info
+                for name, info in constraints.items()
+                if (info["index"] or info["unique"])
+                and not info["primary_key"]
+                and info["columns"]
+                and None not in info["columns"]
+            }
+            for name, info in indexes.items():
+                if info["unique"] or _is_partial(connection, cursor, name):
+                    continue
+                columns = info["columns"]
+                for other, other_info in indexes.items():
+                    if other == name or _is_partial(connection, cursor, other):
+                        continue
+                    other_columns = other_info["columns"]
+                    exact = other_columns == columns and (
+                        other_info["unique"] or other < name
+                    )
+                    prefix = (
+                        len(other_columns) > len(columns)
+                        and other_columns[: len(columns)] == columns
+                    )
+                    if exact or prefix:
+                        found.append(
+                            {
+                                "table": table,
+                                "index": name,
+                                "columns": columns,
+                                "covered_by": other,
+                                "exact": exact,
+                            }
+                        )
+                        break
+    return found
+
+
+def _is_partial(connection, cursor, index_name):
+    if connection.vendor != "sqlite":
+        return False
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = %s",
+        [index_name],
+    )
+    row = cursor.fetchone()
+    return bool(row and row[0] and " WHERE " in row[0].upper())
@@ -0,0 +1,121 @@
+"""
+Async email sending for the async views (see api.async_views).
+
+Sending awaits an async backend instead of holding a worker for the whole
+SMTP conversation. ASYNC_EMAIL_BACKEND picks the backend:
+
+- core.mail.ThreadedEmailBackend (default) hands the messages to the
+  regular EMAIL_BACKEND on a worker thread, so the console, locmem and smtp
+  backends all keep working.
+- core.mail.AsyncSMTPBackend talks SMTP on the event loop with aiosmtplib
+  (optional dependency), using the same EMAIL_* settings as Django's smtp
+  backend.
+"""
+
+from email.utils import parseaddr
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import get_connection
+from django.utils.module_loading import import_string
+
+try:
+    import aiosmtplib
+except ImportError:  # pragma: no cover - aiosmtplib is optional
+    aiosmtplib = None
+
+DEFAULT_BACKEND = "core.mail.ThreadedEmailBackend"
+
+
+class BaseAsyncEmailBackend:
+    """Async counterpart of django.core.mail.backends.base.BaseEmailBackend"""
+
+    def __init__(self, fail_silently=False, **kwargs):
+        self.fail_silently = fail_silently
+
+    async def send_messages(self, email_messages):
+        """Send EmailMessage objects and return how many were sent"""
+        raise NotImplementedError
+
+
+class ThreadedEmailBackend(BaseAsyncEmailBackend):
+    """Run the configured sync EMAIL_BACKEND on a worker thread"""
+
+    async def send_messages(self, email_messages):
+        connection = get_connection(fail_silently=self.fail_silently)
+        # Not thread sensitive: sends don't touch the ORM, so they need not
+        # queue behind the request's database work or each other
+        return await sync_to_async(connection.send_messages, thread_sensitive=False)(
+            email_messages
+        )
+
+
+class AsyncSMTPBackend(BaseAsyncEmailBackend):
+    """Send over SMTP with aiosmtplib, one connection per batch of messages"""
+
+    def __init__(
+        self,
+        host=None,
+        port=None,
+        username=None,
+        password=None,
+        use_tls=None,
+        use_ssl=None,
+        timeout=None,
+        fail_silently=False,
+        **kwargs,
+    ):
+        if aiosmtplib is None:
+            raise ImproperlyConfigured("AsyncSMTPBackend requires the aiosmtplib package.")
+        super().__init__(fail_silently=fail_silently)
+        self.host = host or settings.EMAIL_HOST
+        self.port = port or settings.EMAIL_PORT
+        self.username = settings.EMAIL_HOST_USER if username is None else username
+        self.password = settings.EMAIL_HOST_PASSWORD if password is None else password
+        self.use_tls = settings.EMAIL_USE_TLS if use_tls is None else use_tls
+        self.use_ssl = settings.EMAIL_USE_SSL if use_ssl is None else use_ssl
+        self.timeout = settings.EMAIL_TIMEOUT if timeout is None else timeout
+
+    async def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+
+        client = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            username=self.username or None,
+            password=self.password or None,
+            use_tls=self.use_ssl,
+            start_tls=self.use_tls,
+            timeout=self.timeout,
+        )
+        sent = 0
+        try:
+            async with client:
+                for message in email_messages:
+                    recipients = message.recipients()
+                    if not recipients:
+                        continue
+                    await client.send_message(
+                        message.message(),
+                        sender=parseaddr(message.from_email)[1],
+                        recipients=recipients,
+                    )
+                    sent += 1
+        except (aiosmtplib.SMTPException, OSError):
+            if not self.fail_silently:
+                raise
+        return sent
+
+
+def get_async_connection(backend=None, fail_silently=False, **kwargs):
+    """Instantiate ASYNC_EMAIL_BACKEND (or `backend`)"""
+    path = backend or getattr(settings, "ASYNC_EMAIL_BACKEND", DEFAULT_BACKEND)
+    return import_string(path)(fail_silently=fail_silently, **kwargs)
+
+
+async def asend_messages(email_messages, fail_silently=False):
+    """Send EmailMessage objects through the async backend"""
+    connection = get_async_connection(fail_silently=fail_silently)
+    return await connection.send_messages(email_messages)
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core import indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN QUERY PLAN over the hot queries and reports table scans, "
+        "unindexed sorts and redundant indexes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "queries",
+            nargs="*",
+            help=f"Queries to explain (default: all). Available: {', '.join(indexes.HOT_QUERIES)}",
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Print the full plan of every query, not only problems",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Refresh planner statistics (ANALYZE) before explaining",
+        )
+        parser.add_argument(
+            "--fail-on-problems",
+            action="store_true",
+            help="Exit with status 1 when any problem is found",
+        )
+
+    def handle(self, *args, **options):
+        unknown = [q for q in options["queries"] if q not in indexes.HOT_QUERIES]
+        if unknown:
+            raise CommandError(f"Unknown query(s): {', '.join(unknown)}")
+
+        if options["analyze"]:
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        problems = 0
+        for result in indexes.audit_queries(options["queries"] or None):
+            if result["problems"]:
+                problems += 1
+                self.stdout.write(self.style.WARNING(f"{result['name']}:"))
+                for line in result["problems"]:
+                    self.stdout.write(f"  {line}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{result['name']}: ok"))
+
+            if options["verbose_plans"]:
+                for line in result["plan"]:
+                    self.stdout.write(f"    | {line}")
+
+        for entry in indexes.redundant_indexes():
+            problems += 1
+            kind = "duplicates" if entry["exact"] else "is a prefix of"
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{entry['table']}.{entry['index']} ({', '.join(entry['columns'])}) "
+                    f"{kind} {entry['covered_by']}"
+                )
+            )
+
+        if problems and options["fail_on_problems"]:
+            raise CommandError(f"{problems} problem(s) found")
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import IdempotencyKey
+from core.purge import delete_in_batches
+
+
+class Command(BaseCommand):
+    help = "Deletes expired Idempotency-Key records in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per statement (keeps write locks short)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many keys have expired",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = IdempotencyKey.objects.filter(expires_at__lte=now)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{expired.count()} expired idempotency key(s)")
+            return
+
+        deleted = delete_in_batches(expired, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency key(s)"))
@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import LiveEvent
+from core.purge import delete_in_batches
+
+
+class Command(BaseCommand):
+    help = "Deletes live stream events past their retention in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per statement (keeps write locks short)",
+        )
+        parser.add_argument(
+            "--retention-hours",
+            type=int,
+            default=getattr(settings, "EVENT_STREAM_RETENTION_HOURS", 24),
+            help="Keep events this long, for clients resuming with Last-Event-ID",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many events would be deleted",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=max(options["retention_hours"], 0))
+        expired = LiveEvent.objects.filter(created_at__lte=cutoff)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{expired.count()} purgeable live event(s)")
+            return
+
+        deleted = delete_in_batches(expired, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} live event(s)"))
@@ -0,0 +1,125 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .routers import replica_alias, routing_scope
+from .timezones import (
+    DEFAULT_TIMEZONE,
+    TIMEZONE_SESSION_KEY,
+    activate_user_timezone,
+    deactivate_user_timezone,
+    remember_timezone,
+)
+
+PIN_COOKIE = "db_primary"
+
+
+class UserTimezoneMiddleware:
+    """
+    Activate the authenticated user's timezone for the whole request, so
+    templates and the timezone helpers resolve it once instead of per value.
+
+    The zone name is read from the session (stored at login); the user's
+    timezone column is only loaded for sessions that predate that.
+
+    Runs natively under ASGI as well, so async views are not pushed onto
+    the sync thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            name = request.session.get(TIMEZONE_SESSION_KEY)
+            if name is None:
+                name = remember_timezone(request.session, user.load_fields("timezone"))
+            activate_user_timezone(user, name)
+        else:
+            deactivate_user_timezone()
+
+        try:
+            return self.get_response(request)
+        finally:
+            deactivate_user_timezone()
+
+    async def __acall__(self, request):
+        if hasattr(request, "auser"):
+            # request.user would load the user again, synchronously
+            request.user = user = await request.auser()
+            if user.is_authenticated:
+                name = await request.session.aget(TIMEZONE_SESSION_KEY)
+                if name is None:
+                    name = (await user.aload_fields("timezone")).timezone or DEFAULT_TIMEZONE
+                    await request.session.aset(TIMEZONE_SESSION_KEY, name)
+                activate_user_timezone(user, name)
+            else:
+                deactivate_user_timezone()
+
+        try:
+            return await self.get_response(request)
+        finally:
+            deactivate_user_timezone()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Open a database routing scope per request (see core.routers).
+
+    Views marked with replica_reads read from the replica until they write.
+    A request that wrote sets a short-lived cookie so the same client's
+    next requests read from the primary while the replica catches up.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with routing_scope(pinned=PIN_COOKIE in request.COOKIES) as state:
+            request.db_routing = state
+            response = self.get_response(request)
+        return self._pin(response, state)
+
+    async def __acall__(self, request):
+        # The scope is a context variable; sync_to_async copies it into the
+        # thread that runs the queries
+        with routing_scope(pinned=PIN_COOKIE in request.COOKIES) as state:
+            request.db_routing = state
+            response = await self.get_response(request)
+        return self._pin(response, state)
+
+    def _pin(self, response, state):
+        if state["wrote"] and replica_alias():
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=getattr(settings, "REPLICA_PIN_SECONDS", 5),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        if getattr(view_func, "replica_reads", False) or getattr(
+            view_class, "replica_reads", False
+        ):
+            request.db_routing["replica"] = True
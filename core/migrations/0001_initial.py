@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:24
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("event_type", models.CharField(max_length=50)),
+                ("entity_type", models.CharField(max_length=50)),
+                ("entity_id", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("message", models.TextField(blank=True)),
+                ("data", models.JSONField(blank=True, default=dict)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "ordering": ["-created_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["entity_type", "entity_id", "created_at"],
+                        name="core_audite_entity__2e1839_idx",
+                    ),
+                    models.Index(
+                        fields=["created_at"], name="core_audite_created_9a257b_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
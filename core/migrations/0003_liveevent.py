@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+# The live event types that used to be written to the audit trail
+LIVE_EVENT_TYPES = ["order.created", "order.updated", "order.deleted", "catalog.changed"]
+
+
+def delete_live_audit_events(apps, schema_editor):
+    AuditEvent = apps.get_model("core", "AuditEvent")
+    AuditEvent.objects.filter(event_type__in=LIVE_EVENT_TYPES).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_idempotencykey"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LiveEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("event_type", models.CharField(max_length=50)),
+                ("entity_id", models.PositiveBigIntegerField()),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["created_at"], name="core_liveev_created_2d6ae9_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(delete_live_audit_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class AuditEvent(models.Model):
+    """
+    An audit trail entry for a create/delete/status change of an entity.
+
+    Written by core.audit, in batches on commit inside a transaction; see
+    core.audit.record().
+    """
+
+    event_type = models.CharField(max_length=50)
+    entity_type = models.CharField(max_length=50)
+    entity_id = models.PositiveBigIntegerField(null=True, blank=True)
+    message = models.TextField(blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["entity_type", "entity_id", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} #{self.entity_id} at {self.created_at:%Y-%m-%d %H:%M:%S}"
+
+
+class LiveEvent(models.Model):
+    """
+    An event for the live order list streams, kept apart from the audit
+    trail: streams read rows newer than the last id they sent.
+
+    Written by core.events.publish(); rows older than
+    EVENT_STREAM_RETENTION_HOURS are removed by the purge_live_events
+    command.
+    """
+
+    event_type = models.CharField(max_length=50)
+    entity_id = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} #{self.entity_id}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client-supplied Idempotency-Key and the response it produced.
+
+    Managed by core.idempotency; rows past expires_at are removed by the
+    purge_idempotency_keys command.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        db_index=False,
+    )
+    scope = models.CharField(max_length=50)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    # Empty while the first request is still being processed
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "scope", "key"], name="idempotency_key_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["expires_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key}"
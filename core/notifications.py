@@ -0,0 +1,27 @@
+"""
+Notification dispatch with per-transaction de-duplication.
+
+notify() sends a notification (usually an email) when the current
+transaction commits, once per dedup key: when a view and a signal
+receiver both report the same event, or a model is saved twice, one
+notification goes out. Keys name the logical event, e.g.
+("password_changed", user.pk).
+
+Nothing is sent for a rolled-back transaction, and the SMTP round trip
+happens after the database work is committed rather than inside it.
+Outside a transaction the notification is sent right away.
+"""
+
+from .transactions import on_commit_once
+
+
+def notify(key, send, *args, using=None, **kwargs):
+    """
+    Call send(*args, **kwargs) when the transaction commits, once per `key`.
+
+    Returns:
+        bool: False when a notification with this key was already queued
+    """
+    return on_commit_once(
+        ("notification", key), lambda: send(*args, **kwargs), using=using
+    )
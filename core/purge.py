@@ -0,0 +1,27 @@
+"""
+Batched deletes for the purge_* management commands.
+"""
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Delete the rows of `queryset`, at most `batch_size` per statement.
+
+    Batches walk the primary key forward from the last one deleted, so no
+    batch rescans rows an earlier one passed. Outside a transaction each
+    batch commits on its own, which keeps write locks short.
+
+    Returns:
+        int: number of rows deleted
+    """
+    model = queryset.model
+    batch_size = max(batch_size, 1)
+    deleted = 0
+    last_pk = None
+    while True:
+        remaining = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(remaining.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return deleted
+        last_pk = batch[-1]
+        deleted += model._base_manager.filter(pk__in=batch).delete()[0]
@@ -0,0 +1,224 @@
+"""
+Rate limits for the auth views and the API.
+
+Limits are configured per scope in RATELIMITS, one rate per key kind:
+
+    "login": {"ip": "30/5m", "account": "10/15m"}
+
+A rate "N/period" is a token bucket of N tokens that refills at N per
+period: bursts of up to N requests, N per period on average. Kinds are
+"ip" (the client address), "account" (the username or email the request
+names) and "user" (the authenticated user).
+
+The cache API has no atomic read-modify-write, so a bucket is not stored
+as (level, timestamp). Instead each bucket is one counter of the tokens
+ever taken, in thousandths of a token, against a refill that grows with
+the clock: refill(t) = t * N / period. The bucket holds N minus
+(counter - refill) tokens. Taking a token is one atomic cache.incr; a
+rejected request gives it back with cache.decr. A bucket idle for longer
+than it takes to fill is topped up to full by raising the counter to the
+refill; concurrent top-ups can only take extra tokens, never grant them.
+The key expires once the bucket would be full again.
+
+incr is only atomic across processes with Redis (or memcached). The
+core.W001 system check warns when the cache is shared but not atomic
+(see core.checks); prod uses Redis when REDIS_URL is set.
+
+Checks run before the view does any password hashing, queries or email.
+"""
+
+import hashlib
+import math
+import re
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.shortcuts import render
+from rest_framework.throttling import BaseThrottle
+
+RATE_RE = re.compile(r"^(\d+)/(\d*)([smhd])$")
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+KEY = "ratelimit:{scope}:{kind}:{ident}"
+
+# Bucket counters are kept in thousandths of a token
+TOKEN = 1000
+
+
+def is_enabled():
+    return getattr(settings, "RATELIMIT_ENABLED", True)
+
+
+def get_rates(scope):
+    return getattr(settings, "RATELIMITS", {}).get(scope, {})
+
+
+def parse_rate(rate):
+    """
+    "5/m" or "10/15m" -> (requests, period in seconds)
+    """
+    match = RATE_RE.match(rate.replace(" ", ""))
+    if not match:
+        raise ValueError(f"Invalid rate {rate!r}, expected e.g. '5/m' or '10/15m'.")
+    limit, count, unit = match.groups()
+    return int(limit), int(count or 1) * PERIODS[unit]
+
+
+def get_client_ip(request):
+    """
+    The client address. X-Forwarded-For is only trusted with
+    RATELIMIT_TRUST_X_FORWARDED_FOR, and then its last entry is used: that
+    is the one the proxy in front of us appended, the others are whatever
+    the client sent.
+    """
+    if getattr(settings, "RATELIMIT_TRUST_X_FORWARDED_FOR", False):
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _ident(value):
+    # Hashed so any username or address makes a valid, short cache key
+    return hashlib.sha256(str(value).strip().lower().encode()).hexdigest()[:32]
+
+
+def take(scope, kind, value, rate):
+    """
+    Take a token from the bucket for (scope, kind, value).
+
+    Returns:
+        tuple: (retry_after, key) where retry_after is 0 when the request
+        got a token, else the seconds until one is available, and key is
+        the bucket to give the token back to with refund() (None when no
+        token was taken)
+    """
+    limit, period = parse_rate(rate)
+    refill = int(time.time() * limit * TOKEN / period)
+    capacity = limit * TOKEN
+    key = KEY.format(scope=scope, kind=kind, ident=_ident(value))
+
+    # A new bucket starts full
+    cache.add(key, refill, timeout=period)
+    try:
+        taken = cache.incr(key, TOKEN)
+    except ValueError:
+        # Evicted between add() and incr()
+        taken = refill + TOKEN
+        cache.set(key, taken, timeout=period)
+
+    if taken < refill + TOKEN:
+        # Idle for long enough to be over full; top it up to full first
+        taken = cache.incr(key, refill + TOKEN - taken)
+    # Kept until the bucket would be full again
+    cache.touch(key, period)
+
+    if taken - refill <= capacity:
+        return 0, key
+
+    refund(key)
+    return _retry_after(taken - refill - capacity, limit, period), None
+
+
+def refund(key):
+    """Give back a token taken by take()"""
+    try:
+        cache.decr(key, TOKEN)
+    except ValueError:
+        # Expired since; the bucket is full anyway
+        pass
+
+
+def _retry_after(missing, limit, period):
+    """Seconds until `missing` thousandths of a token have refilled"""
+    return max(1, math.ceil(missing * period / (limit * TOKEN)))
+
+
+def check(scope, request, account=None):
+    """
+    Count the request against each limit configured for `scope`: "ip" by
+    client address, "account" by `account` (skipped when empty) and "user"
+    by the authenticated user. When one limit rejects the request, the
+    counts already taken from the others are given back.
+
+    Returns:
+        int: 0 when the request may go ahead, else the Retry-After seconds
+    """
+    if not is_enabled():
+        return 0
+
+    taken = []
+    for kind, rate in get_rates(scope).items():
+        if kind == "ip":
+            value = get_client_ip(request)
+        elif kind == "account":
+            value = account
+        elif kind == "user":
+            user = getattr(request, "user", None)
+            value = user.pk if user is not None and user.is_authenticated else None
+        else:
+            raise ValueError(f"Unknown rate limit kind {kind!r} for {scope!r}.")
+
+        if not value:
+            continue
+        retry_after, key = take(scope, kind, value, rate)
+        if retry_after:
+            for counted in taken:
+                refund(counted)
+            return retry_after
+        taken.append(key)
+    return 0
+
+
+async def acheck(scope, request, account=None):
+    """Async version of check()"""
+    return await sync_to_async(check)(scope, request, account)
+
+
+def ratelimit(scope, template, account_field=None):
+    """
+    Rate limit POSTs to a form view. A rejected request gets `template`
+    rendered again with an error message and status 429.
+
+    `account_field` names the POST field (username or email) to key the
+    "account" limit by.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method == "POST":
+                account = request.POST.get(account_field) if account_field else None
+                retry_after = check(scope, request, account)
+                if retry_after:
+                    messages.error(
+                        request,
+                        f"Too many attempts. Please try again in {retry_after} seconds.",
+                    )
+                    response = render(request, template, status=429)
+                    response["Retry-After"] = str(retry_after)
+                    return response
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class RateLimitThrottle(BaseThrottle):
+    """
+    DRF throttle for the views that set `throttle_scope`; the limits are
+    RATELIMITS[throttle_scope].
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        self.retry_after = check(scope, request) if scope else 0
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
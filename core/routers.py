@@ -0,0 +1,103 @@
+"""
+Primary/replica database routing.
+
+Reads go to the primary ("default") unless the current request opted in to
+replica reads (see core.decorators.replica_reads and the replica_reads view
+attribute), and then only until the request writes: after any write, reads
+are pinned to the primary for the rest of the request so it always sees its
+own changes. The ReplicaRoutingMiddleware also pins the client's next few
+requests via a short-lived cookie, covering the replica's replication lag.
+
+When settings.REPLICA_DB_ALIAS is not in DATABASES every read goes to the
+primary, so the router is a no-op without a replica configured.
+"""
+
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_routing = ContextVar("db_routing", default=None)
+
+_query_counts = Counter()
+_query_counts_lock = threading.Lock()
+
+
+def replica_alias():
+    """Return the configured replica alias, or None when there is none"""
+    alias = getattr(settings, "REPLICA_DB_ALIAS", "replica")
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def routing_scope(use_replica=False, pinned=False):
+    """
+    Route reads inside the block; nested scopes start from the outer one's
+    pin so a write is never "forgotten".
+    """
+    outer = _routing.get()
+    state = {
+        "replica": use_replica,
+        "pinned": pinned or bool(outer and outer["pinned"]),
+        "wrote": False,
+    }
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+        if outer is not None and state["wrote"]:
+            outer["pinned"] = outer["wrote"] = True
+
+
+def read_from_replica():
+    """Context manager sending reads in the block to the replica"""
+    return routing_scope(use_replica=True)
+
+
+def pin_to_primary():
+    """Mark the current scope as having written; later reads use the primary"""
+    state = _routing.get()
+    if state is not None:
+        state["pinned"] = state["wrote"] = True
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not state["replica"] or state["pinned"]:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Reads inside a transaction must see its uncommitted writes
+            return DEFAULT_DB_ALIAS
+        return replica_alias() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def count_query(alias):
+    with _query_counts_lock:
+        _query_counts[alias] += 1
+
+
+def query_counts():
+    """Return {alias: queries executed} for this process"""
+    with _query_counts_lock:
+        return dict(_query_counts)
+
+
+def reset_query_counts():
+    with _query_counts_lock:
+        _query_counts.clear()
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by FieldTrackerMixin.bulk_update_tracked() with `changes`: a list of
+# (instance, {field_name: (old_value, new_value)}) for instances whose tracked
+# fields changed. bulk_update() itself sends no pre_save/post_save signals.
+tracked_fields_changed = Signal()
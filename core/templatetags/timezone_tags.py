@@ -1,13 +1,28 @@
 from django import template
 from django.utils import timezone
 from django.utils.dateformat import format as date_format
-import pytz
+from core.timezones import (
+    format_datetimes,
+    get_timezone_name,
+    get_user_timezone,
+    to_timezone,
+)
 
 register = template.Library()
 
 
+def _resolve_timezone(user):
+    """
+    Zone for `user`, or the zone activated by UserTimezoneMiddleware when
+    no user is given. Zone objects are memoized by name.
+    """
+    if user is None:
+        return timezone.get_current_timezone()
+    return get_user_timezone(user)
+
+
 @register.filter
-def user_timezone(value, user):
+def user_timezone(value, user=None):
     """
     Convert datetime to user's timezone.
 
@@ -16,20 +31,8 @@ def user_timezone(value, user):
     if not value:
         return value
 
-    # Get user's timezone
-    user_tz_name = 'America/New_York'  # Default
-
-    if user and hasattr(user, 'timezone') and user.timezone:
-        user_tz_name = user.timezone
-
     try:
-        user_tz = pytz.timezone(user_tz_name)
-
-        # Ensure value is timezone-aware
-        if timezone.is_naive(value):
-            value = timezone.make_aware(value, timezone.get_default_timezone())
-
-        return timezone.localtime(value, user_tz)
+        return to_timezone(value, _resolve_timezone(user))
     except Exception:
         return value
 
@@ -51,7 +54,7 @@ def format_datetime(value, format_string='M d, Y H:i'):
 
 
 @register.simple_tag
-def user_datetime(value, user, format_string='M d, Y H:i'):
+def user_datetime(value, user=None, format_string='M d, Y H:i'):
     """
     Convert to user timezone and format in one step.
 
@@ -70,25 +73,19 @@ def user_datetime(value, user, format_string='M d, Y H:i'):
         return ''
 
     try:
-        # Get user's timezone
-        user_tz_name = 'America/New_York'  # Default
-
-        if user and hasattr(user, 'timezone') and user.timezone:
-            user_tz_name = user.timezone
-
-        user_tz = pytz.timezone(user_tz_name)
+        return date_format(to_timezone(value, _resolve_timezone(user)), format_string)
+    except Exception:
+        return str(value)
 
-        # Ensure value is timezone-aware
-        if timezone.is_naive(value):
-            value = timezone.make_aware(value, timezone.get_default_timezone())
 
-        # Convert to user's timezone
-        converted = timezone.localtime(value, user_tz)
+@register.filter
+def user_datetimes(values, format_string='M d, Y H:i'):
+    """
+    Format a list of datetimes in the active timezone.
 
-        # Format the datetime
-        return date_format(converted, format_string)
-    except Exception as e:
-        return str(value)
+    Usage: {% for label in dates|user_datetimes:"M d, Y g:i A" %}
+    """
+    return format_datetimes(values or [], format_string)
 
 
 @register.simple_tag
@@ -98,9 +95,7 @@ def user_timezone_name(user):
 
     Usage: {% user_timezone_name request.user %}
     """
-    if user and hasattr(user, 'timezone') and user.timezone:
-        return user.timezone
-    return 'America/New_York'
+    return get_timezone_name(user)
 
 
 @register.simple_tag
@@ -111,14 +106,7 @@ def current_time_in_user_tz(user, format_string='g:i A'):
     Usage: {% current_time_in_user_tz request.user "g:i A" %}
     """
     try:
-        user_tz_name = 'America/New_York'
-
-        if user and hasattr(user, 'timezone') and user.timezone:
-            user_tz_name = user.timezone
-
-        user_tz = pytz.timezone(user_tz_name)
-        now = timezone.localtime(timezone.now(), user_tz)
-
+        now = timezone.localtime(timezone.now(), _resolve_timezone(user))
         return date_format(now, format_string)
     except Exception:
-        return ''
\ No newline at end of file
+        return ''
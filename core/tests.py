@@ -0,0 +1,334 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from order_app.models import Order
+from user_app.models import User
+from . import events, ratelimit
+from .checks import check_ratelimit_cache
+from .models import AuditEvent, IdempotencyKey, LiveEvent
+from .purge import delete_in_batches
+from .timezones import (
+    TIMEZONE_SESSION_KEY,
+    activate_user_timezone,
+    deactivate_user_timezone,
+    get_timezone_name,
+)
+from .transactions import collect_on_commit, on_commit_once
+
+
+@override_settings(
+    RATELIMIT_ENABLED=True,
+    RATELIMITS={
+        "login": {"ip": "2/h", "account": "1/h"},
+        "order_email_send": {"user": "1/h"},
+    },
+)
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def login_request(self, username):
+        return RequestFactory().post("/login/", {"username": username})
+
+    def test_limit_rejects_with_retry_after(self):
+        self.assertEqual(ratelimit.take("login", "ip", "10.0.0.1", "2/h")[0], 0)
+        self.assertEqual(ratelimit.take("login", "ip", "10.0.0.1", "2/h")[0], 0)
+
+        retry_after, key = ratelimit.take("login", "ip", "10.0.0.1", "2/h")
+
+        self.assertGreater(retry_after, 0)
+        self.assertLessEqual(retry_after, 2 * 60 * 60)
+        self.assertIsNone(key)
+        # Other keys have their own limit
+        self.assertEqual(ratelimit.take("login", "ip", "10.0.0.2", "2/h")[0], 0)
+
+    def test_bucket_refills(self):
+        now = 1_000_000.0
+        with mock.patch("core.ratelimit.time.time", return_value=now):
+            for _ in range(2):
+                self.assertEqual(ratelimit.take("login", "ip", "10.0.0.1", "2/h")[0], 0)
+            # Empty: one token refills every 30 minutes
+            self.assertEqual(ratelimit.take("login", "ip", "10.0.0.1", "2/h")[0], 30 * 60)
+
+        with mock.patch("core.ratelimit.time.time", return_value=now + 30 * 60):
+            self.assertEqual(ratelimit.take("login", "ip", "10.0.0.1", "2/h")[0], 0)
+            self.assertGreater(ratelimit.take("login", "ip", "10.0.0.1", "2/h")[0], 0)
+
+    def test_idle_bucket_holds_at_most_its_size(self):
+        now = 1_000_000.0
+        with mock.patch("core.ratelimit.time.time", return_value=now):
+            self.assertEqual(ratelimit.take("login", "ip", "10.0.0.1", "2/h")[0], 0)
+
+        # Still cached, and idle for far longer than it takes to fill
+        with mock.patch("core.ratelimit.time.time", return_value=now + 10 * 60 * 60):
+            for _ in range(2):
+                self.assertEqual(ratelimit.take("login", "ip", "10.0.0.1", "2/h")[0], 0)
+            self.assertGreater(ratelimit.take("login", "ip", "10.0.0.1", "2/h")[0], 0)
+
+    def test_rejected_request_gives_back_earlier_counts(self):
+        self.assertEqual(ratelimit.check("login", self.login_request("a"), "a"), 0)
+        # Rejected by the account limit; its IP count is given back
+        self.assertGreater(ratelimit.check("login", self.login_request("a"), "a"), 0)
+        self.assertGreater(ratelimit.check("login", self.login_request("a"), "a"), 0)
+
+        # So the IP has room for one more account
+        self.assertEqual(ratelimit.check("login", self.login_request("b"), "b"), 0)
+        self.assertGreater(ratelimit.check("login", self.login_request("c"), "c"), 0)
+
+    def test_non_atomic_cache_is_a_warning(self):
+        filebased = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": "/tmp/ratelimit-check",
+            }
+        }
+        with self.settings(CACHES=filebased):
+            messages = check_ratelimit_cache(None)
+        self.assertEqual([message.id for message in messages], ["core.W001"])
+        self.assertFalse(messages[0].is_serious())
+
+        self.assertEqual(check_ratelimit_cache(None), [])
+
+    def test_disabled(self):
+        with self.settings(RATELIMIT_ENABLED=False):
+            for _ in range(3):
+                self.assertEqual(ratelimit.check("login", self.login_request("a"), "a"), 0)
+
+    def test_login_view_rejects_before_authenticating(self):
+        url = reverse("users:login")
+        self.client.post(url, {"username": "a", "password": "wrong"})
+
+        with self.assertNumQueries(0):
+            response = self.client.post(url, {"username": "a", "password": "wrong"})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertContains(response, "Too many attempts", status_code=429)
+
+    def test_api_throttle(self):
+        user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(user)
+        order = Order.objects.create(creator=user)
+        url = reverse("api:send_order_email")
+        headers = {"X-Requested-With": "XMLHttpRequest"}
+
+        # Missing fields: a 400, but the request still counts
+        self.assertEqual(
+            self.client.post(url, {"order_id": order.pk}, headers=headers).status_code, 400
+        )
+        response = self.client.post(url, {"order_id": order.pk}, headers=headers)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+
+class TimezoneTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.viewer = User.objects.create_user(
+            "viewer", "viewer@example.com", "password123", timezone="Europe/Berlin"
+        )
+        self.other = User.objects.create_user(
+            "other", "other@example.com", "password123", timezone="Asia/Tokyo"
+        )
+
+    def test_active_zone_is_only_used_for_the_request_user(self):
+        activate_user_timezone(self.viewer, "Europe/Berlin")
+        self.addCleanup(deactivate_user_timezone)
+
+        viewer = User.objects.defer("timezone").get(pk=self.viewer.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_timezone_name(viewer), "Europe/Berlin")
+
+        other = User.objects.defer("timezone").get(pk=self.other.pk)
+        self.assertEqual(get_timezone_name(other), "Asia/Tokyo")
+
+    def test_profile_update_refreshes_the_session_zone(self):
+        self.client.force_login(self.viewer)
+        self.assertEqual(self.client.session[TIMEZONE_SESSION_KEY], "Europe/Berlin")
+
+        self.client.post(reverse("users:update_profile"), {
+            "first_name": "",
+            "last_name": "",
+            "display_name": "",
+            "timezone": "Asia/Tokyo",
+        })
+
+        self.assertEqual(self.client.session[TIMEZONE_SESSION_KEY], "Asia/Tokyo")
+        # Cached order cards are keyed by the new zone
+        response = self.client.get(reverse("orders:order_list"))
+        self.assertEqual(response.context["timezone_name"], "Asia/Tokyo")
+
+
+class TransactionHelperTests(TransactionTestCase):
+    def setUp(self):
+        self.flushes = []
+
+    def test_flush_once_on_commit(self):
+        with transaction.atomic():
+            for item in (3, 1, 3, 2, 1):
+                collect_on_commit("test", item, self.flushes.append)
+            self.assertEqual(self.flushes, [])
+
+        self.assertEqual(self.flushes, [[3, 1, 2]])
+
+    def test_nothing_flushed_on_rollback(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                collect_on_commit("test", 1, self.flushes.append)
+                raise RuntimeError
+
+        self.assertEqual(self.flushes, [])
+
+        # The next transaction starts a fresh buffer
+        with transaction.atomic():
+            collect_on_commit("test", 2, self.flushes.append)
+        self.assertEqual(self.flushes, [[2]])
+
+    def test_rolled_back_savepoint_drops_its_flush(self):
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    collect_on_commit("test", 1, self.flushes.append)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            collect_on_commit("test", 2, self.flushes.append)
+
+        self.assertEqual(self.flushes, [[2]])
+
+    def test_rolled_back_savepoint_drops_its_items(self):
+        with transaction.atomic():
+            collect_on_commit("test", 1, self.flushes.append)
+            try:
+                with transaction.atomic():
+                    collect_on_commit("test", 2, self.flushes.append)
+                    collect_on_commit("test", 1, self.flushes.append)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            collect_on_commit("test", 3, self.flushes.append)
+
+        self.assertEqual(sorted(item for flush in self.flushes for item in flush), [1, 3])
+
+    def test_item_added_in_sibling_savepoints_is_flushed_once(self):
+        with transaction.atomic():
+            for _ in range(2):
+                with transaction.atomic():
+                    collect_on_commit("test", 1, self.flushes.append)
+            with transaction.atomic():
+                self.assertFalse(collect_on_commit("test", 1, self.flushes.append))
+
+        self.assertEqual(self.flushes, [[1]])
+
+    def test_outside_a_transaction_flushes_right_away(self):
+        self.assertTrue(collect_on_commit("test", 1, self.flushes.append))
+        self.assertTrue(collect_on_commit("test", 1, self.flushes.append))
+
+        self.assertEqual(self.flushes, [[1], [1]])
+
+    def test_on_commit_once(self):
+        calls = []
+        with transaction.atomic():
+            self.assertTrue(on_commit_once("once", lambda: calls.append("a")))
+            self.assertFalse(on_commit_once("once", lambda: calls.append("b")))
+            self.assertTrue(on_commit_once("other", lambda: calls.append("c")))
+            self.assertEqual(calls, [])
+
+        self.assertEqual(calls, ["a", "c"])
+
+
+class LiveEventTests(TestCase):
+    def test_events_are_kept_out_of_the_audit_trail(self):
+        start = events.latest_event_id()
+        with self.captureOnCommitCallbacks(execute=True):
+            events.publish(events.ORDER_CREATED, 7)
+            events.publish(events.ORDER_CREATED, 7)
+            events.publish(events.ORDER_UPDATED, 7)
+
+        self.assertEqual(
+            [row[1:] for row in events.events_queryset(start)],
+            [(events.ORDER_CREATED, 7), (events.ORDER_UPDATED, 7)],
+        )
+        self.assertFalse(AuditEvent.objects.exists())
+
+    def test_no_events_for_rolled_back_saves(self):
+        start = events.latest_event_id()
+        with self.captureOnCommitCallbacks(execute=True):
+            events.publish(events.ORDER_UPDATED, 7)
+            try:
+                with transaction.atomic():
+                    events.publish(events.ORDER_CREATED, 8)
+                    events.publish(events.CATALOG_CHANGED, 1)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(
+            [row[1:] for row in events.events_queryset(start)],
+            [(events.ORDER_UPDATED, 7)],
+        )
+
+    def test_purge(self):
+        old = LiveEvent.objects.create(
+            event_type=events.ORDER_CREATED,
+            entity_id=1,
+            created_at=timezone.now() - timedelta(hours=25),
+        )
+        new = LiveEvent.objects.create(event_type=events.ORDER_UPDATED, entity_id=1)
+
+        out = StringIO()
+        call_command("purge_live_events", "--retention-hours=24", stdout=out)
+
+        self.assertIn("Deleted 1 live event(s)", out.getvalue())
+        self.assertFalse(LiveEvent.objects.filter(pk=old.pk).exists())
+        self.assertTrue(LiveEvent.objects.filter(pk=new.pk).exists())
+
+
+class PurgeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+
+    def create_keys(self, count, expires_at):
+        return IdempotencyKey.objects.bulk_create(
+            IdempotencyKey(
+                user=self.user,
+                scope="order_create",
+                key=f"{expires_at.timestamp()}-{i}",
+                request_hash="",
+                expires_at=expires_at,
+            )
+            for i in range(count)
+        )
+
+    def test_delete_in_batches(self):
+        self.create_keys(5, timezone.now() - timedelta(hours=1))
+        kept = self.create_keys(2, timezone.now() + timedelta(hours=1))
+        expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+
+        # Three batches of SELECT and DELETE, then the empty SELECT
+        with self.assertNumQueries(7):
+            self.assertEqual(delete_in_batches(expired, 2), 5)
+
+        self.assertQuerySetEqual(
+            IdempotencyKey.objects.order_by("pk"), [key.pk for key in kept],
+            transform=lambda key: key.pk,
+        )
+
+    def test_purge_idempotency_keys(self):
+        self.create_keys(3, timezone.now() - timedelta(hours=1))
+        self.create_keys(1, timezone.now() + timedelta(hours=1))
+
+        out = StringIO()
+        call_command("purge_idempotency_keys", "--batch-size=2", stdout=out)
+
+        self.assertIn("Deleted 3 expired idempotency key(s)", out.getvalue())
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
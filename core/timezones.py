@@ -0,0 +1,120 @@
+"""
+Timezone resolution and formatting helpers.
+
+Zone objects are resolved once per name and memoized, so rendering many
+datetimes for the same user does not repeatedly look up tz data. zoneinfo is
+used when it knows the zone; pytz is the fallback for names it does not.
+"""
+
+from contextvars import ContextVar
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.utils import timezone
+from django.utils.dateformat import format as date_format
+
+try:
+    import pytz
+except ImportError:  # pragma: no cover - pytz is optional
+    pytz = None
+
+DEFAULT_TIMEZONE = "America/New_York"
+DEFAULT_FORMAT = "M d, Y H:i"
+
+# The user's zone name is kept in the session so requests can activate it
+# without loading the timezone column of the user row.
+TIMEZONE_SESSION_KEY = "_user_timezone"
+
+# Primary key of the user whose zone is active for the request
+_active_user_id = ContextVar("active_user_id", default=None)
+
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    """
+    Return the tzinfo for an IANA zone name, falling back to
+    DEFAULT_TIMEZONE for unknown names.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        pass
+
+    if pytz is not None:
+        try:
+            return pytz.timezone(name)
+        except pytz.UnknownTimeZoneError:
+            pass
+
+    if name != DEFAULT_TIMEZONE:
+        return get_zone(DEFAULT_TIMEZONE)
+    return timezone.get_default_timezone()
+
+
+def activate_user_timezone(user, name):
+    """Activate the zone `name` as the zone of `user` for the current request"""
+    timezone.activate(get_zone(name))
+    _active_user_id.set(user.pk)
+
+
+def deactivate_user_timezone():
+    timezone.deactivate()
+    _active_user_id.set(None)
+
+
+def remember_timezone(session, user):
+    """Store the user's zone name in the session, see UserTimezoneMiddleware"""
+    name = getattr(user, "timezone", None) or DEFAULT_TIMEZONE
+    session[TIMEZONE_SESSION_KEY] = name
+    return name
+
+
+def get_timezone_name(user):
+    """
+    Return the user's timezone name, or the default one.
+
+    For the request user loaded without the timezone column, the zone
+    activated by UserTimezoneMiddleware is used instead of fetching the
+    column. Other users have it loaded.
+    """
+    # Deferred columns are missing from the instance __dict__; checking it
+    # directly is much cheaper than get_deferred_fields() per rendered value.
+    if (
+        hasattr(user, "_meta")
+        and "timezone" not in user.__dict__
+        and user.pk is not None
+        and user.pk == _active_user_id.get()
+    ):
+        return timezone.get_current_timezone_name()
+    return getattr(user, "timezone", None) or DEFAULT_TIMEZONE
+
+
+def get_user_timezone(user):
+    """Return the tzinfo to display dates in for a user"""
+    return get_zone(get_timezone_name(user))
+
+
+def to_timezone(value, tz=None):
+    """
+    Convert a datetime to `tz` (the active timezone by default).
+    Naive values are assumed to be in the default timezone.
+    """
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.get_default_timezone())
+    return timezone.localtime(value, tz)
+
+
+def format_datetimes(values, format_string=DEFAULT_FORMAT, tz=None):
+    """
+    Convert and format a list of datetimes with one timezone lookup.
+
+    Empty values are rendered as "".
+
+    Returns:
+        list: formatted strings, in the order of `values`
+    """
+    tz = tz or timezone.get_current_timezone()
+    return [
+        date_format(to_timezone(value, tz), format_string) if value else ""
+        for value in values
+    ]
@@ -0,0 +1,137 @@
+"""
+Field change tracking without an extra SELECT per save.
+"""
+
+from .signals import tracked_fields_changed
+
+_UNSET = object()
+
+
+class FieldTrackerMixin:
+    """
+    Model mixin that remembers the database values of `tracked_fields`.
+
+    Values are snapshotted when an instance is loaded (from_db), refreshed
+    after every save, so pre_save/post_save receivers can compare against
+    the stored values instead of re-fetching the row. The snapshot is reset
+    only after save() returns, so post_save receivers still see the old
+    values.
+
+    Usage:
+        class Product(FieldTrackerMixin, models.Model):
+            tracked_fields = ("active",)
+
+        if instance.has_changed("active"):
+            ...
+
+    Receivers of pre_save/post_save use has_saved_change(name,
+    update_fields) instead, so a save() that leaves the field out of
+    update_fields is not taken for a change.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _tracked_attnames(self, names=None):
+        names = self.tracked_fields if names is None else names
+        return {
+            name: self._meta.get_field(name).attname
+            for name in self.tracked_fields
+            if name in names or self._meta.get_field(name).attname in names
+        }
+
+    def _snapshot_tracked_fields(self, names=None):
+        originals = self.__dict__.setdefault("_tracked_originals", {})
+        for name, attname in self._tracked_attnames(names).items():
+            # Deferred fields are left out and looked up on demand
+            if attname in self.__dict__:
+                originals[name] = self.__dict__[attname]
+
+    def get_original(self, name):
+        """Return the last known database value of a tracked field"""
+        if name not in self.tracked_fields:
+            raise ValueError(f"{name} is not a tracked field of {self.__class__.__name__}")
+        if self._state.adding:
+            return None
+
+        originals = self.__dict__.setdefault("_tracked_originals", {})
+        value = originals.get(name, _UNSET)
+        if value is _UNSET:
+            # Not loaded (deferred, or the instance was built by hand)
+            attname = self._meta.get_field(name).attname
+            value = (
+                self.__class__._base_manager.using(self._state.db)
+                .filter(pk=self.pk)
+                .values_list(attname, flat=True)
+                .first()
+            )
+            originals[name] = value
+        return value
+
+    def has_changed(self, name):
+        """Whether a tracked field differs from its last known database value"""
+        if self._state.adding:
+            return False
+        attname = self._meta.get_field(name).attname
+        return getattr(self, attname) != self.get_original(name)
+
+    def has_saved_change(self, name, update_fields=None):
+        """
+        Whether a save() with `update_fields` writes a change to a tracked
+        field; for pre_save/post_save receivers, which get update_fields.
+        """
+        if update_fields is not None:
+            attname = self._meta.get_field(name).attname
+            if name not in update_fields and attname not in update_fields:
+                return False
+        return self.has_changed(name)
+
+    def get_tracked_changes(self):
+        """Return {field_name: (old_value, new_value)} for changed tracked fields"""
+        return {
+            name: (self.get_original(name), getattr(self, self._meta.get_field(name).attname))
+            for name in self.tracked_fields
+            if self.has_changed(name)
+        }
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot_tracked_fields(fields)
+
+    @classmethod
+    def bulk_update_tracked(cls, objs, fields, batch_size=None):
+        """
+        bulk_update() that reports tracked field changes.
+
+        Sends core.signals.tracked_fields_changed with the changed instances
+        (bulk_update itself fires no model signals) and resets their
+        snapshots. Returns the number of rows matched, like bulk_update().
+        """
+        objs = list(objs)
+        names = [name for name in cls.tracked_fields if name in fields]
+        changes = []
+        for obj in objs:
+            obj_changes = {
+                name: (obj.get_original(name), getattr(obj, obj._meta.get_field(name).attname))
+                for name in names
+                if obj.has_changed(name)
+            }
+            if obj_changes:
+                changes.append((obj, obj_changes))
+
+        rows = cls._default_manager.bulk_update(objs, fields, batch_size=batch_size)
+
+        if changes:
+            tracked_fields_changed.send(sender=cls, changes=changes)
+        for obj in objs:
+            obj._snapshot_tracked_fields(fields)
+        return rows
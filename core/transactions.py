@@ -0,0 +1,106 @@
+"""
+Helpers for deferring work to transaction commit.
+"""
+
+import threading
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+_local = threading.local()
+
+
+class _Group:
+    """
+    The buffers of one key in one transaction, one per savepoint level.
+
+    Each level registers its own on_commit callback, so rolling back a
+    savepoint drops exactly the items added inside it (like core.audit
+    does for audit events). `flushed` keeps an item added at two sibling
+    levels from being flushed twice.
+    """
+
+    def __init__(self):
+        self.levels = {}
+        self.flushed = set()
+
+
+def _registry(using):
+    registry = getattr(_local, "registry", None)
+    if registry is None:
+        registry = _local.registry = {}
+    return registry.setdefault(using, {})
+
+
+def _is_registered(connection, callback):
+    return any(func is callback for _, func, _ in connection.run_on_commit)
+
+
+def collect_on_commit(key, item, flush, using=None):
+    """
+    Add `item` to a per-transaction buffer identified by `key`.
+
+    The first call in a transaction registers an on_commit callback that
+    calls flush(items) with the de-duplicated items (in insertion order).
+    Items added inside a nested atomic block are kept in a buffer of their
+    own, flushed by its own callback, so a rolled-back savepoint discards
+    its items and a rolled-back transaction discards them all. Outside a
+    transaction flush([item]) runs immediately.
+
+    Returns:
+        bool: False when `item` was already queued in this transaction
+    """
+    using = using or DEFAULT_DB_ALIAS
+    connection = connections[using]
+
+    if not connection.in_atomic_block:
+        flush([item])
+        return True
+
+    registry = _registry(using)
+    group = registry.get(key)
+    live = []
+    if group is not None:
+        live = [
+            (items, callback)
+            for items, callback in group.levels.values()
+            if _is_registered(connection, callback)
+        ]
+        if not live:
+            # Left over from a transaction that was rolled back
+            group = None
+    if group is None:
+        group = registry[key] = _Group()
+
+    if any(item in items for items, _ in live):
+        return False
+
+    level = tuple(connection.savepoint_ids)
+    buffer = group.levels.get(level)
+    if buffer is None or not _is_registered(connection, buffer[1]):
+        items = {}
+
+        def callback():
+            group.levels.pop(level, None)
+            if not group.levels and registry.get(key) is group:
+                del registry[key]
+            new = [item for item in items if item not in group.flushed]
+            group.flushed.update(new)
+            if new:
+                flush(new)
+
+        buffer = group.levels[level] = (items, callback)
+        transaction.on_commit(callback, using=using)
+
+    buffer[0][item] = None
+    return True
+
+
+def on_commit_once(key, func, using=None):
+    """
+    Run func() when the current transaction commits, once per `key` no
+    matter how many times it is scheduled.
+
+    Returns:
+        bool: False when the key was already scheduled in this transaction
+    """
+    return collect_on_commit(key, None, lambda items: func(), using=using)
@@ -1,10 +1,12 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
+from core.decorators import replica_reads
 from product_app.models import Product
 from order_app.models import Order
 from company_app.models import Company
 
 
+@replica_reads
 @login_required(login_url="/login/")
 def dashboard(request):
     """Main dashboard view"""
@@ -12,11 +14,7 @@ def dashboard(request):
     total_products = Product.objects.filter(active=True).count()
     total_companies = Company.objects.count()
 
-    recent_orders = (
-        Order.objects.select_related("creator")
-        .prefetch_related("productorder_set__product")
-        .order_by("-date")[:5]
-    )
+    recent_orders = Order.objects.summaries().order_by("-date")[:5]
 
     context = {
         "page_title": "Dashboard",
@@ -23,7 +23,7 @@ class ProductOrderAdmin(admin.ModelAdmin):
 
 @admin.register(EmailDraft)
 class EmailDraftAdmin(admin.ModelAdmin):
-    list_display = ["order", "user", "to_email", "subject", "updated_at"]
+    list_display = ["order", "user", "to_email", "subject", "version", "updated_at"]
     list_filter = ["user", "updated_at"]
     ordering = ["-updated_at"]
-    readonly_fields = ["created_at", "updated_at"]
+    readonly_fields = ["version", "created_at", "updated_at"]
@@ -0,0 +1,150 @@
+"""
+Data for the order email composer: the sender's info and templates, and
+order emails rendered from a template.
+
+User info is versioned by an ETag derived from the user row and their
+templates, so clients can cache it and revalidate without the server
+re-serializing every template.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+USER_INFO_CACHE_TIMEOUT = 60 * 60
+
+
+def user_email_info_etag(user):
+    """
+    ETag for a user's composer info.
+
+    Changes whenever the user row is saved or a template is added, edited
+    or deleted. Costs one aggregate query.
+    """
+    stats = user.email_templates.aggregate(count=Count("pk"), latest=Max("updated_at"))
+    latest = stats["latest"].timestamp() if stats["latest"] else 0
+    raw = f"{user.pk}:{user.updated_at.timestamp()}:{stats['count']}:{latest}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def get_user_email_info(user, etag=None):
+    """
+    Sender info and templates for the composer, cached per ETag.
+
+    Returns:
+        dict: display_name, sender_name, reply_to_email, signature, templates
+    """
+    etag = etag or user_email_info_etag(user)
+    return cache.get_or_set(
+        f"composer:user-info:{user.pk}:{etag}",
+        lambda: _build_user_email_info(user),
+        USER_INFO_CACHE_TIMEOUT,
+    )
+
+
+def _build_user_email_info(user):
+    return {
+        "display_name": user.get_display_name(),
+        "sender_name": user.get_email_sender_name(),
+        "reply_to_email": user.email,
+        "signature": user.get_email_signature() or "",
+        "templates": [
+            {
+                "id": t.id,
+                "name": t.name,
+                "subject": t.subject_template,
+                "body": t.body_template,
+                "is_default": t.is_default,
+            }
+            for t in user.email_templates.all()
+        ],
+    }
+
+
+def draft_data(draft):
+    """Serialize an EmailDraft for the composer"""
+    return {
+        "to": draft.to_email,
+        "subject": draft.subject,
+        "content": draft.content,
+        "version": draft.version,
+        "updated_at": draft.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def order_email_context(order, user):
+    """
+    Template variables for an order email, built from one line item query.
+
+    Returns:
+        dict: values keyed by variable name (see EmailTemplate)
+    """
+    line_items = list(_line_items(order))
+    return _email_context(order, user, line_items, user.get_email_signature())
+
+
+async def aorder_email_context(order, user):
+    """Async version of order_email_context()"""
+    line_items = [po async for po in _line_items(order)]
+    return _email_context(order, user, line_items, await user.aget_email_signature())
+
+
+def _line_items(order):
+    return order.productorder_set.select_related("product__company").order_by("pk")
+
+
+def _email_context(order, user, line_items, signature):
+    company = line_items[0].product.company if line_items else None
+
+    lines = []
+    for po in line_items:
+        quantity = po.quantity
+        if po.product.item_type == "C":
+            unit = "case" if quantity == 1 else "cases"
+        else:
+            unit = "lb." if quantity == 1 else "lbs."
+
+        item_no = po.product.item_no or "N/A"
+        lines.append(f"{quantity} {unit} - {item_no} {po.product.name}")
+
+    return {
+        "company_name": company.name if company else "Unknown Company",
+        "order_id": str(order.id),
+        "order_date": order.date.strftime("%B %d, %Y"),
+        "order_items": "\n".join(lines),
+        "total_items": str(sum(po.quantity for po in line_items)),
+        "item_count": str(len(line_items)),
+        "user_name": user.get_display_name(),
+        "user_email": user.email,
+        "signature": signature or "",
+    }
+
+
+def render_order_email(order, user, template=None):
+    """
+    Render the subject and body of an order email.
+
+    Uses `template`, else the user's default template, else a plain
+    fallback listing the items.
+
+    Returns:
+        tuple: (subject, body)
+    """
+    context = order_email_context(order, user)
+    return _render(context, template or user.get_default_template())
+
+
+async def arender_order_email(order, user, template=None):
+    """Async version of render_order_email(), using the async ORM"""
+    context = await aorder_email_context(order, user)
+    return _render(context, template or await user.aget_default_template())
+
+
+def _render(context, template):
+    if template:
+        return template.render(context)
+
+    subject = f"Order Request for {context['company_name']}"
+    body = f"Hello,\n\nHere is my order:\n\n{context['order_items']}\n\n{context['signature']}"
+    return subject, body
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order_app", "0006_emaildraft"),
+        ("product_app", "0005_tune_product_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="order",
+            name="order_app_o_creator_63b486_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="productorder",
+            name="order_app_p_order_i_0fec45_idx",
+        ),
+        migrations.AlterField(
+            model_name="emaildraft",
+            name="order",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="email_drafts",
+                to="order_app.order",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="productorder",
+            name="product",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="product_app.product",
+            ),
+        ),
+    ]
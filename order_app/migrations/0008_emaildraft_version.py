@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:47
+
+import hashlib
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def dedupe_and_hash_drafts(apps, schema_editor):
+    """Keep the newest draft per (order, user) and fill in content hashes"""
+    EmailDraft = apps.get_model("order_app", "EmailDraft")
+
+    seen = set()
+    stale = []
+    for draft in EmailDraft.objects.order_by("-updated_at", "-pk"):
+        key = (draft.order_id, draft.user_id)
+        if key in seen:
+            stale.append(draft.pk)
+            continue
+        seen.add(key)
+        raw = "\x00".join([draft.to_email, draft.subject, draft.content])
+        draft.content_hash = hashlib.sha256(raw.encode()).hexdigest()
+        draft.save(update_fields=["content_hash"])
+
+    EmailDraft.objects.filter(pk__in=stale).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order_app", "0007_tune_order_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emaildraft",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="emaildraft",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.RunPython(dedupe_and_hash_drafts, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="emaildraft",
+            unique_together={("order", "user")},
+        ),
+    ]
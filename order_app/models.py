@@ -1,4 +1,7 @@
-from django.db import models
+import hashlib
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
 from django.utils.timezone import now
 from product_app.models import Product
 from user_app.models import User
@@ -11,6 +14,38 @@ class OrderManager(models.Manager):
             "productorder_set__product__company"
         )
 
+    def for_list(self):
+        """
+        Orders for the order list, with line items, products and companies
+        prefetched. Only the columns the order cards render are loaded.
+        """
+        items = ProductOrder.objects.select_related("product__company").only(
+            "id",
+            "order",
+            "quantity",
+            "product",
+            "product__name",
+            "product__item_no",
+            "product__item_type",
+            "product__company",
+            "product__company__name",
+            "product__company__email",
+            "product__company__is_active",
+        )
+        return (
+            self.select_related("creator")
+            .only("id", "date", "updated_at", "creator", "creator__username")
+            .prefetch_related(models.Prefetch("productorder_set", queryset=items))
+        )
+
+    def summaries(self):
+        """Orders with creator username and total quantity annotated"""
+        return (
+            self.select_related("creator")
+            .only("id", "date", "creator", "creator__username")
+            .annotate(total_items=models.Sum("productorder__quantity"))
+        )
+
 
 class Order(models.Model):
     date = models.DateTimeField(default=now)
@@ -29,14 +64,15 @@ class Order(models.Model):
         ordering = ["-date"]
         indexes = [
             models.Index(fields=["-date"]),
-            models.Index(fields=["creator"]),
         ]
 
     def __str__(self):
         return f"Order #{self.id} - {self.date.strftime('%Y-%m-%d')}"
 
     def get_total_items(self):
-        """Get total number of items in order"""
+        """Get total number of items in order, using the annotation when present"""
+        if hasattr(self, "total_items"):
+            return self.total_items or 0
         return (
             self.productorder_set.aggregate(total=models.Sum("quantity"))["total"] or 0
         )
@@ -58,6 +94,7 @@ class Order(models.Model):
         """
         Update order items from a dict of product_id: quantity.
         Removes items with quantity 0, adds new items, updates existing.
+        The line item signals bump updated_at once when anything changed.
         """
         current_items = {po.product_id: po for po in self.productorder_set.all()}
 
@@ -82,12 +119,10 @@ class Order(models.Model):
                 if product_id in current_items:
                     current_items[product_id].delete()
 
-        # Update the order's updated_at timestamp
-        self.save(update_fields=["updated_at"])
-
 
 class ProductOrder(models.Model):
-    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    # Lookups by product use the unique (product, order) index
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, db_index=False)
     order = models.ForeignKey(Order, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -95,19 +130,76 @@ class ProductOrder(models.Model):
 
     class Meta:
         unique_together = ["product", "order"]
-        indexes = [
-            models.Index(fields=["order", "product"]),
-        ]
 
     def __str__(self):
         return f"{self.product.name} x{self.quantity}"
 
 
+class EmailDraftManager(models.Manager):
+    def autosave(self, order_id, user, to_email, subject, content, version):
+        """
+        Save a user's draft for an order if it is still at `version`.
+
+        `version` is the draft version the client last saw (0 when it has
+        no draft yet). An existing draft is written with one conditional
+        UPDATE that matches only the expected version and a different
+        content hash, so stale tabs never overwrite newer text and
+        unchanged saves write nothing.
+
+        Returns:
+            tuple: (status, draft) where status is "saved", "unchanged" or
+            "conflict". draft is the stored draft (None when a conflicting
+            draft was deleted); after an update it is built in memory.
+        """
+        digest = EmailDraft.hash_content(to_email, subject, content)
+        fields = {
+            "to_email": to_email,
+            "subject": subject,
+            "content": content,
+            "content_hash": digest,
+        }
+        drafts = self.filter(order_id=order_id, user=user)
+
+        if version == 0:
+            try:
+                with transaction.atomic():
+                    draft = self.create(
+                        order_id=order_id,
+                        user=user,
+                        from_email=settings.DEFAULT_FROM_EMAIL,
+                        **fields,
+                    )
+                return "saved", draft
+            except IntegrityError:
+                pass
+        else:
+            updated_at = now()
+            updated = (
+                drafts.filter(version=version)
+                .exclude(content_hash=digest)
+                .update(**fields, version=models.F("version") + 1, updated_at=updated_at)
+            )
+            if updated:
+                return "saved", self.model(
+                    order_id=order_id,
+                    user=user,
+                    version=version + 1,
+                    updated_at=updated_at,
+                    **fields,
+                )
+
+        current = drafts.first()
+        if current is not None and current.version == version and current.content_hash == digest:
+            return "unchanged", current
+        return "conflict", current
+
+
 class EmailDraft(models.Model):
     """Store email drafts for orders"""
 
+    # Lookups by order use the unique (order, user) index
     order = models.ForeignKey(
-        Order, on_delete=models.CASCADE, related_name="email_drafts"
+        Order, on_delete=models.CASCADE, related_name="email_drafts", db_index=False
     )
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="email_drafts"
@@ -118,11 +210,32 @@ class EmailDraft(models.Model):
     subject = models.CharField(max_length=255)
     content = models.TextField()
 
+    # Bumped on every save; autosaves must name the version they replace
+    version = models.PositiveIntegerField(default=1)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EmailDraftManager()
+
     class Meta:
         ordering = ["-updated_at"]
+        # One draft per user and order; the unique index serves lookups by order
+        unique_together = ["order", "user"]
 
     def __str__(self):
         return f"Draft for Order #{self.order.id} - {self.updated_at.strftime('%Y-%m-%d %H:%M')}"
+
+    def save(self, *args, **kwargs):
+        # Edits outside autosave (e.g. the admin) still invalidate open tabs
+        self.content_hash = self.hash_content(self.to_email, self.subject, self.content)
+        if self.pk is not None:
+            self.version += 1
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def hash_content(to_email, subject, content):
+        """SHA-256 of the editable fields, used to skip no-op saves"""
+        raw = "\x00".join([to_email or "", subject or "", content or ""])
+        return hashlib.sha256(raw.encode()).hexdigest()
@@ -0,0 +1,98 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from company_app.stats import (
+    count_line_item,
+    refresh_order_counts_for_products,
+    uncount_line_item,
+    uncount_order,
+)
+from core import events
+from core.transactions import on_commit_once
+from .models import Order, ProductOrder
+
+
+@receiver(post_save, sender=ProductOrder)
+def count_company_order(sender, instance, created, **kwargs):
+    """
+    Keep Company.order_count exact as line items are added, in the same
+    transaction (see company_app.stats). Quantity changes do not affect
+    which orders a company appears in.
+    """
+    if created:
+        count_line_item(instance)
+
+
+@receiver(post_delete, sender=ProductOrder)
+def uncount_company_order(sender, instance, origin=None, **kwargs):
+    """
+    Keep Company.order_count exact as line items are removed.
+
+    Line items deleted along with their order or product are counted by the
+    Order and Product receivers instead, once per deletion rather than once
+    per line item.
+    """
+    if origin is None or isinstance(origin, ProductOrder):
+        uncount_line_item(instance)
+    elif isinstance(origin, QuerySet) and origin.model is ProductOrder:
+        # Several of the deleted items can share an order and company
+        refresh_order_counts_for_products([instance.product_id])
+
+
+@receiver(pre_delete, sender=Order)
+def collect_order_companies(sender, instance, **kwargs):
+    _mark_order_changed(instance.pk)
+    # The line items are gone by post_delete
+    instance._line_item_companies = list(
+        ProductOrder.objects.filter(order=instance)
+        .values_list("product__company", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_delete, sender=Order)
+def uncount_deleted_order(sender, instance, **kwargs):
+    uncount_order(getattr(instance, "_line_item_companies", []))
+
+
+@receiver(post_save, sender=ProductOrder)
+@receiver(post_delete, sender=ProductOrder)
+def touch_order(sender, instance, **kwargs):
+    """
+    Bump Order.updated_at when its line items change. Cached order cards are
+    keyed by updated_at, so this is what invalidates them.
+
+    Runs once per order per transaction, and not at all for orders that
+    were saved or deleted themselves in the transaction: their own signals
+    already cover it.
+    """
+    if not _mark_order_changed(instance.order_id):
+        return
+
+    updated_at = timezone.now()
+    Order.objects.filter(pk=instance.order_id).update(updated_at=updated_at)
+    if ProductOrder.order.is_cached(instance):
+        instance.order.updated_at = updated_at
+    events.publish(events.ORDER_UPDATED, instance.order_id)
+
+
+def _mark_order_changed(order_id):
+    """True the first time an order is changed in the current transaction"""
+    return on_commit_once(("order_changed", order_id), _noop)
+
+
+def _noop():
+    pass
+
+
+@receiver(post_save, sender=Order)
+def publish_order_saved(sender, instance, created, **kwargs):
+    """Tell open order lists about the new or changed order (see core.events)"""
+    _mark_order_changed(instance.pk)
+    events.publish(events.ORDER_CREATED if created else events.ORDER_UPDATED, instance.pk)
+
+
+@receiver(post_delete, sender=Order)
+def publish_order_deleted(sender, instance, **kwargs):
+    events.publish(events.ORDER_DELETED, instance.pk)
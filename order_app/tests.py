@@ -1,3 +1,234 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from company_app.models import Company
+from core.deferred import forbid_deferred_loads
+from core.models import LiveEvent
+from product_app.models import Product
+from user_app.models import User
+from .models import EmailDraft, Order, ProductOrder
+
+
+class CompanyOrderCountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.acme = Company.objects.create(name="Acme")
+        self.globex = Company.objects.create(name="Globex")
+        self.ham = Product.objects.create(company=self.acme, name="Ham", item_type="C")
+        self.swiss = Product.objects.create(company=self.acme, name="Swiss", item_type="W")
+
+    def create_order(self, *products):
+        order = Order.objects.create(creator=self.user)
+        for product in products:
+            ProductOrder.objects.create(order=order, product=product)
+        return order
+
+    def order_count(self, company):
+        company.refresh_from_db(fields=["order_count"])
+        return company.order_count
+
+    def test_new_companies_start_at_zero(self):
+        self.assertEqual(self.order_count(self.globex), 0)
+        self.assertFalse(self.globex.has_orders())
+
+    def test_count_is_current_inside_the_transaction(self):
+        order = self.create_order(self.ham, self.swiss)
+        self.create_order(self.ham)
+        # No on-commit refresh: the writing transaction already sees it
+        self.assertEqual(self.order_count(self.acme), 2)
+        self.assertEqual(self.order_count(self.globex), 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            ProductOrder.objects.create(
+                order=order, product=Product.objects.create(
+                    company=self.globex, name="Brie", item_type="W"
+                )
+            )
+        # One conditional UPDATE per line item, no COUNT(DISTINCT)
+        updates = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('UPDATE "company_app_company"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn("DISTINCT", updates[0])
+        self.assertEqual(self.order_count(self.acme), 2)
+        self.assertEqual(self.order_count(self.globex), 1)
+
+    def test_removing_line_items(self):
+        order = self.create_order(self.ham, self.swiss)
+
+        order.productorder_set.get(product=self.ham).delete()
+        self.assertEqual(self.order_count(self.acme), 1)
+
+        order.productorder_set.get(product=self.swiss).delete()
+        self.assertEqual(self.order_count(self.acme), 0)
+
+    def test_deleting_line_items_in_bulk(self):
+        order = self.create_order(self.ham, self.swiss)
+        self.create_order(self.ham)
+
+        ProductOrder.objects.filter(order=order).delete()
+
+        self.assertEqual(self.order_count(self.acme), 1)
+
+    def test_deleting_an_order(self):
+        order = self.create_order(self.ham, self.swiss)
+        self.create_order(self.swiss)
+
+        order.delete()
+
+        self.assertEqual(self.order_count(self.acme), 1)
+
+    def test_deleting_the_creator(self):
+        self.create_order(self.ham, self.swiss)
+        self.create_order(self.swiss)
+
+        self.user.delete()
+
+        self.assertEqual(self.order_count(self.acme), 0)
+
+    def test_moving_a_product_moves_its_orders(self):
+        self.create_order(self.ham)
+
+        self.ham.company = self.globex
+        self.ham.save()
+
+        self.assertEqual(self.order_count(self.acme), 0)
+        self.assertEqual(self.order_count(self.globex), 1)
+
+    def test_deleting_a_product(self):
+        self.create_order(self.ham, self.swiss)
+        self.create_order(self.ham)
+
+        self.ham.delete()
+
+        self.assertEqual(self.order_count(self.acme), 1)
+
+    def test_order_flags(self):
+        self.create_order(self.ham)
+        flags = dict(Company.objects.with_order_flags().values_list("pk", "orders_exist"))
+        self.assertEqual(flags, {self.acme.pk: True, self.globex.pk: False})
+
+
+class OrderListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(self.user)
+        company = Company.objects.create(name="Acme")
+        for i in range(5):
+            product = Product.objects.create(
+                company=company, name=f"Product {i}", item_no=f"P{i}", item_type="C"
+            )
+            order = Order.objects.create(creator=self.user)
+            ProductOrder.objects.create(order=order, product=product, quantity=i + 1)
+
+    def test_list_reads_no_deferred_fields(self):
+        # User, count, orders, line items and the live event id, however
+        # many orders are listed
+        with forbid_deferred_loads(), self.assertNumQueries(5):
+            response = self.client.get(reverse("orders:order_list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Product 4")
+
+
+class OrderEditTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(self.user)
+        company = Company.objects.create(name="Acme")
+        self.products = [
+            Product.objects.create(company=company, name=f"Product {i}", item_type="C")
+            for i in range(4)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.order = Order.objects.create(creator=self.user)
+            for product in self.products[:3]:
+                ProductOrder.objects.create(order=self.order, product=product)
+
+    def test_order_is_touched_once(self):
+        data = {
+            f"product_{self.products[0].pk}": 5,  # changed
+            f"product_{self.products[1].pk}": 0,  # removed
+            f"product_{self.products[3].pk}": 2,  # added
+        }
+        updated_at = self.order.updated_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    reverse("api:update_order", args=[self.order.pk]),
+                    data,
+                    headers={"X-Requested-With": "XMLHttpRequest"},
+                )
+
+        self.assertEqual(response.status_code, 200)
+        order_updates = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('UPDATE "order_app_order"')
+        ]
+        self.assertEqual(len(order_updates), 1)
+        # Three line item writes, their company count UPDATEs and the one
+        # order UPDATE; the rest is the request and the response
+        self.assertEqual(len(queries), 19)
+        self.order.refresh_from_db()
+        self.assertGreater(self.order.updated_at, updated_at)
+        events = LiveEvent.objects.filter(entity_id=self.order.pk).order_by("pk")
+        self.assertEqual(
+            list(events.values_list("event_type", flat=True)),
+            ["order.created", "order.updated"],
+        )
+
+
+class EmailDraftMigrationTests(TransactionTestCase):
+    migrate_from = [("order_app", "0007_tune_order_indexes")]
+    migrate_to = [("order_app", "0008_emaildraft_version")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def setUp(self):
+        self.old_apps = self.migrate(self.migrate_from)
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_keeps_the_newest_draft_per_order_and_user(self):
+        user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        order = Order.objects.create(creator=user)
+        OldEmailDraft = self.old_apps.get_model("order_app", "EmailDraft")
+        drafts = [
+            OldEmailDraft.objects.create(
+                order_id=order.pk,
+                user_id=user.pk,
+                to_email="orders@example.com",
+                from_email="buyer@example.com",
+                subject=subject,
+                content="",
+            )
+            for subject in ("Newest", "Older")
+        ]
+        OldEmailDraft.objects.filter(pk=drafts[1].pk).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.migrate(self.migrate_to)
+
+        draft = EmailDraft.objects.get()
+        self.assertEqual((draft.pk, draft.subject), (drafts[0].pk, "Newest"))
+        self.assertEqual(
+            draft.content_hash,
+            EmailDraft.hash_content("orders@example.com", "Newest", ""),
+        )
@@ -7,4 +7,5 @@ urlpatterns = [
     path("", views.OrderListView.as_view(), name="order_list"),
     path("new/", views.NewOrderView.as_view(), name="new_order"),
     path("<int:pk>/edit/", views.EditOrderView.as_view(), name="edit_order"),
+    path("<int:pk>/card/", views.OrderCardView.as_view(), name="order_card"),
 ]
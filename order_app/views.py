@@ -1,8 +1,13 @@
 from django.views.generic import ListView, TemplateView
 from django.shortcuts import get_object_or_404
 from django.db import models
+from django.utils import timezone
+from core import events
 from core.mixins import PageTitleMixin, LoginRequiredMixin
+from core.timezones import format_datetimes
 from company_app.models import Company
+from company_app.stats import get_catalog_version, get_catalog_versions
+from product_app.models import Product
 from .models import Order
 
 
@@ -12,37 +17,70 @@ class OrderListView(LoginRequiredMixin, PageTitleMixin, ListView):
     context_object_name = "orders"
     paginate_by = 20
     page_title = "All Orders"
+    replica_reads = True
 
     def get_queryset(self):
-        return (
-            Order.objects.select_related("creator")
-            .prefetch_related("productorder_set__product__company")
-            .order_by("-date")
-        )
+        return Order.objects.for_list().order_by("-date")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        orders_with_details = []
-        for order in context["orders"]:
-            product_orders = order.productorder_set.select_related(
-                "product__company"
-            ).all()
-
-            orders_with_details.append(
-                {
-                    "order": order,
-                    "items": product_orders,
-                    "company": (
-                        product_orders[0].product.company if product_orders else None
-                    ),
-                    "total_quantity": sum(po.quantity for po in product_orders),
-                }
-            )
+        context["orders_with_details"] = order_card_items(context["orders"])
+        context["timezone_name"] = timezone.get_current_timezone_name()
+        # Live updates start from the events after this render
+        context["live_events_after"] = events.latest_event_id()
+        return context
+
 
-        context["orders_with_details"] = orders_with_details
+class OrderCardView(LoginRequiredMixin, TemplateView):
+    """One order card of the order list, fetched by the page's live updates."""
+
+    template_name = "order_app/order_card.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        order = get_object_or_404(Order.objects.for_list(), pk=kwargs["pk"])
+        context["item"] = order_card_items([order])[0]
+        context["timezone_name"] = timezone.get_current_timezone_name()
         return context
 
 
+def order_card_items(orders):
+    """
+    Template data for order cards (see order_app/order_card.html), from
+    orders loaded with Order.objects.for_list().
+    """
+    # One timezone lookup for the whole page (see UserTimezoneMiddleware)
+    dates = format_datetimes([order.date for order in orders], "M d, Y g:i A")
+
+    orders_with_details = []
+    for order, date_display in zip(orders, dates):
+        product_orders = order.productorder_set.all()
+
+        orders_with_details.append(
+            {
+                "order": order,
+                "date_display": date_display,
+                "items": product_orders,
+                "company": (
+                    product_orders[0].product.company if product_orders else None
+                ),
+                "total_quantity": sum(po.quantity for po in product_orders),
+            }
+        )
+
+    # Order cards are fragment-cached per order version, timezone and
+    # company catalog version
+    versions = get_catalog_versions(
+        {item["company"].pk for item in orders_with_details if item["company"]}
+    )
+    for item in orders_with_details:
+        item["catalog_version"] = (
+            versions[item["company"].pk] if item["company"] else 0
+        )
+
+    return orders_with_details
+
+
 class NewOrderView(LoginRequiredMixin, PageTitleMixin, TemplateView):
     template_name = "order_app/new_order.html"
     page_title = "Create New Order"
@@ -63,6 +101,7 @@ class NewOrderView(LoginRequiredMixin, PageTitleMixin, TemplateView):
         company_id = self.request.GET.get("company")
         if company_id:
             context["selected_company_id"] = int(company_id)
+        context["live_events_after"] = events.latest_event_id()
 
         return context
 
@@ -88,11 +127,10 @@ class EditOrderView(LoginRequiredMixin, PageTitleMixin, TemplateView):
         context["company"] = company
 
         if company:
-            # Get ALL active products from this company
-            all_products = company.company_products.filter(active=True).order_by(
-                "item_no"
-            )
-            context["products"] = all_products
+            # Get ALL active products from this company. The queryset is lazy
+            # and only runs when the cached product table is rebuilt.
+            context["products"] = Product.objects.catalog(company)
+            context["catalog_version"] = get_catalog_version(company.pk)
 
             # Get current quantities for products in the order
             context["current_quantities"] = order.get_products_dict()
@@ -0,0 +1,23 @@
+"""
+ASGI config for ordering_form project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server, e.g.:
+
+    uvicorn ordering_form.asgi:application
+
+DJANGO_ASGI tells the settings they run under ASGI, which switches the
+I/O-bound api endpoints to their async views (see api.async_views).
+
+For more information on this file, see
+https://docs.djangoproject.com/en/stable/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ordering_form.settings")
+os.environ.setdefault("DJANGO_ASGI", "1")
+
+application = get_asgi_application()
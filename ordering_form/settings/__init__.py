@@ -0,0 +1,25 @@
+"""
+Settings package. The profile is chosen with the DJANGO_SETTINGS_PROFILE
+environment variable:
+
+- dev (default): DEBUG on, non-cached templates, local memory cache
+- prod: persistent DB connections, cached templates, shared cache and
+  hashed static file names
+
+SQLite tuning (WAL, busy timeout, ...) is shared by both; see base.py.
+
+DJANGO_SETTINGS_MODULE stays "ordering_form.settings" for both.
+"""
+
+import os
+
+PROFILE = os.environ.get("DJANGO_SETTINGS_PROFILE", "dev").strip().lower()
+
+if PROFILE == "prod":
+    from .prod import *  # noqa: F401,F403
+elif PROFILE == "dev":
+    from .dev import *  # noqa: F401,F403
+else:
+    raise ImportError(
+        f"Unknown DJANGO_SETTINGS_PROFILE {PROFILE!r}; expected 'dev' or 'prod'."
+    )
@@ -0,0 +1,256 @@
+"""
+Settings shared by every profile. See ordering_form/settings/__init__.py.
+"""
+
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+from datetime import timedelta
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+load_dotenv()
+SECRET_KEY = os.environ.get("SECRET_KEY")
+
+DEBUG = False
+ALLOWED_HOSTS = []
+
+
+def env_flag(name, default=False):
+    """Read a boolean setting ("1"/"true"/"yes") from the environment"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes")
+
+
+def template_loaders(cached):
+    """Template loaders, wrapped in the cached loader when `cached`"""
+    loaders = [
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]
+    if cached:
+        return [("django.template.loaders.cached.Loader", loaders)]
+    return loaders
+
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    # Third-party apps
+    "rest_framework",
+    # Custom apps
+    "core",
+    "api",
+    "dashboard",
+    "user_app",
+    "company_app",
+    "product_app",
+    "order_app",
+    "benchmarks",
+]
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.UserTimezoneMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "ordering_form.urls"
+
+# Compile each template once per process. Profiles pick the default;
+# DJANGO_CACHED_TEMPLATES=1 or 0 overrides it.
+CACHED_TEMPLATES = env_flag("DJANGO_CACHED_TEMPLATES", default=True)
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [BASE_DIR / "templates"],
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+            "loaders": template_loaders(CACHED_TEMPLATES),
+        },
+    },
+]
+
+WSGI_APPLICATION = "ordering_form.wsgi.application"
+ASGI_APPLICATION = "ordering_form.asgi.application"
+
+# Set by ordering_form/asgi.py. Under ASGI the I/O-bound api endpoints are
+# served by their async variants (api.async_views) unless turned off.
+ASGI = env_flag("DJANGO_ASGI", default=False)
+ASYNC_API_VIEWS = env_flag("DJANGO_ASYNC_API_VIEWS", default=ASGI)
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            # Take the write lock when a transaction starts, so concurrent
+            # writers wait on busy_timeout instead of failing mid-transaction
+            "transaction_mode": os.environ.get("SQLITE_TRANSACTION_MODE", "IMMEDIATE"),
+        },
+    }
+}
+
+# Optional read replica for list, export and analytics views (core.routers).
+# Point DATABASE_REPLICA_NAME at a second SQLite file, or at db.sqlite3
+# itself to exercise the routing locally.
+if os.environ.get("DATABASE_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ["DATABASE_REPLICA_NAME"],
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+REPLICA_DB_ALIAS = "replica"
+# After a write, the client reads from the primary for this many seconds
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+
+# How long Idempotency-Key responses are kept (see core.idempotency)
+IDEMPOTENCY_KEY_TTL = int(os.environ.get("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+# A request still unfinished after this long is taken to have died; keep it
+# above the worker timeout
+IDEMPOTENCY_CLAIM_SECONDS = int(os.environ.get("IDEMPOTENCY_CLAIM_SECONDS", 60))
+
+# /api/batch/ limits: sub-requests per batch and threads for concurrent reads.
+# Each worker thread opens its own database connection; 1 runs reads inline.
+API_BATCH_MAX_REQUESTS = int(os.environ.get("API_BATCH_MAX_REQUESTS", 20))
+API_BATCH_MAX_WORKERS = int(os.environ.get("API_BATCH_MAX_WORKERS", 4))
+
+# Applied to each new SQLite connection by core.db (None skips a pragma)
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 128 * 1024 * 1024)),
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", -16000)),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "temp_store": os.environ.get("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+AUTH_USER_MODEL = "user_app.User"
+
+# The session user is fetched without its rarely used columns. ModelBackend
+# stays listed so sessions stored with its path keep working.
+AUTHENTICATION_BACKENDS = [
+    "user_app.backends.SessionUserBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+# Sessions are read from the cache and written through to the database
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"
+    },
+    {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
+    {"NAME": "django.contrib.auth.password_validation.CommonPasswordValidator"},
+    {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
+]
+
+# Django REST Framework Configuration
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": [
+        "rest_framework.permissions.IsAuthenticated",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Applies to the views that set throttle_scope (see core.ratelimit)
+    "DEFAULT_THROTTLE_CLASSES": [
+        "core.ratelimit.RateLimitThrottle",
+    ],
+}
+
+# Rate limits per scope and key kind (see core.ratelimit). A rate
+# "N/period" allows bursts of N requests and N per period on average.
+RATELIMIT_ENABLED = env_flag("RATELIMIT_ENABLED", default=True)
+RATELIMITS = {
+    "login": {"ip": "30/5m", "account": "10/15m"},
+    "register": {"ip": "10/h"},
+    "password_reset": {"ip": "10/h", "account": "3/h"},
+    "resend_activation": {"ip": "10/h", "account": "3/h"},
+    "order_email_send": {"user": "60/m"},
+}
+# Set when a proxy that appends to X-Forwarded-For sits in front of the app
+RATELIMIT_TRUST_X_FORWARDED_FOR = env_flag("RATELIMIT_TRUST_X_FORWARDED_FOR")
+
+LANGUAGE_CODE = "en-us"
+TIME_ZONE = "America/New_York"
+USE_I18N = True
+USE_L10N = True
+USE_TZ = True
+
+STATIC_URL = "/static/"
+STATICFILES_DIRS = [BASE_DIR / "static"]
+STATIC_ROOT = os.environ.get("STATIC_ROOT", BASE_DIR / "staticfiles")
+
+# Email Configuration
+if os.environ.get("EMAIL_BACKEND"):
+    EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND")
+    EMAIL_HOST = os.environ.get("EMAIL_HOST")
+    EMAIL_PORT = int(os.environ.get("EMAIL_PORT", 587))
+    EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "True") == "True"
+    EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER")
+    EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD")
+    DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER)
+else:
+    EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+    DEFAULT_FROM_EMAIL = "noreply@orderform.com"
+
+# Live events stream (see api.streams). Streams stay open only when served
+# by the async views; otherwise each request returns the pending events and
+# the browser reconnects after EVENT_STREAM_RETRY_MS. Streams poll the
+# database every EVENT_STREAM_POLL_SECONDS for events from other workers.
+EVENT_STREAM_SECONDS = int(
+    os.environ.get("EVENT_STREAM_SECONDS", 300 if ASYNC_API_VIEWS else 0)
+)
+EVENT_STREAM_RETRY_MS = int(os.environ.get("EVENT_STREAM_RETRY_MS", 3000))
+EVENT_STREAM_POLL_SECONDS = float(os.environ.get("EVENT_STREAM_POLL_SECONDS", 2))
+# Live events older than this are deleted by the purge_live_events command
+EVENT_STREAM_RETENTION_HOURS = int(os.environ.get("EVENT_STREAM_RETENTION_HOURS", 24))
+
+# How the async views send mail (see core.mail); core.mail.AsyncSMTPBackend
+# needs aiosmtplib
+ASYNC_EMAIL_BACKEND = os.environ.get("ASYNC_EMAIL_BACKEND", "core.mail.ThreadedEmailBackend")
+
+# Token Settings
+PASSWORD_RESET_TOKEN_EXPIRY_MINUTES = 10
+ACCOUNT_ACTIVATION_TOKEN_EXPIRY_MINUTES = 10
+ACTIVATION_RESEND_COOLDOWN_SECONDS = 60
+# Expired and used tokens are kept this long before purge_tokens deletes them
+AUTH_TOKEN_RETENTION_HOURS = int(os.environ.get("AUTH_TOKEN_RETENTION_HOURS", 24))
+
+# Frontend URL for email links
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:8000")
+
+EMAIL_SENDER_NAME = os.environ.get("EMAIL_SENDER_NAME", "Order Form")
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
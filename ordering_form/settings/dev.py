@@ -0,0 +1,12 @@
+"""
+Development profile: debug on, templates re-read on every request.
+"""
+
+from .base import *  # noqa: F401,F403
+from .base import TEMPLATES, env_flag, template_loaders
+
+DEBUG = True
+ALLOWED_HOSTS = []
+
+CACHED_TEMPLATES = env_flag("DJANGO_CACHED_TEMPLATES", default=False)
+TEMPLATES[0]["OPTIONS"]["loaders"] = template_loaders(CACHED_TEMPLATES)
@@ -0,0 +1,57 @@
+"""
+Production profile.
+
+- Database connections are kept open between requests (CONN_MAX_AGE) and
+  health-checked before reuse, except under ASGI.
+- Templates are compiled once per process (cached loader).
+- The cache is shared between worker processes (Redis when REDIS_URL is
+  set, a file-based cache otherwise), which the fragment cache and catalog
+  versions rely on. Set REDIS_URL for exact rate limits: the file-based
+  cache cannot count atomically, so concurrent requests can slip past a
+  limit (the core.W001 system check warns about it).
+- Static files get content-hashed names; run collectstatic on deploy.
+"""
+
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import ASGI, BASE_DIR, DATABASES, TEMPLATES, env_flag, template_loaders
+
+DEBUG = False
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
+
+# Under ASGI each request's sync database work runs on its own thread, so
+# persistent connections would pile up; connections are closed instead.
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = int(os.environ.get("CONN_MAX_AGE", 0 if ASGI else 600))
+    database["CONN_HEALTH_CHECKS"] = True
+
+CACHED_TEMPLATES = env_flag("DJANGO_CACHED_TEMPLATES", default=True)
+TEMPLATES[0]["OPTIONS"]["loaders"] = template_loaders(CACHED_TEMPLATES)
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("CACHE_DIR", BASE_DIR / ".cache"),
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+    },
+}
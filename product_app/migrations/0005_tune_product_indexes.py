@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:39
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("company_app", "0006_company_order_count"),
+        ("product_app", "0004_alter_product_options_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="product",
+            name="product_app_company_817d80_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="product",
+            name="product_app_company_30ac34_idx",
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="company",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="company_products",
+                to="company_app.company",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["company", "item_no", "name"],
+                name="product_app_company_8fa700_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                models.F("company"),
+                django.db.models.functions.text.Lower("name"),
+                name="product_company_lower_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("active", True)),
+                fields=["company", "item_no", "name", "item_type"],
+                name="product_active_catalog_idx",
+            ),
+        ),
+        # Refresh planner statistics so SQLite picks the new indexes
+        migrations.RunSQL("ANALYZE", migrations.RunSQL.noop),
+    ]
@@ -1,21 +1,55 @@
 from django.db import models
+from django.db.models.functions import Lower
 from company_app.models import Company
 from core.constants import ITEM_TYPES, get_item_type_display
+from core.tracking import FieldTrackerMixin
 
 
 class ProductManager(models.Manager):
+    # Columns rendered by the product list tables
+    LIST_FIELDS = (
+        "id", "name", "item_no", "item_type", "active", "company", "company__name",
+    )
+    # Columns needed to order from a catalog
+    CATALOG_FIELDS = ("id", "name", "item_no", "item_type")
+
     def active(self):
         return self.filter(active=True)
 
     def by_company(self, company):
         return self.filter(company=company)
 
+    def named(self, company_id, name):
+        """
+        A company's products with this name, ignoring case. Compares
+        LOWER(name) so the expression index is used on every backend.
+        """
+        return self.alias(name_lower=Lower("name")).filter(
+            company_id=company_id, name_lower=name.lower()
+        )
+
+    def for_list(self):
+        """Products with their company name, loading only the listed columns"""
+        return self.select_related("company").only(*self.LIST_FIELDS)
+
+    def catalog(self, company):
+        """A company's active products, loading only the columns needed to order"""
+        return (
+            self.filter(company=company, active=True)
+            .only(*self.CATALOG_FIELDS)
+            .order_by("item_no", "name")
+        )
+
+
+class Product(FieldTrackerMixin, models.Model):
+    tracked_fields = ("active", "company")
 
-class Product(models.Model):
     company = models.ForeignKey(
         Company,
         related_name="company_products",
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        # Covered by the indexes and constraints below, which all lead with company
+        db_index=False,
     )
     name = models.CharField(max_length=255)
     item_no = models.CharField(max_length=12, default="", blank=True)
@@ -31,8 +65,18 @@ class Product(models.Model):
         ordering = ['company', 'item_no', 'name']
         indexes = [
             models.Index(fields=['company', 'active']),
-            models.Index(fields=['company', 'item_no']),
-            models.Index(fields=['company', 'name']),
+            # Company product table in display order
+            models.Index(fields=['company', 'item_no', 'name']),
+            # Case-insensitive name lookups (ProductManager.named)
+            models.Index(
+                'company', Lower('name'), name='product_company_lower_name_idx'
+            ),
+            # Active catalog in display order, covering the catalog columns
+            models.Index(
+                fields=['company', 'item_no', 'name', 'item_type'],
+                condition=models.Q(active=True),
+                name='product_active_catalog_idx',
+            ),
         ]
         constraints = [
             # Name must be unique per company
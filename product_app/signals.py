@@ -1,5 +1,12 @@
 from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
+from company_app.stats import (
+    bump_catalog_version,
+    invalidate_product_counts,
+    refresh_order_counts,
+)
+from core import audit
+from core.signals import tracked_fields_changed
 from .models import Product
 
 
@@ -9,19 +16,38 @@ def track_product_status_changes(sender, instance, **kwargs):
     Track when products are activated/deactivated.
     Could be used to notify users with products in their carts, etc.
     """
-    if instance.pk:
-        try:
-            old_instance = Product.objects.get(pk=instance.pk)
-            if old_instance.active != instance.active:
-                if not instance.active:
-                    # Product was deactivated
-                    print(f"Product '{instance.name}' was deactivated")
-                    # Could check if it's in any pending orders
-                else:
-                    # Product was reactivated
-                    print(f"Product '{instance.name}' was reactivated")
-        except Product.DoesNotExist:
-            pass
+    if instance.has_saved_change("active", kwargs.get("update_fields")):
+        _log_status_change(instance)
+
+
+@receiver(tracked_fields_changed, sender=Product)
+def track_bulk_product_changes(sender, changes, **kwargs):
+    """
+    Same as the receivers above for products changed via bulk_update_tracked().
+    """
+    for instance, fields in changes:
+        if "active" in fields:
+            _log_status_change(instance)
+        invalidate_product_counts(instance.company_id)
+        bump_catalog_version(instance.company_id)
+        if "company" in fields:
+            invalidate_product_counts(fields["company"][0])
+            bump_catalog_version(fields["company"][0])
+            refresh_order_counts([instance.company_id, fields["company"][0]])
+
+
+def _log_status_change(instance):
+    if not instance.active:
+        # Product was deactivated
+        audit.record(
+            "product.deactivated", instance, f"Product '{instance.name}' was deactivated"
+        )
+        # Could check if it's in any pending orders
+    else:
+        # Product was reactivated
+        audit.record(
+            "product.reactivated", instance, f"Product '{instance.name}' was reactivated"
+        )
 
 
 @receiver(post_save, sender=Product)
@@ -31,7 +57,12 @@ def log_new_product(sender, instance, created, **kwargs):
     Could be used for inventory notifications, etc.
     """
     if created:
-        print(f"New product created: {instance.name} for {instance.company.name}")
+        audit.record(
+            "product.created",
+            instance,
+            f"New product created: {instance.name} for {instance.company.name}",
+            company_id=instance.company_id,
+        )
 
 
 @receiver(post_delete, sender=Product)
@@ -39,4 +70,41 @@ def log_product_deletion(sender, instance, **kwargs):
     """
     Log product deletions for audit purposes.
     """
-    print(f"Product deleted: {instance.name} (ID: {instance.id})")
\ No newline at end of file
+    audit.record(
+        "product.deleted",
+        instance,
+        f"Product deleted: {instance.name} (ID: {instance.id})",
+        company_id=instance.company_id,
+    )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_company_product_counts(sender, instance, **kwargs):
+    """
+    Drop the cached product counters and bump the catalog version of the
+    product's company (and of its previous company when the product was
+    moved).
+    """
+    invalidate_product_counts(instance.company_id)
+    bump_catalog_version(instance.company_id)
+    if kwargs.get("created") is False and instance.has_saved_change(
+        "company", kwargs.get("update_fields")
+    ):
+        invalidate_product_counts(instance.get_original("company"))
+        bump_catalog_version(instance.get_original("company"))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def refresh_company_order_counts(sender, instance, **kwargs):
+    """
+    Deleting a product removes its line items, and moving it changes which
+    company its orders count towards; refresh the affected order counts.
+    """
+    if kwargs.get("created") is None:
+        refresh_order_counts([instance.company_id])
+    elif kwargs["created"] is False and instance.has_saved_change(
+        "company", kwargs.get("update_fields")
+    ):
+        refresh_order_counts([instance.company_id, instance.get_original("company")])
@@ -1,3 +1,66 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from company_app.models import Company
+from core.deferred import forbid_deferred_loads
+from core.models import AuditEvent
+from user_app.models import User
+from .models import Product
+
+
+class ProductListTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.client.force_login(self.user)
+        self.company = Company.objects.create(name="Acme")
+
+    def test_list_reads_no_deferred_fields(self):
+        for i in range(5):
+            Product.objects.create(
+                company=self.company, name=f"Product {i}", item_no=f"P{i}", item_type="C"
+            )
+
+        # User, count and one page of products, however many rows
+        with forbid_deferred_loads(), self.assertNumQueries(3):
+            response = self.client.get(reverse("products:product_list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Product 4")
+
+
+class ProductStatusTrackingTests(TestCase):
+    def setUp(self):
+        # Flush the creation events, so later events get their own batch
+        with self.captureOnCommitCallbacks(execute=True):
+            company = Company.objects.create(name="Acme")
+            Product.objects.create(company=company, name="Ham", item_type="C")
+        self.product = Product.objects.get(name="Ham")
+
+    def test_status_change_with_update_fields(self):
+        self.product.active = False
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # Only the UPDATE; the audit event is written on commit
+            with self.assertNumQueries(1):
+                self.product.save(update_fields=["active"])
+
+        self.assertFalse(self.product.has_changed("active"))
+        self.assertTrue(
+            AuditEvent.objects.filter(
+                event_type="product.deactivated", entity_id=self.product.pk
+            ).exists()
+        )
+
+    def test_other_update_fields_leave_the_status_pending(self):
+        self.product.active = False
+        self.product.name = "Smoked ham"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                self.product.save(update_fields=["name"])
+
+        # active was not written, so it is still a change
+        self.assertTrue(self.product.has_changed("active"))
+        self.assertFalse(
+            AuditEvent.objects.filter(event_type="product.deactivated").exists()
+        )
@@ -12,11 +12,10 @@ class ProductListView(LoginRequiredMixin, PageTitleMixin, ListView):
     context_object_name = "products"
     paginate_by = 50
     page_title = "All Products"
+    replica_reads = True
 
     def get_queryset(self):
-        queryset = Product.objects.select_related("company").order_by(
-            "company__name", "item_no"
-        )
+        queryset = Product.objects.for_list().order_by("company__name", "item_no")
 
         company_id = self.request.GET.get("company")
         if company_id:
@@ -87,3 +87,31 @@ function showBanner(message, type) {
 
   return banner;
 }
+
+// Global function to create an Idempotency-Key. Reuse the same key when
+// retrying a submission so the server does not apply it twice.
+function newIdempotencyKey() {
+  if (window.crypto && typeof window.crypto.randomUUID === "function") {
+    return window.crypto.randomUUID();
+  }
+  // randomUUID needs a secure context; fall back for plain http hosts
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random()
+    .toString(36)
+    .slice(2)}`;
+}
+
+// Global function to follow the live order and catalog events (see
+// api/streams.py). `after` is the event id the page was rendered at, so no
+// event in between is missed; handlers receive the order or company id.
+// The browser reconnects by itself and resumes from the last event seen.
+function subscribeLiveEvents(after, handlers) {
+  if (!window.EventSource) return null;
+
+  const source = new EventSource(`/api/events/?after=${after}`);
+  Object.entries(handlers).forEach(([type, handler]) => {
+    source.addEventListener(type, function (e) {
+      handler(JSON.parse(e.data).id);
+    });
+  });
+  return source;
+}
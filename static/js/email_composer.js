@@ -1,3 +1,6 @@
+const USER_INFO_STORAGE_KEY = "emailComposer.userInfo";
+const AUTOSAVE_DELAY_MS = 2000;
+
 class EmailComposer {
   constructor() {
     this.isMinimized = false;
@@ -6,6 +9,16 @@ class EmailComposer {
     this.hasUnsavedChanges = false;
     this.emailSent = false;
     this.templates = [];
+    // Autosave state: the server-side draft version this tab last saw, the
+    // fields it last saved, the pending debounce timer and in-flight save
+    this.draftVersion = 0;
+    this.lastSavedKey = null;
+    this.autosaveTimer = null;
+    this.saving = false;
+    this.saveQueued = false;
+    // Identifies one send; renewed whenever the email changes, so retries
+    // and double clicks send it only once
+    this.sendKey = null;
     this.init();
   }
 
@@ -102,7 +115,7 @@ class EmailComposer {
     });
 
     $("#saveDraft").click(function () {
-      self.saveDraft();
+      self.saveDraft({ auto: false });
     });
 
     $("#emailForm").submit(function (e) {
@@ -116,6 +129,8 @@ class EmailComposer {
         $("#draftIndicator").hide();
         self.hasDraft = false;
       }
+      self.sendKey = null;
+      self.scheduleAutosave();
     });
 
     // Template selection
@@ -127,26 +142,49 @@ class EmailComposer {
     });
   }
 
-  async loadUserInfo() {
+  // User info (sender name, signature, templates) is cached for the browser
+  // session together with its ETag, and only re-sent by the server when the
+  // ETag no longer matches.
+  getCachedUserInfo() {
     try {
-      const response = await $.ajax({
-        url: "/api/user/email-info/",
-        type: "GET",
-        headers: { "X-Requested-With": "XMLHttpRequest" },
-      });
+      return JSON.parse(sessionStorage.getItem(USER_INFO_STORAGE_KEY));
+    } catch (error) {
+      return null;
+    }
+  }
 
-      if (response.success) {
-        $("#senderName").text(response.sender_name);
-        this.userInfo = response;
-        this.templates = response.templates || [];
+  setUserInfo(info) {
+    $("#senderName").text(info.sender_name);
+    this.userInfo = info;
+    this.templates = info.templates || [];
+    this.populateTemplates();
+  }
+
+  async bootstrap(orderId) {
+    const cached = this.getCachedUserInfo();
+    const response = await $.ajax({
+      url: `/api/orders/${orderId}/composer/`,
+      type: "GET",
+      data: cached ? { user_info: cached.etag } : {},
+      headers: { "X-Requested-With": "XMLHttpRequest" },
+    });
 
-        // Populate template selector
-        this.populateTemplates();
+    let info = response.user_info;
+    if (info) {
+      try {
+        sessionStorage.setItem(
+          USER_INFO_STORAGE_KEY,
+          JSON.stringify({ etag: response.user_info_etag, info: info })
+        );
+      } catch (error) {
+        // Storage full or disabled: the info is simply re-sent next time
       }
-    } catch (error) {
-      console.error("Failed to load user info:", error);
-      $("#senderName").text("Order Form");
+    } else {
+      info = cached.info;
     }
+
+    this.setUserInfo(info);
+    return response;
   }
 
   populateTemplates() {
@@ -182,6 +220,8 @@ class EmailComposer {
         $("#emailSubject").val(response.subject);
         $("#emailContent").val(response.body);
         this.hasUnsavedChanges = true;
+        this.sendKey = null;
+        this.scheduleAutosave();
         this.showNotification("Template applied", "success");
       }
     } catch (error) {
@@ -194,24 +234,31 @@ class EmailComposer {
     this.orderData = orderData;
     this.hasUnsavedChanges = false;
     this.emailSent = false;
-
-    await this.loadUserInfo();
+    this.draftVersion = 0;
+    this.lastSavedKey = null;
 
     $("#orderId").val(orderData.order_id);
 
-    const hasDraft = await this.loadDraft(orderData.order_id);
+    let response = null;
+    try {
+      response = await this.bootstrap(orderData.order_id);
+    } catch (error) {
+      console.error("Failed to load composer:", error);
+      $("#senderName").text("Order Form");
+    }
 
-    if (!hasDraft) {
+    if (response && response.draft) {
+      this.showDraft(response.draft);
+    } else {
       $("#emailTo").val(companyEmail || "");
 
-      // Check for default template
-      const defaultTemplate = this.templates.find((t) => t.is_default);
-      if (defaultTemplate) {
-        await this.applyTemplate(defaultTemplate.id);
-        this.hasUnsavedChanges = false;
+      if (response && response.rendered) {
+        $("#emailSubject").val(response.rendered.subject);
+        $("#emailContent").val(response.rendered.body);
       } else {
-        // Render with no template (uses fallback)
-        await this.renderDefaultContent();
+        // Fallback to basic template
+        $("#emailSubject").val("Order Request");
+        $("#emailContent").val(this.generateBasicContent(orderData));
       }
 
       this.hasDraft = false;
@@ -221,30 +268,6 @@ class EmailComposer {
     $("#emailComposer").addClass("show").fadeIn(300);
   }
 
-  async renderDefaultContent() {
-    try {
-      const response = await $.ajax({
-        url: "/api/email/render-template/",
-        type: "POST",
-        data: {
-          order_id: this.orderData.order_id,
-          csrfmiddlewaretoken: $("[name=csrfmiddlewaretoken]").val(),
-        },
-        headers: { "X-Requested-With": "XMLHttpRequest" },
-      });
-
-      if (response.success) {
-        $("#emailSubject").val(response.subject);
-        $("#emailContent").val(response.body);
-      }
-    } catch (error) {
-      // Fallback to basic template
-      $("#emailSubject").val("Order Request");
-      const content = this.generateBasicContent(this.orderData);
-      $("#emailContent").val(content);
-    }
-  }
-
   generateBasicContent(orderData) {
     let content = "Hello,\n\nHere is my order:\n\n";
 
@@ -266,31 +289,19 @@ class EmailComposer {
     return content;
   }
 
-  async loadDraft(orderId) {
-    try {
-      const response = await $.ajax({
-        url: `/api/orders/${orderId}/draft/`,
-        type: "GET",
-        headers: { "X-Requested-With": "XMLHttpRequest" },
-      });
-
-      if (response.success && response.draft) {
-        $("#emailTo").val(response.draft.to);
-        $("#emailSubject").val(response.draft.subject);
-        $("#emailContent").val(response.draft.content);
-
-        this.hasDraft = true;
-        this.hasUnsavedChanges = false;
-        $("#draftIndicator").show();
+  showDraft(draft, message = "Draft loaded") {
+    $("#emailTo").val(draft.to);
+    $("#emailSubject").val(draft.subject);
+    $("#emailContent").val(draft.content);
 
-        this.showNotification("Draft loaded", "success");
-        return true;
-      }
+    this.sendKey = null;
+    this.draftVersion = draft.version;
+    this.lastSavedKey = this.draftKey(this.getDraftFields());
+    this.hasDraft = true;
+    this.hasUnsavedChanges = false;
+    $("#draftIndicator").show();
 
-      return false;
-    } catch (error) {
-      return false;
-    }
+    this.showNotification(message, "success");
   }
 
   toggleMinimize() {
@@ -314,7 +325,10 @@ class EmailComposer {
         $("#emailContent").val().trim() !== "" ||
         $("#emailTo").val().trim() !== "";
 
-      if (
+      if (hasContent && !this.saving) {
+        // Flush the pending autosave; the request outlives the form reset
+        this.saveDraft({ auto: true });
+      } else if (
         hasContent &&
         !confirm("Close without saving? Any unsaved changes will be lost.")
       ) {
@@ -327,6 +341,12 @@ class EmailComposer {
   }
 
   resetForm() {
+    this.sendKey = null;
+    clearTimeout(this.autosaveTimer);
+    this.autosaveTimer = null;
+    this.draftVersion = 0;
+    this.lastSavedKey = null;
+    this.saveQueued = false;
     $("#emailForm")[0].reset();
     $("#templateSelect").val("");
     this.hasDraft = false;
@@ -340,40 +360,108 @@ class EmailComposer {
       .addClass("fa-window-minimize");
   }
 
-  saveDraft() {
-    const formData = {
-      order_id: $("#orderId").val(),
+  getDraftFields() {
+    return {
       to: $("#emailTo").val(),
       subject: $("#emailSubject").val(),
       content: $("#emailContent").val(),
-      csrfmiddlewaretoken: $("[name=csrfmiddlewaretoken]").val(),
     };
+  }
+
+  draftKey(fields) {
+    return JSON.stringify([fields.to, fields.subject, fields.content]);
+  }
+
+  scheduleAutosave() {
+    clearTimeout(this.autosaveTimer);
+    this.autosaveTimer = setTimeout(() => {
+      this.autosaveTimer = null;
+      this.saveDraft({ auto: true });
+    }, AUTOSAVE_DELAY_MS);
+  }
+
+  // Saves are versioned: the server applies a save only on top of the
+  // version this tab last saw and answers 409 with the newer draft
+  // otherwise. Unchanged content is never sent.
+  saveDraft({ auto = false } = {}) {
+    const orderId = $("#orderId").val();
+    if (!orderId || this.emailSent) return;
 
+    clearTimeout(this.autosaveTimer);
+    this.autosaveTimer = null;
+
+    if (this.saving) {
+      this.saveQueued = true;
+      return;
+    }
+
+    const fields = this.getDraftFields();
+    const key = this.draftKey(fields);
+    if (key === this.lastSavedKey) {
+      if (!auto) this.showNotification("Draft saved successfully!", "success");
+      return;
+    }
+
+    this.saving = true;
     $.ajax({
       url: "/api/orders/save-draft/",
       type: "POST",
-      data: formData,
+      data: {
+        ...fields,
+        order_id: orderId,
+        version: this.draftVersion,
+        csrfmiddlewaretoken: $("[name=csrfmiddlewaretoken]").val(),
+      },
       headers: { "X-Requested-With": "XMLHttpRequest" },
       success: (response) => {
-        if (response.success) {
+        // The composer may have been closed or moved on to another order
+        if ($("#orderId").val() !== orderId) return;
+
+        this.draftVersion = response.version;
+        this.lastSavedKey = key;
+        if (this.draftKey(this.getDraftFields()) === key) {
           this.hasDraft = true;
           this.hasUnsavedChanges = false;
           $("#draftIndicator").show();
-          this.showNotification("Draft saved successfully!", "success");
-        } else {
-          this.showNotification(
-            response.message || "Failed to save draft",
-            "error"
-          );
         }
+        if (!auto) this.showNotification("Draft saved successfully!", "success");
       },
       error: (xhr) => {
-        this.showNotification("Error saving draft", "error");
+        if ($("#orderId").val() !== orderId) return;
+
+        if (xhr.status === 409) {
+          const draft = xhr.responseJSON?.draft;
+          if (draft) {
+            this.showDraft(
+              draft,
+              "This draft was changed in another window. Loaded the newer version."
+            );
+          } else {
+            this.draftVersion = 0;
+            this.lastSavedKey = null;
+            this.showNotification(
+              "This draft was removed in another window.",
+              "error"
+            );
+          }
+          return;
+        }
+
+        const errorMsg = xhr.responseJSON?.message || "Error saving draft";
+        if (!auto) this.showNotification(errorMsg, "error");
+      },
+      complete: () => {
+        this.saving = false;
+        if (this.saveQueued) {
+          this.saveQueued = false;
+          this.saveDraft({ auto: true });
+        }
       },
     });
   }
 
   sendEmail() {
+    this.sendKey = this.sendKey || newIdempotencyKey();
     const formData = {
       order_id: $("#orderId").val(),
       to: $("#emailTo").val(),
@@ -386,9 +474,13 @@ class EmailComposer {
       url: "/api/orders/send-email/",
       type: "POST",
       data: formData,
-      headers: { "X-Requested-With": "XMLHttpRequest" },
+      headers: {
+        "X-Requested-With": "XMLHttpRequest",
+        "Idempotency-Key": this.sendKey,
+      },
       success: (response) => {
         if (response.success) {
+          clearTimeout(this.autosaveTimer);
           this.emailSent = true;
           this.hasUnsavedChanges = false;
 
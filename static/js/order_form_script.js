@@ -4,6 +4,18 @@ $(document).ready(function () {
   // Hide banner initially (use JS banner for this page)
   $(".banner").hide();
 
+  // Only the rows in view (plus a small buffer) are in the DOM, so large
+  // catalogs render instantly. Quantities live in a sparse map keyed by
+  // product id, which survives filtering and scrolling.
+  const ROW_BUFFER = 10;
+  let catalog = [];
+  let filtered = [];
+  let quantities = new Map();
+  let rowHeight = 49;
+  let renderPending = false;
+  // One key per distinct order, so double submits create a single order
+  let idempotencyKey = newIdempotencyKey();
+
   // Company selection handler
   $("#companySelect").change(function (e) {
     e.preventDefault();
@@ -17,15 +29,7 @@ $(document).ready(function () {
     }
 
     // Fetch products for selected company
-    $.ajax({
-      type: "POST",
-      url: `/api/products/company/${companyId}/`,
-      data: {
-        csrfmiddlewaretoken: $("input[name=csrfmiddlewaretoken]").val(),
-      },
-      headers: {
-        "X-Requested-With": "XMLHttpRequest",
-      },
+    fetchCatalog(companyId, {
       success: function (data) {
         if (!data.success) {
           showBanner(data.message, "warning");
@@ -47,25 +51,49 @@ $(document).ready(function () {
     });
   });
 
+  function fetchCatalog(companyId, callbacks) {
+    return $.ajax({
+      type: "POST",
+      url: `/api/products/company/${companyId}/`,
+      data: {
+        csrfmiddlewaretoken: $("input[name=csrfmiddlewaretoken]").val(),
+      },
+      headers: {
+        "X-Requested-With": "XMLHttpRequest",
+      },
+      ...callbacks,
+    });
+  }
+
+  // Merge catalog changes (products added, renamed or deactivated by a
+  // colleague) into the open grid, keeping the quantities entered so far
+  let catalogRefreshTimer = null;
+
+  subscribeLiveEvents(LIVE_EVENTS_AFTER, {
+    "catalog.changed": function (companyId) {
+      if (!catalog.length || companyId !== parseInt($("#companySelect").val())) {
+        return;
+      }
+      // Bulk edits arrive as a burst; refetch once
+      clearTimeout(catalogRefreshTimer);
+      catalogRefreshTimer = setTimeout(function () {
+        fetchCatalog(companyId, {
+          success: function (data) {
+            updateCatalog(data.success ? data.products : []);
+          },
+        });
+      }, 500);
+    },
+  });
+
   // Form submission handler
   $("#newOrderForm").submit(function (e) {
     e.preventDefault();
 
-    // Collect product quantities
-    const orderData = {
-      csrfmiddlewaretoken: $("input[name=csrfmiddlewaretoken]").val(),
-    };
+    // Only non-zero quantities are kept in the map
+    const items = Array.from(quantities.entries());
 
-    let hasItems = false;
-    $("input[name^='product_']").each(function () {
-      const quantity = parseInt($(this).val());
-      if (quantity > 0) {
-        orderData[$(this).attr("name")] = quantity;
-        hasItems = true;
-      }
-    });
-
-    if (!hasItems) {
+    if (!items.length) {
       showBanner(
         "Please select at least one product with quantity > 0",
         "warning"
@@ -77,9 +105,16 @@ $(document).ready(function () {
     $.ajax({
       type: "POST",
       url: "/api/orders/create/",
-      data: orderData,
+      contentType: "application/json",
+      data: JSON.stringify({
+        version: 1,
+        company_id: parseInt($("#companySelect").val()),
+        items: items,
+      }),
       headers: {
         "X-Requested-With": "XMLHttpRequest",
+        "X-CSRFToken": $("input[name=csrfmiddlewaretoken]").val(),
+        "Idempotency-Key": idempotencyKey,
       },
       success: function (data) {
         if (data.success) {
@@ -98,46 +133,190 @@ $(document).ready(function () {
     });
   });
 
-  // Helper function to render product table
+  // Helper function to render the product grid shell; rows are rendered
+  // by renderVisibleRows as the grid scrolls
   function renderProductTable(companyName, products) {
-    let html = `
-      <table class="table table-striped">
-        <caption>New Order for ${companyName}</caption>
-        <thead>
-          <tr>
-            <th>Item No.</th>
-            <th>Name</th>
-            <th>Type</th>
-            <th>Quantity</th>
-          </tr>
-        </thead>
-        <tbody>
+    catalog = products.map(withSearchText);
+    filtered = catalog;
+    quantities = new Map();
+
+    const html = `
+      <div class="form-group product-filter">
+        <input type="search"
+               id="productFilter"
+               class="form-control"
+               placeholder="Filter ${catalog.length} products by name or item number"
+               autocomplete="off">
+      </div>
+      <div class="product-grid" id="productGrid">
+        <table class="table table-striped">
+          <caption>
+            New Order for ${escapeHtml(companyName)}
+            <span class="product-grid-summary" id="productGridSummary"></span>
+          </caption>
+          <thead>
+            <tr>
+              <th>Item No.</th>
+              <th>Name</th>
+              <th>Type</th>
+              <th>Quantity</th>
+            </tr>
+          </thead>
+          <tbody id="productRows"></tbody>
+        </table>
+      </div>
     `;
 
-    products.forEach((product) => {
-      const itemType = product.item_type === "W" ? "Weight" : "Case";
-      html += `
-        <tr>
-          <td>${product.item_no || "N/A"}</td>
-          <td>${product.name}</td>
-          <td>${itemType}</td>
-          <td>
-            <input type="number"
-                   name="product_${product.id}"
-                   id="product_${product.id}"
-                   value="0"
-                   min="0"
-                   class="form-control quantity-input">
-          </td>
-        </tr>
-      `;
+    $("#productForm").html(html).show();
+
+    $("#productGrid").on("scroll", function () {
+      if (renderPending) return;
+      renderPending = true;
+      window.requestAnimationFrame(function () {
+        renderPending = false;
+        renderVisibleRows();
+      });
     });
 
-    html += `
-        </tbody>
-      </table>
+    $("#productFilter").on("input", function () {
+      applyFilter();
+      $("#productGrid").scrollTop(0);
+      renderVisibleRows();
+    });
+
+    // One delegated handler instead of one per input
+    $("#productRows").on("input", ".quantity-input", function () {
+      const productId = parseInt($(this).data("productId"));
+      const quantity = parseInt($(this).val());
+      if (quantity > 0) {
+        quantities.set(productId, quantity);
+      } else {
+        quantities.delete(productId);
+      }
+      idempotencyKey = newIdempotencyKey();
+      updateSummary();
+    });
+
+    renderVisibleRows();
+    measureRowHeight();
+    updateSummary();
+  }
+
+  function updateCatalog(products) {
+    catalog = products.map(withSearchText);
+    const available = new Set(catalog.map((product) => product.id));
+
+    let dropped = 0;
+    for (const productId of Array.from(quantities.keys())) {
+      if (!available.has(productId)) {
+        quantities.delete(productId);
+        dropped++;
+      }
+    }
+
+    applyFilter();
+    renderVisibleRows();
+    updateSummary();
+    $("#productFilter").attr(
+      "placeholder",
+      `Filter ${catalog.length} products by name or item number`
+    );
+
+    if (dropped) {
+      idempotencyKey = newIdempotencyKey();
+      showBanner(
+        `${dropped} selected product${dropped === 1 ? " is" : "s are"} no longer available and ${dropped === 1 ? "was" : "were"} removed from the order.`,
+        "warning"
+      );
+    }
+  }
+
+  function withSearchText(product) {
+    return {
+      ...product,
+      search: `${product.item_no || ""} ${product.name}`.toLowerCase(),
+    };
+  }
+
+  function applyFilter() {
+    const term = ($("#productFilter").val() || "").trim().toLowerCase();
+    filtered = term
+      ? catalog.filter((product) => product.search.includes(term))
+      : catalog;
+  }
+
+  function renderVisibleRows() {
+    const grid = document.getElementById("productGrid");
+    if (!grid) return;
+
+    const visibleCount = Math.ceil(grid.clientHeight / rowHeight) + ROW_BUFFER * 2;
+    // Start on an even row so the striping does not flicker while scrolling
+    let start = Math.max(0, Math.floor(grid.scrollTop / rowHeight) - ROW_BUFFER);
+    start -= start % 2;
+    const end = Math.min(filtered.length, start + visibleCount);
+
+    let html = spacerRow(start * rowHeight);
+    for (let i = start; i < end; i++) {
+      html += productRow(filtered[i]);
+    }
+    html += spacerRow((filtered.length - end) * rowHeight);
+
+    if (!filtered.length) {
+      html = `<tr><td colspan="4" class="no-data">No products match the filter.</td></tr>`;
+    }
+
+    // Keep focus on the quantity being edited when rows are re-rendered
+    const focusedId = $(document.activeElement).data("productId");
+    document.getElementById("productRows").innerHTML = html;
+    if (focusedId !== undefined) {
+      $(`#product_${focusedId}`).trigger("focus");
+    }
+  }
+
+  function measureRowHeight() {
+    const row = $("#productRows tr.product-row").first();
+    if (row.length && row.outerHeight()) {
+      rowHeight = row.outerHeight();
+      renderVisibleRows();
+    }
+  }
+
+  function productRow(product) {
+    const itemType = product.item_type === "W" ? "Weight" : "Case";
+    const quantity = quantities.get(product.id) || 0;
+    return `
+      <tr class="product-row">
+        <td>${escapeHtml(product.item_no || "N/A")}</td>
+        <td>${escapeHtml(product.name)}</td>
+        <td>${itemType}</td>
+        <td>
+          <input type="number"
+                 id="product_${product.id}"
+                 data-product-id="${product.id}"
+                 value="${quantity}"
+                 min="0"
+                 class="form-control quantity-input">
+        </td>
+      </tr>
     `;
+  }
 
-    $("#productForm").html(html).show();
+  function spacerRow(height) {
+    return `<tr class="spacer-row" style="height: ${height}px"><td colspan="4"></td></tr>`;
+  }
+
+  function updateSummary() {
+    const count = quantities.size;
+    $("#productGridSummary").text(
+      count ? `(${count} product${count === 1 ? "" : "s"} selected)` : ""
+    );
+  }
+
+  function escapeHtml(value) {
+    return String(value)
+      .replace(/&/g, "&amp;")
+      .replace(/</g, "&lt;")
+      .replace(/>/g, "&gt;")
+      .replace(/"/g, "&quot;");
   }
 });
@@ -0,0 +1,44 @@
+"""
+Authentication backend tuned for the per-request session user lookup.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+
+# Columns most requests never read. They are loaded on demand, see
+# User.load_fields() and User.get_email_signature().
+SESSION_DEFERRED_FIELDS = ("email_signature", "timezone")
+
+
+class SessionUserBackend(ModelBackend):
+    """
+    ModelBackend whose get_user() - run by AuthenticationMiddleware and DRF's
+    SessionAuthentication on every authenticated request - leaves out the
+    large or rarely used User columns.
+
+    The active timezone comes from the session (see core.middleware), so the
+    timezone column is not needed to render a page.
+
+    ModelBackend stays listed after it, so sessions that were logged in
+    through ModelBackend still resolve.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username, password, **kwargs)
+        if user is None and password is not None:
+            # Stop authenticate() here: ModelBackend would hash the same
+            # password against the same user again. The caller still just
+            # gets None.
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.defer(*SESSION_DEFERRED_FIELDS).get(
+                pk=user_id
+            )
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
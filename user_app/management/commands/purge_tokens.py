@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.purge import delete_in_batches
+from user_app.models import AccountActivationToken, PasswordResetToken
+
+
+class Command(BaseCommand):
+    help = "Deletes expired and used password reset and activation tokens in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per statement (keeps write locks short)",
+        )
+        parser.add_argument(
+            "--retention-hours",
+            type=int,
+            default=getattr(settings, "AUTH_TOKEN_RETENTION_HOURS", 24),
+            help="Keep expired and used tokens this long",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many tokens would be deleted",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=max(options["retention_hours"], 0))
+
+        for model, label in (
+            (PasswordResetToken, "password reset token(s)"),
+            (AccountActivationToken, "activation token(s)"),
+        ):
+            purgeable = model.purgeable(cutoff)
+
+            if options["dry_run"]:
+                self.stdout.write(f"{purgeable.count()} purgeable {label}")
+                continue
+
+            deleted = delete_in_batches(purgeable, options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} {label}"))
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user_app", "0006_user_email_signature_alter_user_is_active_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="accountactivationtoken",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="activation_tokens",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="emailtemplate",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="email_templates",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="passwordresettoken",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="password_reset_tokens",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accountactivationtoken",
+            index=models.Index(
+                fields=["user", "-created_at"], name="user_app_ac_user_id_fc47cb_idx"
+            ),
+        ),
+    ]
@@ -2,18 +2,28 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
 from django.conf import settings
+from django.core.cache import cache
 import pytz
 import secrets
 import hashlib
 import re
 from datetime import timedelta
+from core.tracking import FieldTrackerMixin
 
 TIMEZONE_CHOICES = [(tz, tz) for tz in pytz.common_timezones]
 
+ACTIVATION_TOKEN_TIME_KEY = "user:{user_id}:activation_token_time"
 
-class User(AbstractUser):
+
+def get_activation_resend_cooldown():
+    return getattr(settings, "ACTIVATION_RESEND_COOLDOWN_SECONDS", 60)
+
+
+class User(FieldTrackerMixin, AbstractUser):
     """Custom user model with activation support and profile info"""
 
+    tracked_fields = ("password",)
+
     email = models.EmailField(unique=True)
 
     # Profile fields
@@ -72,33 +82,85 @@ class User(AbstractUser):
         app_name = getattr(settings, "EMAIL_SENDER_NAME", "Order Form")
         return f"{display} via {app_name}"
 
-    def can_resend_activation(self):
-        """Check if enough time has passed to resend activation email"""
-        cooldown = getattr(settings, "ACTIVATION_RESEND_COOLDOWN_SECONDS", 60)
-        latest_token = self.activation_tokens.order_by("-created_at").first()
+    def load_fields(self, *names):
+        """
+        Fetch deferred columns (the given ones, or all of them) in one query.
+
+        The session user is loaded without some columns, see
+        user_app.backends.SessionUserBackend.
+        """
+        deferred = self.get_deferred_fields()
+        missing = [name for name in (names or deferred) if name in deferred]
+        if missing:
+            values = type(self)._base_manager.filter(pk=self.pk).values(*missing).get()
+            for name, value in values.items():
+                setattr(self, name, value)
+        return self
+
+    async def aload_fields(self, *names):
+        """Async version of load_fields()"""
+        deferred = self.get_deferred_fields()
+        missing = [name for name in (names or deferred) if name in deferred]
+        if missing:
+            values = await type(self)._base_manager.filter(pk=self.pk).values(*missing).aget()
+            for name, value in values.items():
+                setattr(self, name, value)
+        return self
+
+    def get_email_signature(self):
+        """Get the email signature, fetching only that column if deferred"""
+        return self.load_fields("email_signature").email_signature
+
+    async def aget_email_signature(self):
+        """Async version of get_email_signature()"""
+        return (await self.aload_fields("email_signature")).email_signature
+
+    def get_latest_activation_token_time(self):
+        """
+        created_at of the user's newest activation token, or None.
 
-        if not latest_token:
-            return True
+        Kept in the cache for the resend cooldown (AccountActivationToken
+        sets it when it creates a token) and memoized on the instance, so
+        the cooldown checks share one lookup.
+        """
+        if not hasattr(self, "_latest_activation_token_time"):
+            key = ACTIVATION_TOKEN_TIME_KEY.format(user_id=self.pk)
+            latest = cache.get(key)
+            if latest is None:
+                # Walks the (user, -created_at) index
+                latest = (
+                    self.activation_tokens.order_by("-created_at")
+                    .values_list("created_at", flat=True)
+                    .first()
+                )
+                if latest is not None:
+                    cache.set(key, latest, get_activation_resend_cooldown())
+            self._latest_activation_token_time = latest
+        return self._latest_activation_token_time
 
-        elapsed = (timezone.now() - latest_token.created_at).total_seconds()
-        return elapsed >= cooldown
+    def can_resend_activation(self):
+        """Check if enough time has passed to resend activation email"""
+        return self.get_resend_cooldown_remaining() == 0
 
     def get_resend_cooldown_remaining(self):
         """Get remaining seconds until user can resend activation"""
-        cooldown = getattr(settings, "ACTIVATION_RESEND_COOLDOWN_SECONDS", 60)
-        latest_token = self.activation_tokens.order_by("-created_at").first()
+        latest = self.get_latest_activation_token_time()
 
-        if not latest_token:
+        if not latest:
             return 0
 
-        elapsed = (timezone.now() - latest_token.created_at).total_seconds()
-        remaining = cooldown - elapsed
+        elapsed = (timezone.now() - latest).total_seconds()
+        remaining = get_activation_resend_cooldown() - elapsed
         return max(0, int(remaining))
 
     def get_default_template(self):
         """Get user's default email template or None"""
         return self.email_templates.filter(is_default=True).first()
 
+    async def aget_default_template(self):
+        """Async version of get_default_template()"""
+        return await self.email_templates.filter(is_default=True).afirst()
+
 
 class EmailTemplate(models.Model):
     """
@@ -116,8 +178,9 @@ class EmailTemplate(models.Model):
     - %signature% - The user's email signature
     """
 
+    # Lookups by user use the unique (user, name) index
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="email_templates"
+        User, on_delete=models.CASCADE, related_name="email_templates", db_index=False
     )
     name = models.CharField(
         max_length=100, help_text="A name to identify this template"
@@ -206,11 +269,29 @@ Here is my order:
         )
 
 
-class PasswordResetToken(models.Model):
+class PurgeableTokenMixin:
+    """
+    For token models with expires_at and used_at; the purge_tokens command
+    deletes what purgeable() returns.
+    """
+
+    @classmethod
+    def purgeable(cls, cutoff):
+        """Tokens that expired or were used before `cutoff`"""
+        return cls.objects.filter(
+            models.Q(expires_at__lte=cutoff) | models.Q(used_at__lte=cutoff)
+        )
+
+
+class PasswordResetToken(PurgeableTokenMixin, models.Model):
     """Stores password reset tokens with expiration and blacklist functionality."""
 
+    # Lookups by user use the (user, created_at) index
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="password_reset_tokens"
+        User,
+        on_delete=models.CASCADE,
+        related_name="password_reset_tokens",
+        db_index=False,
     )
     token_hash = models.CharField(max_length=64, unique=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -294,11 +375,15 @@ class PasswordResetToken(models.Model):
         self.save(update_fields=["is_blacklisted", "used_at"])
 
 
-class AccountActivationToken(models.Model):
+class AccountActivationToken(PurgeableTokenMixin, models.Model):
     """Stores account activation tokens."""
 
+    # Lookups by user use the (user, -created_at) index
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="activation_tokens"
+        User,
+        on_delete=models.CASCADE,
+        related_name="activation_tokens",
+        db_index=False,
     )
     token_hash = models.CharField(max_length=64, unique=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -308,6 +393,9 @@ class AccountActivationToken(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+        ]
 
     def __str__(self):
         return f"Activation for {self.user.username} - {'Used' if self.is_used else 'Pending'}"
@@ -333,6 +421,12 @@ class AccountActivationToken(models.Model):
         token_obj = cls.objects.create(
             user=user, token_hash=token_hash, expires_at=expires_at
         )
+        cache.set(
+            ACTIVATION_TOKEN_TIME_KEY.format(user_id=user.pk),
+            token_obj.created_at,
+            get_activation_resend_cooldown(),
+        )
+        user._latest_activation_token_time = token_obj.created_at
 
         return raw_token, token_obj
 
@@ -3,6 +3,7 @@ from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
 from django.utils import timezone
+from core.mail import asend_messages
 from .models import PasswordResetToken
 
 
@@ -101,6 +102,23 @@ class EmailService:
             subject: Email subject
             content: Email body content
         """
+        EmailService.order_email_message(user, to_email, subject, content).send(
+            fail_silently=False
+        )
+
+        return True
+
+    @staticmethod
+    async def asend_order_email(user, to_email, subject, content):
+        """Async version of send_order_email(), through core.mail"""
+        message = EmailService.order_email_message(user, to_email, subject, content)
+        await asend_messages([message], fail_silently=False)
+
+        return True
+
+    @staticmethod
+    def order_email_message(user, to_email, subject, content):
+        """Build the order email (see send_order_email)"""
         # Build the "From" address with user's display name
         sender_name = user.get_email_sender_name()
         from_email = f'"{sender_name}" <{settings.DEFAULT_FROM_EMAIL}>'
@@ -108,13 +126,10 @@ class EmailService:
         # User's email will be the Reply-To
         reply_to = [user.email]
 
-        email = EmailMultiAlternatives(
+        return EmailMultiAlternatives(
             subject=subject,
             body=content,
             from_email=from_email,
             to=[to_email],
             reply_to=reply_to,
         )
-        email.send(fail_silently=False)
-
-        return True
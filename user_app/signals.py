@@ -2,48 +2,49 @@ from django.db.models.signals import post_save, pre_save
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.dispatch import receiver
 from django.utils import timezone
+from core.notifications import notify
+from core.timezones import remember_timezone
 from .models import User, EmailTemplate
 from .services import EmailService
 
 
 @receiver(post_save, sender=User)
-def create_default_template_for_new_user(sender, instance, created, **kwargs):
+def create_default_template_for_new_user(sender, instance, created, raw=False, **kwargs):
     """
     When a new user is created, automatically create a default email template.
     This ensures every user has at least one template to work with.
     """
-    if created:
-        # Check if they don't already have a default template
-        if not instance.email_templates.exists():
-            EmailTemplate.create_default_template(instance)
+    # A new user has no templates yet; fixtures bring their own
+    if created and not raw:
+        EmailTemplate.create_default_template(instance)
 
 
 @receiver(pre_save, sender=User)
 def track_password_changes(sender, instance, **kwargs):
     """
     Detect when a user's password is changed and send them an email notification.
-    This only works for password changes through the model, not through set_password().
+    Compares against the password hash snapshotted when the user was loaded,
+    so no extra query is needed.
     """
-    if instance.pk:  # Only for existing users, not new ones
-        try:
-            old_instance = User.objects.get(pk=instance.pk)
-            # Check if password has changed
-            if old_instance.password != instance.password:
-                # Mark that password was changed for post_save signal
-                instance._password_was_changed = True
-        except User.DoesNotExist:
-            pass
+    if instance.has_saved_change("password", kwargs.get("update_fields")):
+        # Mark that password was changed for post_save signal
+        instance._password_was_changed = True
 
 
 @receiver(post_save, sender=User)
 def send_password_change_notification(sender, instance, created, **kwargs):
     """
     Send email notification after password is saved.
-    Works in conjunction with pre_save signal above.
+    Works in conjunction with pre_save signal above. The email goes out once
+    per transaction, after it commits.
     """
     if not created and hasattr(instance, '_password_was_changed'):
         if instance._password_was_changed:
-            EmailService.send_password_changed_notification(instance)
+            notify(
+                ("password_changed", instance.pk),
+                EmailService.send_password_changed_notification,
+                instance,
+            )
             # Clean up the marker
             delattr(instance, '_password_was_changed')
 
@@ -59,6 +60,16 @@ def update_last_login_timezone(sender, request, user, **kwargs):
     pass
 
 
+@receiver(user_logged_in)
+def store_session_timezone(sender, request, user, **kwargs):
+    """
+    Keep the user's timezone in the session, so UserTimezoneMiddleware does
+    not need the timezone column on later requests.
+    """
+    if request is not None and hasattr(request, "session"):
+        remember_timezone(request.session, user.load_fields("timezone"))
+
+
 @receiver(user_logged_out)
 def log_user_logout(sender, request, user, **kwargs):
     """
@@ -1,3 +1,156 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import authenticate
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import AccountActivationToken, EmailTemplate, PasswordResetToken, User
+
+AJAX = {"X-Requested-With": "XMLHttpRequest"}
+
+
+class AuthenticationBackendTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+
+    def test_session_user_defers_rarely_used_columns(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("api:user_email_info"), headers=AJAX)
+        self.assertEqual(response.status_code, 200)
+
+    def test_sessions_from_model_backend_still_resolve(self):
+        self.client.force_login(
+            self.user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+        response = self.client.get(reverse("api:user_email_info"), headers=AJAX)
+        self.assertEqual(response.status_code, 200)
+
+    def test_failed_login_checks_the_password_once(self):
+        with mock.patch.object(
+            User, "check_password", autospec=True, return_value=False
+        ) as check_password:
+            self.assertIsNone(authenticate(username="buyer", password="wrong"))
+        self.assertEqual(check_password.call_count, 1)
+
+    def test_login(self):
+        self.assertEqual(authenticate(username="buyer", password="password123"), self.user)
+
+
+@override_settings(RATELIMIT_ENABLED=False)
+class AccountNotificationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+
+    def test_register_sends_one_activation_email(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("users:register"), {
+                "username": "newbie",
+                "email": "newbie@example.com",
+                "password1": "password123",
+                "password2": "password123",
+            })
+
+        self.assertRedirects(response, reverse("users:login"), fetch_redirect_response=False)
+        user = User.objects.get(username="newbie")
+        self.assertEqual(EmailTemplate.objects.filter(user=user).count(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["newbie@example.com"])
+
+    def test_change_password_sends_one_email(self):
+        self.client.force_login(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("users:change_password"), {
+                "current_password": "password123",
+                "new_password": "new-password456",
+                "confirm_password": "new-password456",
+            })
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new-password456"))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Your Password Was Changed - Order Form")
+
+    def test_reset_confirm_sends_one_email(self):
+        raw_token, _ = PasswordResetToken.create_for_user(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("users:reset_confirm", args=[raw_token]), {
+                "password1": "new-password456",
+                "password2": "new-password456",
+            })
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new-password456"))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_one_email_per_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password("new-password456")
+            self.user.save()
+            self.user.set_password("new-password789")
+            self.user.save()
+            self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_nothing_sent_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    self.user.set_password("new-password456")
+                    self.user.save()
+                    raise RuntimeError
+
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class PasswordTrackingTests(TestCase):
+    def setUp(self):
+        User.objects.create_user("buyer", "buyer@example.com", "password123")
+        self.user = User.objects.get(username="buyer")
+
+    def test_password_change_with_update_fields(self):
+        self.user.set_password("new-password456")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # Only the UPDATE; the email is sent on commit
+            with self.assertNumQueries(1):
+                self.user.save(update_fields=["password"])
+
+        self.assertFalse(self.user.has_changed("password"))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_other_update_fields_leave_the_password_pending(self):
+        self.user.set_password("new-password456")
+        self.user.first_name = "Pat"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                self.user.save(update_fields=["first_name"])
+
+        # The new hash was not written, so it is still a change
+        self.assertTrue(self.user.has_changed("password"))
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class PurgeTokensTests(TestCase):
+    def test_purges_expired_and_used_tokens(self):
+        user = User.objects.create_user("buyer", "buyer@example.com", "password123")
+        _, expired = PasswordResetToken.create_for_user(user)
+        _, live = AccountActivationToken.create_for_user(user)
+        _, used = AccountActivationToken.create_for_user(user)
+        long_ago = timezone.now() - timedelta(hours=48)
+        PasswordResetToken.objects.filter(pk=expired.pk).update(expires_at=long_ago)
+        AccountActivationToken.objects.filter(pk=used.pk).update(used_at=long_ago)
+
+        call_command("purge_tokens", "--retention-hours=24", stdout=StringIO())
+
+        self.assertFalse(PasswordResetToken.objects.exists())
+        self.assertEqual(list(AccountActivationToken.objects.values_list("pk", flat=True)), [live.pk])
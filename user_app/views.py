@@ -5,8 +5,12 @@ from django.views.generic import ListView, TemplateView, UpdateView, CreateView,
 from django.http import JsonResponse
 from django.utils import timezone
 from django.conf import settings
+from django.db import transaction
 from django.urls import reverse_lazy
 from core.mixins import PageTitleMixin, LoginRequiredMixin
+from core.notifications import notify
+from core.ratelimit import ratelimit
+from core.timezones import remember_timezone
 from .models import User, PasswordResetToken, AccountActivationToken, EmailTemplate
 from .services import EmailService
 from .forms import (
@@ -20,6 +24,7 @@ def index(request):
     return render(request, "user_app/index.html")
 
 
+@ratelimit("register", "user_app/register.html")
 def register(request):
     if request.user.is_authenticated:
         return redirect('dashboard:home')
@@ -57,17 +62,22 @@ def register(request):
                 'email': email
             })
 
-        user = User.objects.create_user(
-            username=username,
-            email=email,
-            password=password1,
-            is_activated=False
-        )
-
-        EmailTemplate.create_default_template(user)
+        # The default template is created by the post_save receiver
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username=username,
+                email=email,
+                password=password1,
+                is_activated=False
+            )
 
-        raw_token, token_obj = AccountActivationToken.create_for_user(user)
-        EmailService.send_activation_email(user, raw_token)
+            raw_token, token_obj = AccountActivationToken.create_for_user(user)
+            notify(
+                ("activation_email", user.pk),
+                EmailService.send_activation_email,
+                user,
+                raw_token,
+            )
 
         messages.success(
             request,
@@ -78,6 +88,7 @@ def register(request):
     return render(request, "user_app/register.html")
 
 
+@ratelimit("login", "user_app/login.html", account_field="username")
 def login(request):
     if request.user.is_authenticated:
         return redirect('dashboard:home')
@@ -112,6 +123,7 @@ def login(request):
     return render(request, "user_app/login.html")
 
 
+@ratelimit("resend_activation", "user_app/login.html", account_field="email")
 def resend_activation(request):
     """Resend activation email"""
     if request.method == "POST":
@@ -168,6 +180,7 @@ def activate_account(request, token):
     return redirect('users:login')
 
 
+@ratelimit("password_reset", "user_app/reset_password.html", account_field="email")
 def request_password_reset(request):
     """Request a password reset email"""
     if request.user.is_authenticated:
@@ -231,13 +244,13 @@ def reset_password_confirm(request, token):
                 'valid': True
             })
 
-        user = token_obj.user
-        user.set_password(password1)
-        user.save()
-
-        token_obj.blacklist()
+        # The post_save receiver sends the password changed email on commit
+        with transaction.atomic():
+            user = token_obj.user
+            user.set_password(password1)
+            user.save()
 
-        EmailService.send_password_changed_notification(user)
+            token_obj.blacklist()
 
         messages.success(
             request,
@@ -268,7 +281,8 @@ class AccountSettingsView(LoginRequiredMixin, PageTitleMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = self.request.user
+        # Both forms edit columns the session user defers
+        user = self.request.user.load_fields()
 
         context['profile_form'] = ProfileSettingsForm(instance=user)
         context['signature_form'] = EmailSignatureForm(instance=user)
@@ -290,6 +304,7 @@ def update_profile(request):
 
         if form.is_valid():
             form.save()
+            remember_timezone(request.session, form.instance)
             messages.success(request, 'Profile information updated successfully!')
         else:
             for field, errors in form.errors.items():
@@ -327,13 +342,13 @@ def change_password(request):
         form = ChangePasswordForm(user=request.user, data=request.POST)
 
         if form.is_valid():
-            request.user.set_password(form.cleaned_data['new_password'])
-            request.user.save()
+            # The post_save receiver sends the password changed email on commit
+            with transaction.atomic():
+                request.user.set_password(form.cleaned_data['new_password'])
+                request.user.save()
 
             update_session_auth_hash(request, request.user)
 
-            EmailService.send_password_changed_notification(request.user)
-
             messages.success(request, 'Your password has been changed successfully!')
         else:
             for field, errors in form.errors.items():
@@ -359,7 +374,7 @@ class EmailTemplateCreateView(LoginRequiredMixin, PageTitleMixin, CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['template_variables'] = EmailTemplate.get_available_variables()
-        context['user_signature'] = self.request.user.email_signature
+        context['user_signature'] = self.request.user.get_email_signature()
         return context
 
 
@@ -378,7 +393,7 @@ class EmailTemplateUpdateView(LoginRequiredMixin, PageTitleMixin, UpdateView):
         context['page_title'] = f'Edit Template: {self.object.name}'
         context['is_update'] = True
         context['template_variables'] = EmailTemplate.get_available_variables()
-        context['user_signature'] = self.request.user.email_signature
+        context['user_signature'] = self.request.user.get_email_signature()
         return context
 
     def form_valid(self, form):